@@ -0,0 +1,46 @@
+"""Fixtures for the client benchmark suite.
+
+The benchmarks run the clients against the bundled mock Skaha server, with a
+fixed seed and latency, so results are comparable across releases:
+
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare
+
+The mock is served from the same process, so absolute numbers include its own
+overhead; compare runs made on the same machine.
+"""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from skaha.session import Session
+from skaha.utils.mock import MockServer
+
+# Seconds added to every mock response, a stand-in for the network round-trip
+LATENCY = 0.001
+
+
+@pytest.fixture(scope="session")
+def mock() -> Iterator[MockServer]:
+    """Mock Skaha server for the whole benchmark session."""
+    with MockServer(latency=LATENCY, seed=0) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def certificate(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Placeholder certificate, only read for HTTPS servers."""
+    path = tmp_path_factory.mktemp("ssl") / "cadcproxy.pem"
+    path.touch()
+    return path
+
+
+@pytest.fixture
+def session(mock: MockServer, certificate: Path) -> Iterator[Session]:
+    """Session client for the mock, starting from an empty cluster."""
+    mock.reset()
+    client = Session(server=mock.url, certificate=certificate, concurrency=32)
+    yield client
+    client.close()
@@ -0,0 +1,157 @@
+"""Benchmark connection reuse of the Session client against a local HTTPS stub.
+
+Issues concurrent `Session.info()` calls and reports the wall time, throughput
+and the number of TCP/TLS connections the server accepted, for the default
+urllib3 pool size of 10 and for a pool sized to the client concurrency.
+
+Requires the `openssl` command line tool to create a self-signed certificate,
+used both as the server certificate and as the client proxy certificate.
+
+Usage:
+    python benchmarks/pool.py [--requests 500] [--concurrency 64]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import ssl
+import subprocess  # nosec: B404
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Tuple
+
+import requests
+
+from skaha.session import Session
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Reply to session info requests and report accepted connections."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def log_message(self, *args: Any) -> None:
+        """Silence request logging."""
+
+    def setup(self) -> None:
+        """Count every accepted connection."""
+        Handler.connections += 1
+        super().setup()
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle GET requests."""
+        if self.path.startswith("/connections"):
+            body = json.dumps({"connections": Handler.connections}).encode()
+        else:
+            identity = self.path.split("?")[0].split("/")[-1]
+            body = json.dumps({"id": identity, "status": "Running"}).encode()
+        time.sleep(0.005)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(pem: str, port: "multiprocessing.Queue[int]") -> None:
+    """Serve the HTTPS stub in a separate process."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(pem)
+    # Handshake in the handler threads rather than in the accept loop
+    server.socket = context.wrap_socket(
+        server.socket, server_side=True, do_handshake_on_connect=False
+    )
+    port.put(server.server_address[1])
+    server.serve_forever()
+
+
+def certificate(directory: Path) -> str:
+    """Create a self-signed certificate, used by both server and client."""
+    key, cert = directory / "key.pem", directory / "cert.pem"
+    subprocess.run(  # nosec: B603, B607
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=127.0.0.1",
+            "-addext",
+            "subjectAltName=IP:127.0.0.1",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    pem = directory / "proxy.pem"
+    pem.write_text(cert.read_text() + key.read_text())
+    return str(pem)
+
+
+def run(
+    base: str, pem: str, count: int, concurrency: int, pool: int
+) -> Tuple[float, int]:
+    """Run one benchmark round.
+
+    Returns:
+        Tuple[float, int]: Wall time in seconds and connections opened.
+    """
+    url = base.replace("/skaha", "/connections")
+    before = requests.get(url, timeout=10).json()["connections"]
+    session = Session(
+        server=base,
+        certificate=pem,
+        concurrency=concurrency,
+        pool_maxsize=pool,
+    )
+    ids = [f"session{index}" for index in range(count)]
+    start = time.perf_counter()
+    results = session.info(ids)
+    elapsed = time.perf_counter() - start
+    assert len(results) == count, "some requests failed"
+    session.close()
+    after = requests.get(url, timeout=10).json()["connections"]
+    return elapsed, after - before - 1
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=64)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pem = certificate(Path(directory))
+        # Trust the self-signed server certificate
+        os.environ["REQUESTS_CA_BUNDLE"] = pem
+        port: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+        server = multiprocessing.Process(target=serve, args=(pem, port), daemon=True)
+        server.start()
+        base = f"https://127.0.0.1:{port.get()}/skaha"
+
+        print(f"{'pool size':<12}{'wall (s)':>10}{'req/s':>10}{'connections':>14}")
+        for pool in (10, options.concurrency):
+            elapsed, opened = run(
+                base, pem, options.requests, options.concurrency, pool
+            )
+            rate = options.requests / elapsed
+            print(f"{pool:<12}{elapsed:>10.2f}{rate:>10.0f}{opened:>14}")
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Benchmark skaha.utils.threaded.scale against a local stub server.
+
+Issues 1000 simulated requests and reports the wall time and the peak number
+of live threads, for the unbounded (one thread per request) behaviour and for
+bounded concurrency on a shared executor.
+
+Usage:
+    python benchmarks/scale.py [--requests 1000] [--latency 0.01]
+"""
+
+import argparse
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from requests import Session
+
+from skaha.utils.threaded import get_event_loop, scale
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Reply with a short body after a fixed latency."""
+
+    protocol_version = "HTTP/1.1"
+    latency = 0.01
+
+    def log_message(self, *args: Any) -> None:
+        """Silence request logging."""
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle GET requests."""
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+def serve(latency: float, port: "multiprocessing.Queue[int]") -> None:
+    """Serve the stub in a separate process, so its threads are not counted."""
+    Handler.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port.put(server.server_address[1])
+    server.serve_forever()
+
+
+def run(
+    url: str,
+    requests: int,
+    concurrency: Optional[int],
+    executor: Optional[ThreadPoolExecutor],
+) -> Tuple[float, int]:
+    """Run one benchmark round.
+
+    Returns:
+        Tuple[float, int]: Wall time in seconds and peak thread count.
+    """
+    session = Session()
+    arguments: List[Dict[str, Any]] = [{"url": url} for _ in range(requests)]
+    peak = threading.active_count()
+    done = threading.Event()
+
+    def monitor() -> None:
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, threading.active_count())
+            time.sleep(0.001)
+
+    watcher = threading.Thread(target=monitor, daemon=True)
+    watcher.start()
+    start = time.perf_counter()
+    loop = get_event_loop()
+    results = loop.run_until_complete(
+        scale(session.get, arguments, concurrency=concurrency, executor=executor)
+    )
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+    failures = sum(isinstance(result, Exception) for result in results)
+    assert failures == 0, f"{failures} requests failed"
+    # Do not count the monitor thread itself
+    return elapsed, peak - 1
+
+
+def main() -> None:
+    """Run the benchmark and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.01)
+    options = parser.parse_args()
+
+    port: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve, args=(options.latency, port), daemon=True
+    )
+    server.start()
+    url = f"http://127.0.0.1:{port.get()}/"
+
+    print(f"{'mode':<28}{'wall (s)':>10}{'peak threads':>15}")
+    elapsed, peak = run(url, options.requests, None, None)
+    print(f"{'unbounded':<28}{elapsed:>10.2f}{peak:>15}")
+    for concurrency in (8, 32, 64):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            elapsed, peak = run(url, options.requests, concurrency, executor)
+        print(f"{f'shared executor, {concurrency}':<28}{elapsed:>10.2f}{peak:>15}")
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmarks of the Session client against the mock Skaha server."""
+
+from skaha.models import CreateSpec
+from skaha.session import Session, payloads
+from skaha.utils.mock import MockServer
+
+IMAGE = "images.canfar.net/skaha/terminal:1.1.2"
+
+
+def test_fetch_all(benchmark, mock: MockServer, session: Session):
+    """List a cluster of 10k sessions."""
+    mock.populate(10_000)
+    result = benchmark(session.fetch, view="all")
+    assert len(result) == 10_000
+
+
+def test_create_replicas(benchmark, mock: MockServer, session: Session):
+    """Launch 256 replicas of a session."""
+    result = benchmark.pedantic(
+        session.create,
+        kwargs={"name": "bench", "image": IMAGE, "replicas": 256},
+        setup=mock.reset,
+        rounds=5,
+    )
+    assert len(result) == 256
+
+
+def test_destroy_bulk(benchmark, mock: MockServer, session: Session):
+    """Destroy 256 sessions."""
+
+    def setup():
+        mock.reset()
+        return (mock.populate(256),), {}
+
+    result = benchmark.pedantic(session.destroy, setup=setup, rounds=5)
+    assert all(result.values())
+
+
+def test_logs_large(benchmark, mock: MockServer, session: Session):
+    """Download a 16 MiB log."""
+    mock.log_size = 16 * 2**20
+    try:
+        (identity,) = mock.populate(1)
+        result = benchmark(session.logs, identity)
+    finally:
+        mock.log_size = 0
+    assert len(result[identity]) >= 16 * 2**20
+
+
+def test_download_logs(benchmark, mock: MockServer, session: Session, tmp_path):
+    """Stream 32 logs of 4 MiB each to disk, gzip compressed."""
+    mock.log_size = 4 * 2**20
+    try:
+        ids = mock.populate(32)
+
+        def setup():
+            for path in tmp_path.iterdir():
+                path.unlink()
+
+        result = benchmark.pedantic(
+            session.download_logs,
+            args=(ids, tmp_path),
+            kwargs={"compression": "gzip"},
+            setup=setup,
+            rounds=3,
+        )
+    finally:
+        mock.log_size = 0
+    assert all(entry["bytes"] >= 4 * 2**20 for entry in result.values())
+
+
+def test_payloads_overrides(benchmark):
+    """Expand 256 replicas with per-replica arguments."""
+    spec = CreateSpec(
+        name="sweep", image=IMAGE, kind="headless", cmd="fft", env={}, replicas=256
+    )
+    rows = [{"args": f"--beam {index}"} for index in range(256)]
+    result = benchmark(lambda: sum(1 for _ in payloads(spec, rows)))
+    assert result == 256
@@ -1,21 +1,65 @@
-from importlib import metadata
+"""Python Client for CANFAR Science Platform.
+
+Importing the package is kept cheap: the version is read from the installed
+metadata and submodules are only imported on first attribute access, e.g.
+`skaha.session`.
+"""
+
+import re
+from importlib import import_module
 from logging import getLogger
 from pathlib import Path
-
-import toml
+from typing import Any, List
 
 log = getLogger(__name__)
 
 # Root path to the Skaha Project
 BASE_PATH: Path = Path(__file__).absolute().parent.parent
 
-try:
-    __version__ = metadata.version("skaha")
-except metadata.PackageNotFoundError as error:  # pragma: no cover
-    log.warning(error)
-    pyproject = toml.load(BASE_PATH / "pyproject.toml")
-    __version__ = pyproject.get("project", {}).get("version", "unknown")
-except Exception as error:  # pragma: no cover
-    log.warning(error)
-    log.warning("unable to find skaha client version")
-    __version__ = "unknown"
+SUBMODULES: List[str] = [
+    "client",
+    "context",
+    "exceptions",
+    "images",
+    "models",
+    "overview",
+    "scheduler",
+    "session",
+    "storage",
+    "sweep",
+]
+
+
+def _version() -> str:
+    """Version of the installed package, or of the source tree."""
+    from importlib import metadata
+
+    try:
+        return metadata.version("skaha")
+    except metadata.PackageNotFoundError as error:  # pragma: no cover
+        log.debug(error)
+    try:
+        pyproject = (BASE_PATH / "pyproject.toml").read_text()
+        match = re.search(r'^version\s*=\s*"([^"]+)"', pyproject, re.MULTILINE)
+        if match:
+            return match.group(1)
+    except OSError as error:  # pragma: no cover
+        log.warning(error)
+    log.warning("unable to find skaha client version")  # pragma: no cover
+    return "unknown"  # pragma: no cover
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the version and submodules lazily."""
+    if name == "__version__":
+        version = _version()
+        globals()["__version__"] = version
+        return version
+    if name in SUBMODULES:
+        return import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> List[str]:
+    """List the lazily resolved attributes too."""
+    return sorted([*globals(), "__version__", *SUBMODULES])
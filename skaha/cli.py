@@ -0,0 +1,355 @@
+"""Skaha command line interface.
+
+Every command writes newline-delimited JSON (NDJSON) to stdout, one object per
+line, as soon as each result is available. Commands acting on sessions accept
+any number of IDs or specifications, as arguments or one per line from a file or
+stdin, and process them concurrently from a single process.
+
+Commands exit with status 1 if any of their items failed.
+
+Examples:
+    $ skaha ps --all | jq -r .userid | sort | uniq -c
+    $ skaha ps --status Succeeded | jq -r .id | skaha destroy
+    $ skaha --concurrency 64 create -i specs.ndjson
+    $ skaha logs -f hjko98yghj
+"""
+
+import asyncio
+import json
+import sys
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
+
+import click
+
+T = TypeVar("T")
+
+
+def emit(record: Any) -> None:
+    """Write a single NDJSON record and flush it."""
+    click.echo(json.dumps(record, default=str))
+
+
+def lines(arguments: Iterable[str], source: Optional[TextIO]) -> List[str]:
+    """Batch input from arguments, or else one item per line of a file or stdin.
+
+    Args:
+        arguments (Iterable[str]): Items given on the command line.
+        source (Optional[TextIO]): File to read from, stdin if None.
+
+    Returns:
+        List[str]: Non-empty, stripped items.
+    """
+    items = list(arguments)
+    if not items:
+        stream = source or sys.stdin
+        items = [line.strip() for line in stream if line.strip()]
+    return items
+
+
+async def stream(
+    function: Callable[[T], Awaitable[Any]], items: Iterable[T], concurrency: int
+) -> AsyncIterator[Tuple[T, Any]]:
+    """Apply an async function to many items, yielding results as they complete.
+
+    Args:
+        function (Callable[[T], Awaitable[Any]]): Function to apply.
+        items (Iterable[T]): Inputs.
+        concurrency (int): Maximum number of items in flight.
+
+    Notes:
+        Items are pulled from the iterable by a fixed pool of workers, so only
+        `concurrency` of them are in flight at any time.
+
+    Yields:
+        Tuple[T, Any]: Input and its result, or the exception it raised.
+    """
+    iterator = iter(items)
+    results: "asyncio.Queue[Optional[Tuple[T, Any]]]" = asyncio.Queue()
+
+    async def worker() -> None:
+        try:
+            for item in iterator:
+                try:
+                    result = await function(item)
+                except Exception as error:
+                    result = error
+                await results.put((item, result))
+        finally:
+            results.put_nowait(None)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        running = len(workers)
+        while running:
+            entry = await results.get()
+            if entry is None:
+                running -= 1
+            else:
+                yield entry
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+
+def options(context: click.Context) -> Dict[str, Any]:
+    """Client options given on the command line."""
+    return {key: value for key, value in context.obj.items() if value is not None}
+
+
+@click.group()
+@click.option("--server", envvar="SKAHA_SERVER", help="Skaha server URL.")
+@click.option(
+    "--certificate", envvar="SKAHA_CERTIFICATE", help="X509 certificate path."
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1),
+    envvar="SKAHA_CONCURRENCY",
+    help="Maximum concurrent requests.",
+)
+@click.version_option(package_name="skaha")
+@click.pass_context
+def cli(
+    context: click.Context,
+    server: Optional[str],
+    certificate: Optional[str],
+    concurrency: Optional[int],
+) -> None:
+    """Skaha client for the CANFAR Science Platform."""
+    context.obj = {
+        "server": server,
+        "certificate": certificate,
+        "concurrency": concurrency,
+    }
+
+
+@cli.command()
+@click.option("--kind", help="Session kind.")
+@click.option("--status", help="Session status.")
+@click.option("--all", "everyone", is_flag=True, help="Sessions of all users.")
+@click.option("--user", help="Only sessions of this user.")
+@click.option("--prefix", help="Only sessions whose name starts with this.")
+@click.pass_context
+def ps(
+    context: click.Context,
+    kind: Optional[str],
+    status: Optional[str],
+    everyone: bool,
+    user: Optional[str],
+    prefix: Optional[str],
+) -> None:
+    """List sessions."""
+    from skaha.session import AsyncSession
+
+    async def main() -> None:
+        async with AsyncSession(**options(context)) as session:
+            view = "all" if everyone else None
+            for record in await session.fetch(kind, status, view, user, prefix):
+                emit(record)
+
+    asyncio.run(main())
+
+
+@cli.command()
+@click.argument("ids", nargs=-1)
+@click.option("--input", "-i", "source", type=click.File("r"), help="ID file.")
+@click.pass_context
+def info(context: click.Context, ids: Tuple[str, ...], source: TextIO) -> None:
+    """Show session information."""
+    from skaha.session import AsyncSession
+
+    async def main() -> int:
+        failed = 0
+        async with AsyncSession(**options(context)) as session:
+            items = lines(ids, source)
+            async for identity, result in stream(
+                session.info, items, session.concurrency
+            ):
+                if isinstance(result, Exception) or not result:
+                    emit({"id": identity, "error": str(result or "unavailable")})
+                    failed += 1
+                else:
+                    emit(result[0])
+        return failed
+
+    if asyncio.run(main()):
+        context.exit(1)
+
+
+@cli.command()
+@click.argument("ids", nargs=-1)
+@click.option("--input", "-i", "source", type=click.File("r"), help="ID file.")
+@click.option("--follow", "-f", is_flag=True, help="Follow until sessions end.")
+@click.option("--interval", type=float, default=5.0, help="Seconds between polls.")
+@click.pass_context
+def logs(
+    context: click.Context,
+    ids: Tuple[str, ...],
+    source: TextIO,
+    follow: bool,
+    interval: float,
+) -> None:
+    """Stream session logs, one line per record."""
+    from skaha.session import AsyncSession
+
+    async def main() -> None:
+        async with AsyncSession(**options(context)) as session:
+            items = lines(ids, source)
+            async for identity, line in session.stream_logs(
+                items, follow=follow, interval=interval
+            ):
+                emit({"id": identity, "line": line})
+
+    asyncio.run(main())
+
+
+@cli.command()
+@click.argument("ids", nargs=-1)
+@click.option("--input", "-i", "source", type=click.File("r"), help="ID file.")
+@click.pass_context
+def destroy(context: click.Context, ids: Tuple[str, ...], source: TextIO) -> None:
+    """Destroy sessions."""
+    from skaha.session import AsyncSession
+
+    async def main() -> int:
+        failed = 0
+        async with AsyncSession(**options(context)) as session:
+            items = lines(ids, source)
+            async for identity, result in stream(
+                session.destroy, items, session.concurrency
+            ):
+                if isinstance(result, Exception):
+                    emit({"id": identity, "destroyed": False, "error": str(result)})
+                    failed += 1
+                else:
+                    emit({"id": identity, "destroyed": result[identity]})
+                    failed += not result[identity]
+        return failed
+
+    if asyncio.run(main()):
+        context.exit(1)
+
+
+@cli.command()
+@click.option("--name", help="Session name.")
+@click.option("--image", help="Container image.")
+@click.option("--cores", type=int, default=2, show_default=True)
+@click.option("--ram", type=int, default=4, show_default=True, help="RAM in GB.")
+@click.option("--kind", default="headless", show_default=True)
+@click.option("--gpu", type=int, help="Number of GPUs.")
+@click.option("--cmd", help="Command to run.")
+@click.option("--args", help="Arguments to the command.")
+@click.option("--env", multiple=True, help="Environment variable, KEY=VALUE.")
+@click.option("--replicas", type=int, default=1, show_default=True)
+@click.option(
+    "--input",
+    "-i",
+    "source",
+    type=click.File("r"),
+    help="NDJSON file of specifications, '-' for stdin.",
+)
+@click.pass_context
+def create(
+    context: click.Context,
+    name: Optional[str],
+    image: Optional[str],
+    env: Tuple[str, ...],
+    source: Optional[TextIO],
+    **spec: Any,
+) -> None:
+    """Launch sessions from options, or from a batch of NDJSON specifications.
+
+    Each line of the batch holds the keyword arguments of `Session.create`,
+    e.g. {"name": "job", "image": "images.canfar.net/skaha/terminal:1.1.2"}.
+    """
+    from skaha.session import AsyncSession
+
+    if source:
+        specs = [json.loads(line) for line in lines([], source)]
+    elif name and image:
+        spec["env"] = dict(item.split("=", 1) for item in env)
+        specs = [{"name": name, "image": image, **spec}]
+    else:
+        raise click.UsageError("either --name and --image, or --input is required")
+
+    async def main() -> int:
+        failed = 0
+        async with AsyncSession(**options(context)) as session:
+
+            async def launch(index: int) -> List[str]:
+                return await session.create(**specs[index])
+
+            async for index, result in stream(
+                launch, range(len(specs)), session.concurrency
+            ):
+                name = specs[index].get("name")
+                ids = [] if isinstance(result, Exception) else result
+                for identity in ids:
+                    emit({"name": name, "id": identity})
+                # Replicas that were not created, e.g. after a partial failure
+                missing = specs[index].get("replicas", 1) - len(ids)
+                if missing > 0:
+                    error = str(result) if isinstance(result, Exception) else ""
+                    error = error or f"{missing} of {len(ids) + missing} not created"
+                    emit({"name": name, "error": error, "missing": missing})
+                    failed += missing
+        return failed
+
+    if asyncio.run(main()):
+        context.exit(1)
+
+
+@cli.command()
+@click.option("--kind", help="Image kind.")
+@click.pass_context
+def images(context: click.Context, kind: Optional[str]) -> None:
+    """List container images."""
+    from skaha.images import AsyncImages
+
+    async def main() -> None:
+        async with AsyncImages(**options(context)) as client:
+            for image in await client.fetch(kind):
+                emit(image)
+
+    asyncio.run(main())
+
+
+@cli.command()
+@click.pass_context
+def stats(context: click.Context) -> None:
+    """Show cluster statistics."""
+    from skaha.session import AsyncSession
+
+    async def main() -> None:
+        async with AsyncSession(**options(context)) as session:
+            emit(await session.stats())
+
+    asyncio.run(main())
+
+
+@cli.command()
+@click.option("--socket", "path", help="Socket path, see skaha.daemon.Daemon.")
+@click.pass_context
+def daemon(context: click.Context, path: Optional[str]) -> None:
+    """Serve client calls on a local Unix socket, keeping connections warm."""
+    from skaha.daemon import Daemon
+
+    server = Daemon(path, **options(context))
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
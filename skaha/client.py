@@ -1,16 +1,22 @@
 """Skaha Client."""
 
-import logging
-from os import R_OK, access, environ
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import R_OK, access, environ, stat
 from pathlib import Path
-from time import asctime, gmtime
-from typing import Optional, Type
+from time import asctime, gmtime, monotonic
+from typing import Any, Dict, List, Literal, Optional, Type, Union
 
+from httpx import AsyncClient, Limits
 from pydantic import (
     AnyHttpUrl,
     BaseModel,
+    ConfigDict,
     Field,
     FilePath,
+    PrivateAttr,
     field_validator,
     model_validator,
 )
@@ -19,11 +25,23 @@ from typing_extensions import Self
 
 from skaha import __version__
 from skaha.models import ContainerRegistry
+from skaha.utils import logs
+from skaha.utils.cache import Cache
+from skaha.utils.index import ImageIndex
+from skaha.utils.ledger import Ledger
+from skaha.utils.metrics import Metrics
+from skaha.utils.transport import (
+    Adapter,
+    AsyncTransport,
+    CircuitBreaker,
+    Health,
+    RetryPolicy,
+)
+
+log = logs.get_logger(__name__)
 
-# Setup logging format
-logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s", level=logging.INFO)
-# Get the logger
-log = logging.getLogger(__name__)
+# Seconds between checks of the certificate file for a renewal
+RECHECK = 1.0
 
 
 class SkahaClient(BaseModel):
@@ -34,9 +52,24 @@ class SkahaClient(BaseModel):
         version (str): Skaha API version.
         certificate (str): Certificate file.
         timeout (int): Timeout for requests.
-        session (Session): Requests HTTP Session object.
+        session (Session): Requests HTTP Session object, one per client.
         verify (bool): Verify SSL certificate.
         registry (ContainerRegistry): Credentials for a private container registry.
+        concurrency (int): Maximum number of concurrent requests.
+        rate (float): Maximum number of requests started per second in bulk calls.
+        asynced (AsyncClient): HTTPX async client, shared by the async clients.
+        cache (Cache): Opt-in cache for rarely changing responses.
+        retries (int): Retries for idempotent requests on transient failures.
+        backoff (float): Base delay in seconds between retries.
+        breaker (CircuitBreaker): Circuit breaker shared by all requests.
+        pool_connections (int): Number of per-host connection pools.
+        pool_maxsize (int): Keep-alive connections per host.
+        metrics (Metrics): Opt-in registry of request metrics.
+        ledger (Ledger): Opt-in persistent record of launched sessions.
+        health (Health): Opt-in backend health check, guarding creates and deletes.
+        catalog (ImageIndex): Opt-in image index, validating images before launches.
+        validation (str): Opt-in check of session resources against the sizes
+            offered by the server, "strict" or "snap".
 
     Returns:
         SkahaClient: Skaha Client.
@@ -51,6 +84,8 @@ class SkahaClient(BaseModel):
                 pass
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     server: AnyHttpUrl = Field(
         default="https://ws-uv.canfar.net/skaha",
         title="Skaha Server URL",
@@ -72,10 +107,10 @@ class SkahaClient(BaseModel):
         title="HTTP Timeout",
         description="HTTP Timeout in seconds for requests.",
     )
-    session: Type[Session] = Field(
-        default=Session(),
+    session: Session = Field(
+        default_factory=Session,
         title="Requests HTTP Session",
-        description="Requests HTTP Session object.",
+        description="Requests HTTP Session object, owned by this client.",
     )
     verify: bool = Field(default=True)
     registry: Optional[Type[ContainerRegistry]] = Field(
@@ -83,6 +118,100 @@ class SkahaClient(BaseModel):
         title="Container Registry",
         description="Credentials for a private container registry.",
     )
+    concurrency: int = Field(
+        default=32,
+        title="Concurrency",
+        description="Maximum number of concurrent requests.",
+        ge=1,
+    )
+    rate: Optional[float] = Field(
+        default=None,
+        title="Request Rate",
+        description="Maximum requests per second for bulk operations.",
+        gt=0,
+    )
+    asynced: Optional[AsyncClient] = Field(
+        default=None,
+        title="HTTPX Async Client",
+        description="Pooled asynchronous HTTP client used by the async clients.",
+        exclude=True,
+    )
+    cache: Optional[Cache] = Field(
+        default=None,
+        title="Response Cache",
+        description="Opt-in cache for image and context responses.",
+        exclude=True,
+    )
+    retries: int = Field(
+        default=3,
+        title="Retries",
+        description="Retries for idempotent requests on 429, 5xx and connection errors.",
+        ge=0,
+    )
+    backoff: float = Field(
+        default=0.5,
+        title="Retry Backoff",
+        description="Base delay in seconds for the jittered exponential backoff.",
+        ge=0,
+    )
+    breaker: CircuitBreaker = Field(
+        default_factory=CircuitBreaker,
+        title="Circuit Breaker",
+        description="Fails requests fast while the server is unhealthy.",
+        exclude=True,
+    )
+    pool_connections: int = Field(
+        default=10,
+        title="Connection Pools",
+        description="Number of per-host connection pools to keep.",
+        ge=1,
+    )
+    pool_maxsize: Optional[int] = Field(
+        default=None,
+        title="Connection Pool Size",
+        description="Keep-alive connections per host, defaults to the concurrency.",
+        ge=1,
+    )
+    metrics: Optional[Metrics] = Field(
+        default=None,
+        title="Metrics",
+        description="Opt-in registry of per-endpoint request metrics.",
+        exclude=True,
+    )
+    ledger: Optional[Ledger] = Field(
+        default=None,
+        title="Ledger",
+        description="Opt-in persistent record of launched sessions and sweeps.",
+        exclude=True,
+    )
+    health: Optional[Health] = Field(
+        default=None,
+        title="Health Check",
+        description="Fails creates and deletes fast while the backend is unavailable.",
+        exclude=True,
+    )
+    catalog: Optional[ImageIndex] = Field(
+        default=None,
+        title="Image Catalog",
+        description="Opt-in image index, checked before sessions are launched.",
+        exclude=True,
+    )
+    validation: Optional[Literal["strict", "snap"]] = Field(
+        default=None,
+        title="Resource Validation",
+        description=(
+            "Check cores, RAM and GPUs against the sizes offered by the server "
+            "before launching, reporting invalid sizes or snapping them."
+        ),
+    )
+    _executor: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    _context: Optional[ssl.SSLContext] = PrivateAttr(default=None)
+    _stamp: Optional[int] = PrivateAttr(default=None)
+    _checked: float = PrivateAttr(default=-float("inf"))
+    _verify: Any = PrivateAttr(default=None)
+    _owned: Optional[AsyncClient] = PrivateAttr(default=None)
+    _retired: List[AsyncClient] = PrivateAttr(default_factory=list)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
     @field_validator("certificate")
     def certificate_exists_and_is_readable(cls, value: FilePath) -> FilePath:
@@ -118,8 +247,205 @@ class SkahaClient(BaseModel):
         self.session.headers.update({"X-Skaha-Authentication-Type": "certificate"})
         self.session.cert = str(self.certificate)
         self.session.verify = self.verify
+        adapter = Adapter(
+            timeout=self.timeout,
+            policy=self.policy,
+            breaker=self.breaker,
+            context=self._ssl_context,
+            metrics=self.metrics,
+            health=self.health,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize or self.concurrency,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if self.health is not None:
+            self.health.bind(partial(self._probe, f"{self.server}/availability"))
         if self.registry:
             self.session.headers.update(
                 {"X-Skaha-Registry-Auth": f"{self.registry.encoded()}"}
             )
         return self
+
+    def _probe(self, url: str) -> bool:
+        """Whether the availability endpoint reports the backend as available.
+
+        Args:
+            url (str): Availability endpoint.
+
+        Returns:
+            bool: Availability.
+        """
+        from skaha.overview import parse
+
+        response = self.session.get(url=url)
+        response.raise_for_status()
+        return parse(response.text)
+
+    @property
+    def policy(self) -> RetryPolicy:
+        """Retry policy applied to every request of this client."""
+        return RetryPolicy(total=self.retries, backoff=self.backoff)
+
+    def _ssl_context(self) -> Union[ssl.SSLContext, bool]:
+        """SSL context carrying the X509 certificate.
+
+        The context is shared by all connections of both the requests session
+        and the async client, so the certificate is loaded once and TLS sessions
+        can be reused. It is created again when the certificate file changes,
+        e.g. when a proxy certificate is renewed, which is checked at most every
+        `RECHECK` seconds.
+
+        Returns:
+            Union[ssl.SSLContext, bool]: SSL context, or the verify flag when the
+                server is not served over HTTPS.
+        """
+        if not str(self.server).startswith("https"):
+            return self.verify
+        now = monotonic()
+        if self._context is not None and now - self._checked < RECHECK:
+            return self._context
+        stamp = stat(self.certificate).st_mtime_ns
+        with self._lock:
+            self._checked = now
+            if self._context is None or self._stamp != stamp:
+                context = ssl.create_default_context()
+                if not self.verify:
+                    context.check_hostname = False
+                    context.verify_mode = ssl.CERT_NONE
+                context.load_cert_chain(certfile=str(self.certificate))
+                self._context, self._stamp = context, stamp
+            return self._context
+
+    def _async_client(self) -> AsyncClient:
+        """Get the pooled async client, creating it on first use.
+
+        The client keeps up to `concurrency` keep-alive connections open and
+        carries the same headers, certificate, timeout, retry policy and circuit
+        breaker as the requests session. A client created here is replaced when
+        the certificate changes; the one it replaces is closed by `aclose`.
+
+        Returns:
+            AsyncClient: HTTPX async client.
+        """
+        verify = self._ssl_context()
+        stale = self.asynced is self._owned and self._verify is not verify
+        if self.asynced is None or stale:
+            if self.asynced is not None:
+                self._retired.append(self.asynced)
+            transport = AsyncTransport(
+                policy=self.policy,
+                breaker=self.breaker,
+                metrics=self.metrics,
+                health=self.health,
+                verify=verify,
+                limits=Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+            headers = {
+                key: value
+                for key, value in self.session.headers.items()
+                if isinstance(value, str)
+            }
+            self.asynced = AsyncClient(
+                headers=headers, timeout=self.timeout, transport=transport
+            )
+            self._owned, self._verify = self.asynced, verify
+        return self.asynced
+
+    async def aclose(self) -> None:
+        """Close the pooled async client, if one was created."""
+        while self._retired:
+            await self._retired.pop().aclose()
+        if self.asynced is not None:
+            await self.asynced.aclose()
+            self.asynced = None
+
+    async def __aenter__(self) -> Self:
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Close the pooled async client on exit."""
+        await self.aclose()
+
+    def _get_json(
+        self, endpoint: str, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """GET a JSON response, through the cache if one is configured.
+
+        Args:
+            endpoint (str): Endpoint name, used to select the cache TTL.
+            url (str): Request URL.
+            params (Optional[Dict[str, Any]]): Query parameters.
+
+        Returns:
+            Any: Decoded JSON body.
+        """
+        if self.cache is None:
+            response = self.session.get(url=url, params=params)
+            response.raise_for_status()
+            return response.json()
+        key = self.cache.key(url, params)
+        entry, fresh = self.cache.lookup(endpoint, key)
+        if entry and fresh:
+            return entry.value
+        headers = entry.validators if entry else {}
+        response = self.session.get(url=url, params=params, headers=headers)
+        if entry and response.status_code == 304:
+            return self.cache.renew(endpoint, key, entry)
+        response.raise_for_status()
+        return self.cache.store(endpoint, key, response.json(), response.headers)
+
+    async def _aget_json(
+        self, endpoint: str, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """GET a JSON response asynchronously, through the cache if configured.
+
+        Args:
+            endpoint (str): Endpoint name, used to select the cache TTL.
+            url (str): Request URL.
+            params (Optional[Dict[str, Any]]): Query parameters.
+
+        Returns:
+            Any: Decoded JSON body.
+        """
+        client = self._async_client()
+        if self.cache is None:
+            response = await client.get(url=url, params=params)
+            response.raise_for_status()
+            return response.json()
+        key = self.cache.key(url, params)
+        entry, fresh = self.cache.lookup(endpoint, key)
+        if entry and fresh:
+            return entry.value
+        headers = entry.validators if entry else {}
+        response = await client.get(url=url, params=params, headers=headers)
+        if entry and response.status_code == 304:
+            return self.cache.renew(endpoint, key, entry)
+        response.raise_for_status()
+        return self.cache.store(endpoint, key, response.json(), response.headers)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool shared by the bulk operations of this client.
+
+        Returns:
+            ThreadPoolExecutor: Executor with `concurrency` workers.
+        """
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.concurrency, thread_name_prefix="skaha"
+                    )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the shared executor and close the HTTP session."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.session.close()
@@ -3,7 +3,6 @@
 from typing import Any, Dict
 
 from pydantic import model_validator
-from requests.models import Response
 from typing_extensions import Self
 
 from skaha.client import SkahaClient
@@ -37,6 +36,27 @@ class Context(SkahaClient):
              'availableGPUs': [1,2,3,...],
             }
         """
-        response: Response = self.session.get(url=self.server)  # type: ignore
-        response.raise_for_status()
-        return response.json()
+        return self._get_json("context", str(self.server))
+
+
+class AsyncContext(SkahaClient):
+    """Asynchronously get available resources from the skaha server."""
+
+    @model_validator(mode="after")
+    def update_server(self) -> Self:
+        """Sets the server path after validation."""
+        self.server = f"{self.server}/{self.version}/context"  # type: ignore
+        return self
+
+    async def resources(self) -> Dict[str, Any]:
+        """Get available resources from the skaha server.
+
+        Returns:
+            A dictionary of available resources.
+
+        Examples:
+            >>> from skaha.context import AsyncContext
+            >>> context = AsyncContext()
+            >>> await context.resources()
+        """
+        return await self._aget_json("context", str(self.server))
@@ -0,0 +1,383 @@
+"""Long-lived local daemon serving client calls over a Unix domain socket.
+
+Constructing a client validates the certificate and every new process opens
+fresh TLS connections. The daemon keeps one set of clients, with their pooled
+connections and response cache, warm across calls; `Remote` forwards calls to
+it, so each call only costs a local round-trip.
+
+The protocol is newline-delimited JSON: each request is an object with the
+`client` ("session", "images" or "context"), `method`, `args` and `kwargs`, and
+each reply holds either a `result` or an `error` with its `type` and `message`.
+A connection can carry any number of requests.
+
+Examples:
+    Start the daemon, e.g. from a user service or a login script:
+
+        $ skaha daemon
+
+    Then, from any number of short-lived processes:
+
+        >>> from skaha.daemon import Remote
+        >>> with Remote() as remote:
+        ...     remote.session.fetch(kind="headless")
+        ...     remote.images.fetch()
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+from os import environ
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Union
+
+from skaha import exceptions
+from skaha.utils import logs
+from skaha.utils.threaded import close_event_loop
+
+log = logs.get_logger(__name__)
+
+# Methods served for each client, all returning JSON serializable values
+METHODS: Dict[str, Set[str]] = {
+    "session": {"fetch", "stats", "info", "logs", "create", "destroy"},
+    "images": {"fetch"},
+    "context": {"resources"},
+}
+
+
+def default_socket() -> Path:
+    """Default socket location, in the user's runtime directory if there is one.
+
+    Returns:
+        Path: Socket path.
+    """
+    runtime = environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime) if runtime else Path.home() / ".skaha"
+    return base / "skaha.sock"
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """Answer the requests sent over one connection."""
+
+    server: "Server"
+
+    def handle(self) -> None:
+        """Reply to each request line in turn."""
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                reply: Dict[str, Any] = {
+                    "error": {"type": "ParameterError", "message": str(error)}
+                }
+            else:
+                reply = self.server.owner.call(request)
+            self.wfile.write(json.dumps(reply, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+    def finish(self) -> None:
+        """Close the event loop the connection thread created, if any."""
+        try:
+            super().finish()
+        finally:
+            close_event_loop()
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server, one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, owner: "Daemon") -> None:
+        """Initialize the server."""
+        self.owner = owner
+        super().__init__(path, Handler)
+
+
+class Daemon:
+    """Serve `Session`, `Images` and `Context` calls on a Unix domain socket.
+
+    Clients are created on first use and kept for the lifetime of the daemon.
+    They are recreated when the certificate file changes, e.g. after the proxy
+    certificate is renewed; the previous clients are closed once the calls
+    still using them return. Unless a cache is given, one is shared by all of
+    them.
+
+    Args:
+        path (Optional[Union[str, Path]]): Socket path. Defaults to
+            `$XDG_RUNTIME_DIR/skaha.sock`, or `~/.skaha/skaha.sock`.
+        **options: Client options, e.g. `server`, `certificate` or `concurrency`.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, **options: Any):
+        """Initialize the daemon."""
+        from skaha.utils.cache import Cache
+
+        self.path = Path(path) if path else default_socket()
+        self.options = options
+        self.options.setdefault("cache", Cache())
+        self.clients: Dict[str, Any] = {}
+        self.retired: Dict[int, Any] = {}
+        self.busy: Counter = Counter()
+        self.certificate: Optional[Path] = None
+        self.stamp: Optional[float] = None
+        self.lock = threading.Lock()
+        self.server: Optional[Server] = None
+
+    def client(self, name: str) -> Any:
+        """Client by name, created on first use.
+
+        Args:
+            name (str): "session", "images" or "context".
+
+        Returns:
+            Any: The client.
+        """
+        with self.lock:
+            return self._client(name)
+
+    @contextmanager
+    def borrow(self, name: str) -> Iterator[Any]:
+        """Use a client, keeping it open until the call returns.
+
+        Args:
+            name (str): "session", "images" or "context".
+
+        Yields:
+            Any: The client.
+        """
+        with self.lock:
+            client = self._client(name)
+            self.busy[id(client)] += 1
+        try:
+            yield client
+        finally:
+            with self.lock:
+                self.busy[id(client)] -= 1
+                if not self.busy[id(client)]:
+                    del self.busy[id(client)]
+                    if self.retired.pop(id(client), None) is not None:
+                        client.close()
+
+    def call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single request.
+
+        Args:
+            request (Dict[str, Any]): Request with `client`, `method`, `args`
+                and `kwargs`.
+
+        Returns:
+            Dict[str, Any]: Reply with the `result` or the `error`.
+        """
+        try:
+            client, method = request.get("client"), request.get("method")
+            if method not in METHODS.get(str(client), set()):
+                raise exceptions.ParameterError(f"unsupported call {client}.{method}")
+            args, kwargs = request.get("args", []), request.get("kwargs", {})
+            with self.borrow(str(client)) as instance:
+                return {"result": getattr(instance, str(method))(*args, **kwargs)}
+        except Exception as error:
+            log.debug(f"{request}: {error!r}")
+            return {"error": {"type": type(error).__name__, "message": str(error)}}
+
+    def start(self) -> None:
+        """Bind the socket, readable and writable by the current user only.
+
+        Raises:
+            ClientError: If another daemon already listens on the socket.
+        """
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(self.path))
+            except OSError:
+                self.path.unlink()
+            else:
+                raise exceptions.ClientError(f"daemon already running on {self.path}")
+            finally:
+                probe.close()
+        umask = os.umask(0o177)
+        try:
+            self.server = Server(str(self.path), self)
+        finally:
+            os.umask(umask)
+        log.info(f"Listening on {self.path}")
+
+    def serve(self) -> None:
+        """Serve requests until `shutdown()` is called or the process ends."""
+        if self.server is None:
+            self.start()
+        assert self.server is not None
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            self.path.unlink(missing_ok=True)
+            with self.lock:
+                self._close()
+
+    def shutdown(self) -> None:
+        """Stop a daemon serving in another thread."""
+        if self.server is not None:
+            self.server.shutdown()
+
+    def _client(self, name: str) -> Any:
+        """Client by name, created on first use. Must hold the lock."""
+        if self.certificate and self._stamp() != self.stamp:
+            log.info("Certificate changed, recreating clients")
+            self._retire()
+        if name not in self.clients:
+            self.clients[name] = self._factory(name)(**self.options)
+            self.certificate = Path(self.clients[name].certificate)
+            self.stamp = self._stamp()
+        return self.clients[name]
+
+    def _factory(self, name: str) -> Callable[..., Any]:
+        """Client class by name."""
+        if name == "session":
+            from skaha.session import Session
+
+            return Session
+        if name == "images":
+            from skaha.images import Images
+
+            return Images
+        from skaha.context import Context
+
+        return Context
+
+    def _stamp(self) -> Optional[float]:
+        """Modification time of the certificate."""
+        try:
+            return os.stat(str(self.certificate)).st_mtime
+        except OSError:
+            return None
+
+    def _retire(self) -> None:
+        """Forget all clients, closing those not used by a call in flight."""
+        for client in self.clients.values():
+            if self.busy[id(client)]:
+                self.retired[id(client)] = client
+            else:
+                client.close()
+        self.clients.clear()
+
+    def _close(self) -> None:
+        """Close and forget all clients."""
+        for client in [*self.clients.values(), *self.retired.values()]:
+            client.close()
+        self.clients.clear()
+        self.retired.clear()
+
+
+class Proxy:
+    """Forward method calls of one client to the daemon.
+
+    Args:
+        remote (Remote): Connection to the daemon.
+        client (str): Client name, e.g. "session".
+    """
+
+    def __init__(self, remote: "Remote", client: str) -> None:
+        """Initialize the proxy."""
+        self.remote = remote
+        self.client = client
+
+    def __getattr__(self, method: str) -> Callable[..., Any]:
+        """Remote method by name."""
+        if method not in METHODS[self.client]:
+            raise AttributeError(f"{self.client} has no remote method {method!r}")
+        return partial(self.remote.call, self.client, method)
+
+
+class Remote:
+    """Thin client forwarding calls to a running daemon.
+
+    Calls take the same arguments and return the same values as the methods of
+    `Session`, `Images` and `Context`, decoded from JSON. Errors raised in the
+    daemon are raised again as the matching `skaha.exceptions` type, or as
+    `UnknownError`.
+
+    Args:
+        path (Optional[Union[str, Path]]): Socket path, see `Daemon`.
+        timeout (Optional[float]): Seconds to wait for each reply.
+    """
+
+    def __init__(
+        self, path: Optional[Union[str, Path]] = None, timeout: Optional[float] = None
+    ) -> None:
+        """Initialize the client, connecting on the first call."""
+        self.path = Path(path) if path else default_socket()
+        self.timeout = timeout
+        self.socket: Optional[socket.socket] = None
+        self.reader: Any = None
+        self.lock = threading.Lock()
+        self.session = Proxy(self, "session")
+        self.images = Proxy(self, "images")
+        self.context = Proxy(self, "context")
+
+    def call(self, client: str, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call a client method in the daemon.
+
+        Args:
+            client (str): Client name, e.g. "session".
+            method (str): Method name, e.g. "info".
+            *args: Positional arguments of the method.
+            **kwargs: Keyword arguments of the method.
+
+        Returns:
+            Any: The result of the method.
+
+        Raises:
+            ConnectionError: If the daemon is not reachable.
+        """
+        request = {"client": client, "method": method, "args": args, "kwargs": kwargs}
+        with self.lock:
+            try:
+                if self.socket is None:
+                    self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self.socket.settimeout(self.timeout)
+                    self.socket.connect(str(self.path))
+                    self.reader = self.socket.makefile("rb")
+                self.socket.sendall(json.dumps(request).encode() + b"\n")
+                line = self.reader.readline()
+            except OSError as error:
+                self._disconnect()
+                raise exceptions.ConnectionError(f"{self.path}: {error}") from error
+            if not line:
+                self._disconnect()
+                raise exceptions.ConnectionError(f"{self.path}: connection closed")
+        reply = json.loads(line)
+        if "error" in reply:
+            kind, message = reply["error"]["type"], reply["error"]["message"]
+            exception = getattr(exceptions, kind, None)
+            if isinstance(exception, type) and issubclass(exception, Exception):
+                raise exception(message)
+            raise exceptions.UnknownError(f"{kind}: {message}")
+        return reply["result"]
+
+    def close(self) -> None:
+        """Close the connection to the daemon."""
+        with self.lock:
+            self._disconnect()
+
+    def _disconnect(self) -> None:
+        """Drop the connection, reconnecting on the next call."""
+        if self.reader is not None:
+            self.reader.close()
+        if self.socket is not None:
+            self.socket.close()
+        self.socket, self.reader = None, None
+
+    def __enter__(self) -> "Remote":
+        """Use the client as a context manager."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the connection on exit."""
+        self.close()
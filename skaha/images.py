@@ -3,10 +3,10 @@
 from typing import Dict, List, Optional
 
 from pydantic import model_validator
-from requests.models import Response
 from typing_extensions import Self
 
 from skaha.client import SkahaClient
+from skaha.utils.index import ImageIndex
 from skaha.utils.logs import get_logger
 
 log = get_logger(__name__)
@@ -42,10 +42,82 @@ class Images(SkahaClient):
         # If kind is not None, add it to the data dictionary
         if kind:
             data["type"] = kind
-        response: Response = self.session.get(url=self.server, params=data)  # type: ignore # noqa
-        response.raise_for_status()
-        response = response.json()
+        response = self._get_json("image", str(self.server), data)
         reply: List[str] = []
         for image in response:
             reply.append(image["id"])  # type: ignore
         return reply
+
+    def index(self, index: Optional[ImageIndex] = None) -> ImageIndex:
+        """Index the complete image catalog, keeping types and metadata.
+
+        Args:
+            index (Optional[ImageIndex], optional): Index to refresh incrementally,
+                e.g. the client `catalog`. Defaults to a new index.
+
+        Returns:
+            ImageIndex: The index.
+
+        Examples:
+            >>> from skaha.images import Images
+            >>> images = Images()
+            >>> catalog = images.index()
+            >>> catalog.resolve("images.canfar.net/skaha/terminal")
+            'images.canfar.net/skaha/terminal:1.1.2'
+            >>> images.index(catalog)  # Later, only re-indexes what changed
+        """
+        records = self._get_json("image", str(self.server), {})
+        if index is None:
+            return ImageIndex(records)
+        delta = index.update(records)
+        log.info(
+            f"Image catalog: {len(delta.added)} added, {len(delta.removed)} removed, "
+            f"{len(delta.changed)} changed"
+        )
+        return index
+
+
+class AsyncImages(SkahaClient):
+    """Asynchronous Skaha Image Management."""
+
+    @model_validator(mode="after")
+    def update_server(self) -> Self:
+        """Sets the server path after validation."""
+        self.server = f"{self.server}/{self.version}/image"  # type: ignore
+        return self
+
+    async def fetch(self, kind: Optional[str] = None) -> List[str]:
+        """Get images from Skaha Server.
+
+        Args:
+            kind (Optional[str], optional): Type of image. Defaults to None.
+
+        Returns:
+            List[str]: A list of images on the skaha server.
+
+        Examples:
+            >>> from skaha.images import AsyncImages
+            >>> images = AsyncImages()
+            >>> await images.fetch(kind="headless")
+        """
+        data: Dict[str, str] = {}
+        if kind:
+            data["type"] = kind
+        response = await self._aget_json("image", str(self.server), data)
+        return [image["id"] for image in response]
+
+    async def index(self, index: Optional[ImageIndex] = None) -> ImageIndex:
+        """Index the complete image catalog, keeping types and metadata.
+
+        Args:
+            index (Optional[ImageIndex], optional): Index to refresh incrementally,
+                e.g. the client `catalog`. Defaults to a new index.
+
+        Returns:
+            ImageIndex: The index.
+        """
+        records = await self._aget_json("image", str(self.server), {})
+        if index is None:
+            return ImageIndex(records)
+        index.update(records)
+        return index
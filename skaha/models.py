@@ -1,6 +1,7 @@
 """Models for Skaha API."""
 
 from base64 import b64encode
+from datetime import datetime, timezone
 from os import environ
 from typing import Any, Dict, List, Optional
 
@@ -9,6 +10,7 @@ from typing_extensions import Self
 
 KINDS: List[str] = ["desktop", "notebook", "carta", "headless"]
 STATUS: List[str] = ["Pending", "Running", "Terminating", "Succeeded", "Error"]
+TERMINAL: List[str] = ["Succeeded", "Error"]
 VIEW: List[str] = ["all"]
 
 
@@ -83,6 +85,17 @@ class FetchSpec(BaseModel):
         None, description="Status of the session.", examples=["Running"]
     )
     view: Optional[str] = Field(None, description="Number of views.", examples=["all"])
+    user: Optional[str] = Field(
+        None, description="Only sessions of this user.", examples=["shinybrar"]
+    )
+    prefix: Optional[str] = Field(
+        None, description="Only sessions whose name starts with.", examples=["job-"]
+    )
+    since: Optional[datetime] = Field(
+        None,
+        description="Only sessions started after this time, UTC if naive.",
+        examples=["2024-01-01T00:00:00Z"],
+    )
 
     @field_validator("kind")
     def validate_kind(cls, value: str) -> str:
@@ -123,6 +136,47 @@ class FetchSpec(BaseModel):
         assert value in VIEW, f"views must be one of: {VIEW}"
         return value
 
+    @field_validator("since")
+    def validate_since(cls, value: datetime) -> datetime:
+        """Validate since, assuming UTC for naive times.
+
+        Args:
+            value (datetime): Value to validate.
+
+        Returns:
+            datetime: Timezone aware value.
+        """
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        """Check a session record against the narrowing filters.
+
+        The server may ignore the `user`, `prefix` and `since` parameters, so
+        they are applied again to the response on the client side.
+
+        Args:
+            record (Dict[str, Any]): Session record, as returned by the server.
+
+        Returns:
+            bool: Whether the session satisfies the filters.
+        """
+        if self.user and record.get("userid") != self.user:
+            return False
+        if self.prefix and not str(record.get("name", "")).startswith(self.prefix):
+            return False
+        if self.since:
+            started = record.get("startTime")
+            if not started:
+                return False
+            started = datetime.fromisoformat(started.replace("Z", "+00:00"))
+            if started.tzinfo is None:
+                started = started.replace(tzinfo=timezone.utc)
+            if started <= self.since:
+                return False
+        return True
+
 
 class ContainerRegistry(BaseModel):
     """Authentication details for private container registry.
@@ -25,17 +25,55 @@ class Overview(SkahaClient):
     def availaibility(self) -> bool:
         """Check if the server backend is available.
 
+        With a `health` check, its cached result is returned while fresh.
+
         Returns:
             bool: True if the server is available, False otherwise.
         """
+        if self.health is not None:
+            return self.health.available()
         response: Response = self.session.get(url=self.server)  # type: ignore # noqa
         response.raise_for_status()  # type: ignore
-        # Parse the XML string
-        root = ET.fromstring(response.text)  # type: ignore
-        available = root.find(
-            ".//{http://www.ivoa.net/xml/VOSIAvailability/v1.0}available"
-        ).text  # type: ignore
-        log.info(f"Server available: {available}")
-        if available == "true":
-            return True
-        return False
+        return parse(response.text)
+
+
+class AsyncOverview(SkahaClient):
+    """Asynchronous Skaha Overview Client."""
+
+    @model_validator(mode="after")
+    def update(self) -> Self:
+        """Sets the server path after validation."""
+        suffix = "availability"
+        self.server = f"{self.server}/{suffix}"  # type: ignore
+        log.debug(f"Server set to {self.server}")
+        return self
+
+    async def availaibility(self) -> bool:
+        """Check if the server backend is available.
+
+        Returns:
+            bool: True if the server is available, False otherwise.
+        """
+        client = self._async_client()
+        response = await client.get(url=str(self.server))
+        response.raise_for_status()
+        return parse(response.text)
+
+
+def parse(text: str) -> bool:
+    """Parse a VOSI availability document.
+
+    Args:
+        text (str): VOSI availability XML.
+
+    Returns:
+        bool: True if the server is available, False otherwise.
+    """
+    root = ET.fromstring(text)
+    available = root.find(
+        ".//{http://www.ivoa.net/xml/VOSIAvailability/v1.0}available"
+    ).text  # type: ignore
+    log.info(f"Server available: {available}")
+    if available == "true":
+        return True
+    return False
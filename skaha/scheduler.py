@@ -0,0 +1,359 @@
+"""Capacity-aware launch scheduler for large arrays of headless jobs.
+
+`Session.create_many` submits every replica at once, so on a busy cluster most
+of them wait in `Pending`. The `Scheduler` instead keeps a local queue and, on
+every round, only admits the jobs that fit into the cores reported free by
+`Session.stats()`, the caller's quota and the number of jobs allowed in
+flight. Job sizes are rounded up to the core and RAM sizes offered by the
+server, and new jobs are admitted as earlier ones reach a terminal status.
+
+Examples:
+    >>> from skaha.models import CreateSpec
+        from skaha.scheduler import Quota, Scheduler
+        from skaha.session import Session
+        session = Session()
+        scheduler = Scheduler(session, inflight=32, quota=Quota(cores=128))
+        launches = scheduler.run(
+            [
+                CreateSpec(
+                    name="fft",
+                    image="images.canfar.net/chimefrb/sample:latest",
+                    cores=3,
+                    ram=6,
+                    kind="headless",
+                    cmd="fft",
+                    replicas=500,
+                )
+            ]
+        )
+        scheduler.statuses
+        {'hjko98yghj': 'Succeeded', 'ikvp1jtp': 'Error', ...}
+"""
+
+import math
+import re
+from collections import deque
+from time import monotonic, sleep
+from typing import Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from skaha.exceptions import ParameterError
+from skaha.models import TERMINAL, CreateSpec
+from skaha.session import Launch, Session, resume
+from skaha.utils import logs
+from skaha.utils.table import cores, memory
+
+log = logs.get_logger(__name__)
+
+# Spec, replica name and request parameters of a queued job
+Job = Tuple[CreateSpec, str, List[Tuple[str, Any]]]
+
+
+class Quota(NamedTuple):
+    """Limits on the resources held by the caller's active sessions.
+
+    Sessions started outside of the scheduler count towards the quota too.
+
+    Attributes:
+        sessions (Optional[int]): Maximum number of active sessions.
+        cores (Optional[float]): Maximum requested cores.
+        ram (Optional[float]): Maximum requested RAM in GB.
+    """
+
+    sessions: Optional[int] = None
+    cores: Optional[float] = None
+    ram: Optional[float] = None
+
+
+class Usage(NamedTuple):
+    """Resources held by the caller's active sessions.
+
+    Attributes:
+        sessions (int): Number of active sessions.
+        cores (float): Requested cores.
+        ram (float): Requested RAM in GB.
+    """
+
+    sessions: int = 0
+    cores: float = 0.0
+    ram: float = 0.0
+
+    def add(self, spec: CreateSpec) -> "Usage":
+        """Usage after launching one more session."""
+        return Usage(self.sessions + 1, self.cores + spec.cores, self.ram + spec.ram)
+
+    def within(self, quota: Quota) -> bool:
+        """Whether the usage respects a quota."""
+        return all(limit is None or used <= limit for used, limit in zip(self, quota))
+
+
+def fit(value: int, sizes: Iterable[int]) -> int:
+    """Round a resource request up to the smallest size offered.
+
+    Args:
+        value (int): Requested amount.
+        sizes (Iterable[int]): Sizes offered by the server.
+
+    Returns:
+        int: Smallest offered size not below the request, the request itself if
+            no sizes are offered.
+
+    Raises:
+        ParameterError: If the request exceeds every offered size.
+    """
+    sizes = sorted(sizes)
+    if not sizes:
+        return value
+    for size in sizes:
+        if size >= value:
+            return size
+    raise ParameterError(f"{value} exceeds the largest available size {sizes[-1]}")
+
+
+class Scheduler:
+    """Admit queued sessions as cluster capacity and the caller's quota allow.
+
+    Args:
+        session (Session): Client used to launch and monitor sessions.
+        inflight (int): Maximum number of scheduled sessions not yet finished.
+        quota (Quota): Limits on the caller's active sessions.
+        headroom (float): Cores of the cluster to always leave free.
+        interval (float): Seconds between scheduling rounds.
+        backfill (bool): Admit smaller jobs past a job that does not fit,
+            instead of keeping the queue in order.
+        resources (Optional[Dict[str, Any]]): Available resources, as returned
+            by `Context.resources()`. Fetched from the server if None.
+        retries (int): Retries of transient launch failures.
+        delay (float): Initial delay in seconds between launch retries.
+        grace (float): Seconds a launched session may be missing from the
+            session list before it is considered failed. The resources of such
+            a session are counted as held in the meantime.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        inflight: int = 16,
+        quota: Quota = Quota(),
+        headroom: float = 0.0,
+        interval: float = 10.0,
+        backfill: bool = False,
+        resources: Optional[Dict[str, Any]] = None,
+        retries: int = 2,
+        delay: float = 1.0,
+        grace: float = 60.0,
+    ) -> None:
+        """Initialize the scheduler with an empty queue."""
+        assert inflight >= 1, "inflight must be positive"
+        self.session = session
+        self.inflight = inflight
+        self.quota = quota
+        self.headroom = headroom
+        self.interval = interval
+        self.backfill = backfill
+        self.resources = resources
+        self.retries = retries
+        self.delay = delay
+        self.grace = grace
+        self.queue: Deque[Job] = deque()
+        self.launches: List[Launch] = []
+        # Last known status of every session launched by the scheduler
+        self.statuses: Dict[str, str] = {}
+        # Launch time and specification of sessions not listed by the server yet
+        self.unseen: Dict[str, Tuple[float, CreateSpec]] = {}
+
+    @property
+    def active(self) -> List[str]:
+        """Sessions launched that have not finished yet, by ID."""
+        return [
+            identity
+            for identity, status in self.statuses.items()
+            if status not in TERMINAL
+        ]
+
+    @property
+    def done(self) -> bool:
+        """Whether every submitted job was launched and has finished."""
+        return not self.queue and not self.active
+
+    def pack(self, spec: CreateSpec) -> CreateSpec:
+        """Round the cores and RAM of a specification up to offered sizes.
+
+        Args:
+            spec (CreateSpec): Session specification.
+
+        Returns:
+            CreateSpec: Specification with valid cores and RAM.
+
+        Raises:
+            ParameterError: If the specification exceeds the largest sizes.
+        """
+        if self.resources is None:
+            url = re.sub(r"/session$", "/context", str(self.session.server))
+            self.resources = self.session._get_json("context", url)
+        assert self.resources is not None
+        return spec.model_copy(
+            update={
+                "cores": fit(spec.cores, self.resources.get("availableCores", [])),
+                "ram": fit(spec.ram, self.resources.get("availableRAM", [])),
+            }
+        )
+
+    def submit(self, specs: Iterable[CreateSpec]) -> None:
+        """Queue every replica of the given specifications.
+
+        With a `ledger` on the session, replicas it recorded as launched are
+        not queued again, but followed until they finish. Sessions created by
+        requests that were never answered are looked up first.
+
+        Args:
+            specs (Iterable[CreateSpec]): Session specifications.
+
+        Raises:
+            ParameterError: If a specification exceeds the largest sizes or,
+                on its own, the quota, or fails the checks of the session
+                `catalog` and `validation` mode.
+        """
+        specs = self.session._validate(list(specs))
+        self.session._reconcile([spec.name for spec in specs])
+        for spec in specs:
+            packed = self.pack(spec)
+            if not Usage().add(packed).within(self.quota):
+                raise ParameterError(f"{spec.name}: a single replica exceeds quota")
+            if (packed.cores, packed.ram) != (spec.cores, spec.ram):
+                log.info(
+                    f"{spec.name}: packed {spec.cores} cores, {spec.ram}G RAM "
+                    f"to {packed.cores} cores, {packed.ram}G RAM"
+                )
+            launched, remaining = resume(self.session.ledger, packed)
+            for identity in launched.values():
+                if identity not in self.statuses:
+                    self.statuses[identity] = "Pending"
+                    self.unseen[identity] = (monotonic(), packed)
+            for name, params in remaining:
+                self.queue.append((packed, name, params))
+        log.info(f"{len(self.queue)} job(s) queued")
+
+    def refresh(self) -> Tuple[float, Usage]:
+        """Update the status of launched sessions and measure free capacity.
+
+        Returns:
+            Tuple[float, Usage]: Cores free on the cluster, after the headroom,
+                and the resources held by the caller's active sessions.
+        """
+        usage = Usage()
+        seen: Dict[str, str] = {}
+        for record in self.session.fetch():
+            seen[record["id"]] = record["status"]
+            if record["status"] in TERMINAL:
+                continue
+            requested = (
+                cores(record.get("requestedCPUCores")),
+                memory(record.get("requestedRAM")) / 1e9,
+            )
+            usage = Usage(
+                usage.sessions + 1,
+                usage.cores + (0.0 if math.isnan(requested[0]) else requested[0]),
+                usage.ram + (0.0 if math.isnan(requested[1]) else requested[1]),
+            )
+        pending = 0.0
+        for identity in self.active:
+            if identity in seen:
+                self.statuses[identity] = seen[identity]
+                self.unseen.pop(identity, None)
+            elif identity in self.unseen:
+                # Launched, but possibly not listed by the server yet
+                launched, spec = self.unseen[identity]
+                if monotonic() - launched < self.grace:
+                    usage = usage.add(spec)
+                    pending += spec.cores
+                    continue
+                del self.unseen[identity]
+                self.statuses[identity] = "Error"
+            else:
+                # Sessions no longer listed were removed, e.g. by `destroy()`
+                self.statuses[identity] = "Error"
+        cluster = self.session.stats().get("cores", {})
+        free = math.inf
+        if "coresAvailable" in cluster:
+            held = float(cluster.get("requestedCPUCores", 0)) + pending
+            free = float(cluster["coresAvailable"]) - held - self.headroom
+        return free, usage
+
+    def admit(self, free: float, usage: Usage) -> List[Job]:
+        """Take the queued jobs that fit, in order.
+
+        Args:
+            free (float): Cores free on the cluster.
+            usage (Usage): Resources held by the caller's active sessions.
+
+        Returns:
+            List[Job]: Jobs to launch now.
+        """
+        admitted: List[Job] = []
+        slots = self.inflight - len(self.active)
+        skipped: List[Job] = []
+        while self.queue and len(admitted) < slots:
+            job = self.queue.popleft()
+            after = usage.add(job[0])
+            if job[0].cores <= free and after.within(self.quota):
+                admitted.append(job)
+                free -= job[0].cores
+                usage = after
+            else:
+                skipped.append(job)
+                if not self.backfill:
+                    break
+        self.queue.extendleft(reversed(skipped))
+        return admitted
+
+    def step(self) -> List[Launch]:
+        """Run a single scheduling round.
+
+        Returns:
+            List[Launch]: Sessions launched in this round.
+        """
+        free, usage = self.refresh()
+        admitted = self.admit(free, usage)
+        if not admitted:
+            return []
+        log.info(
+            f"Launching {len(admitted)} job(s), {len(self.queue)} queued, "
+            f"{free:g} cores free"
+        )
+        launches = self.session._launch(
+            admitted, self.session.concurrency, self.retries, self.delay
+        )
+        for launch in launches:
+            if launch.id is not None:
+                self.statuses[launch.id] = "Pending"
+                self.unseen[launch.id] = (monotonic(), launch.spec)
+        self.launches += launches
+        return launches
+
+    def run(
+        self, specs: Iterable[CreateSpec] = (), timeout: Optional[float] = None
+    ) -> List[Launch]:
+        """Queue specifications and schedule until every job has finished.
+
+        Args:
+            specs (Iterable[CreateSpec]): Session specifications to queue.
+            timeout (Optional[float]): Seconds to wait at most, forever if None.
+
+        Returns:
+            List[Launch]: Every launch, in order. The final status of each
+                session is in `statuses`.
+        """
+        self.submit(specs)
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            self.step()
+            if self.done:
+                break
+            if deadline is not None and monotonic() >= deadline:
+                log.warning(
+                    f"Timed out with {len(self.queue)} queued and "
+                    f"{len(self.active)} active job(s)"
+                )
+                break
+            sleep(self.interval)
+        return self.launches
@@ -1,21 +1,319 @@
 """Skaha Headless Session."""
 
-from asyncio import get_event_loop
-from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter, sleep
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sized,
+    Tuple,
+    Union,
+)
 
-from pydantic import model_validator
-from requests.exceptions import HTTPError
+import httpx
+from pydantic import PrivateAttr, model_validator
+from requests.exceptions import ConnectionError, HTTPError, RequestException, Timeout
 from requests.models import Response
 from typing_extensions import Self
 
 from skaha.client import SkahaClient
-from skaha.models import ContainerRegistry, CreateSpec, FetchSpec
+from skaha.exceptions import APIError, ParameterError
+from skaha.models import TERMINAL, ContainerRegistry, CreateSpec, FetchSpec
+from skaha.sweep import Sweep
 from skaha.utils import convert, logs
-from skaha.utils.threaded import scale
+from skaha.utils.bulk import BulkResult, outcome, pause, timed
+from skaha.utils.delta import Delta, diff
+from skaha.utils.download import SUFFIXES, Manifest, Sink
+from skaha.utils.index import ImageIndex
+from skaha.utils.ledger import Ledger
+from skaha.utils.limits import Limits
+from skaha.utils.table import SessionTable
+from skaha.utils.tail import Cursor, Retry
+from skaha.utils.threaded import Throttle, get_event_loop, scale
+from skaha.utils.watch import Backoff, Event, Watcher
 
 log = logs.get_logger(__name__)
 
 
+class Launch(NamedTuple):
+    """Result of launching a single session with `Session.create_many`.
+
+    Attributes:
+        name (str): Session name, including the replica suffix.
+        spec (CreateSpec): Specification the session was created from.
+        id (Optional[str]): Session ID, None if the launch failed.
+        error (Optional[BaseException]): Last error, None if the launch succeeded.
+        attempts (int): Number of requests made.
+    """
+
+    name: str
+    spec: CreateSpec
+    id: Optional[str]
+    error: Optional[BaseException]
+    attempts: int
+
+    @property
+    def ok(self) -> bool:
+        """Whether the session was launched."""
+        return self.error is None
+
+
+# Fields of a specification that may be overridden for each replica
+OVERRIDES = ("cmd", "args", "env")
+# Environment variables set for each replica
+REPLICA = ("REPLICA_ID", "REPLICA_COUNT")
+# Tolerated clock difference with the server, when looking for sessions created
+# by requests whose response was lost
+SKEW = timedelta(minutes=1)
+
+
+def payloads(
+    specification: CreateSpec,
+    overrides: Optional[Iterable[Dict[str, Any]]] = None,
+) -> Iterator[Tuple[str, List[Tuple[str, Any]]]]:
+    """Expand a session specification into per-replica request payloads.
+
+    The shared part of the specification is serialized once; each replica only
+    adds its name and the `REPLICA_ID`/`REPLICA_COUNT` environment variables,
+    and the `cmd`, `args` and `env` of its override, if any. Payloads are
+    generated lazily, as are the overrides, so neither needs to be held in
+    memory for the whole batch.
+
+    Args:
+        specification (CreateSpec): Session specification.
+        overrides (Optional[Iterable[Dict[str, Any]]], optional): One mapping per
+            replica, e.g. the rows of a table or a generator, with any of `cmd`,
+            `args` and `env`. Override environments are merged over the shared
+            one. Defaults to None.
+
+    Yields:
+        Tuple[str, List[Tuple[str, Any]]]: Replica name and request parameters.
+
+    Raises:
+        ParameterError: If the overrides are not one per replica, override fields
+            other than `cmd`, `args` and `env`, or the session is not headless.
+    """
+    data: Dict[str, Any] = specification.model_dump(exclude_none=True)
+    name = data.pop("name")
+    env = {
+        key: value for key, value in data.pop("env", {}).items() if key not in REPLICA
+    }
+    cmd, args = data.pop("cmd", None), data.pop("args", None)
+    head = convert.dict_to_tuples(data)
+    if cmd is not None:
+        head.append(("cmd", cmd))
+    if args is not None:
+        head.append(("args", args))
+    shared = head + convert.dict_to_tuples({"env": env})
+    total = specification.replicas
+    count = ("env", f"REPLICA_COUNT={total}")
+    rows: Optional[Iterator[Dict[str, Any]]] = None
+    if overrides is not None:
+        if specification.kind != "headless":
+            raise ParameterError("overrides are only supported for headless sessions")
+        if isinstance(overrides, Sized) and len(overrides) != total:
+            raise ParameterError(
+                f"{name}: {len(overrides)} overrides for {total} replicas"
+            )
+        rows = iter(overrides)
+    for replica in range(1, total + 1):
+        replica_name = f"{name}-{replica}"
+        params = [("name", replica_name)]
+        row = next(rows, None) if rows is not None else None
+        if rows is None:
+            params += shared
+        elif row is None:
+            raise ParameterError(f"{name}: overrides ran out at replica {replica}")
+        elif not row:
+            params += shared
+        else:
+            unknown = set(row) - set(OVERRIDES)
+            if unknown:
+                raise ParameterError(f"{name}: cannot override {sorted(unknown)}")
+            params += [item for item in head if item[0] not in row]
+            if "cmd" in row:
+                params.append(("cmd", row["cmd"]))
+            if "args" in row:
+                params.append(("args", row["args"]))
+            merged = {**env, **row.get("env", {})}
+            params += [
+                ("env", f"{key}={value}")
+                for key, value in merged.items()
+                if key not in REPLICA
+            ]
+        params += [("env", f"REPLICA_ID={replica}"), count]
+        yield replica_name, params
+
+
+def replica_names(specification: CreateSpec) -> List[str]:
+    """Names of the replicas of a session specification.
+
+    Args:
+        specification (CreateSpec): Session specification.
+
+    Returns:
+        List[str]: Replica names, `name-1` to `name-{replicas}`.
+    """
+    return [
+        f"{specification.name}-{replica}"
+        for replica in range(1, specification.replicas + 1)
+    ]
+
+
+def transient(error: BaseException) -> bool:
+    """Whether a failed request is worth retrying.
+
+    Args:
+        error (BaseException): Error raised by the request.
+
+    Returns:
+        bool: True for connection errors, timeouts, HTTP 429 and 5xx responses.
+    """
+    if isinstance(error, (ConnectionError, Timeout, httpx.TransportError)):
+        return True
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def resume(
+    ledger: Optional[Ledger],
+    specification: CreateSpec,
+    overrides: Optional[Iterable[Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, str], Iterator[Tuple[str, List[Tuple[str, Any]]]]]:
+    """Split the replicas of a specification into launched and remaining ones.
+
+    The replicas still to be launched are recorded as requested in the ledger.
+
+    Args:
+        ledger (Optional[Ledger]): Ledger of previous launches, if any.
+        specification (CreateSpec): Session specification, its name being the
+            sweep name.
+        overrides (Optional[Iterable[Dict[str, Any]]], optional): Per-replica
+            overrides, see `payloads`. Defaults to None.
+
+    Returns:
+        Tuple[Dict[str, str], Iterator[Tuple[str, List[Tuple[str, Any]]]]]:
+            Session ID of each launched replica by name, and the name and request
+            parameters of each remaining replica, generated lazily.
+    """
+    jobs = payloads(specification, overrides)
+    if ledger is None:
+        return {}, jobs
+    launched = ledger.replicas(specification.name)
+    names = [name for name in replica_names(specification) if name not in launched]
+    if launched:
+        log.info(
+            f"{specification.name}: resuming, {len(launched)} replica(s) launched, "
+            f"{len(names)} remaining"
+        )
+    ledger.request(specification.name, names)
+    return launched, (job for job in jobs if job[0] not in launched)
+
+
+def record(
+    ledger: Optional[Ledger],
+    sweep: str,
+    name: str,
+    id: Optional[str],
+    error: Optional[BaseException] = None,
+) -> None:
+    """Record the outcome of a create request, if there is a ledger.
+
+    Args:
+        ledger (Optional[Ledger]): Ledger of launches, if any.
+        sweep (str): Sweep name.
+        name (str): Replica name.
+        id (Optional[str]): Session ID, None if the request failed.
+        error (Optional[BaseException]): Error of a failed request.
+    """
+    if ledger is not None:
+        ledger.launched(sweep, name, id, error)
+
+
+# HTTP method, query parameters and response decoder of each bulk operation
+OPERATIONS: Dict[str, Tuple[str, Optional[Dict[str, str]], Callable[[Any], Any]]] = {
+    "info": ("GET", {"view": "event"}, lambda response: response.json()),
+    "logs": ("GET", {"view": "logs"}, lambda response: response.text),
+    "destroy": ("DELETE", None, lambda response: True),
+}
+
+
+def validate(
+    specs: List[CreateSpec],
+    catalog: Optional[ImageIndex],
+    limits: Optional[Limits],
+    snap: bool = False,
+) -> List[CreateSpec]:
+    """Check session specifications before any of them is launched.
+
+    Args:
+        specs (List[CreateSpec]): Session specifications.
+        catalog (Optional[ImageIndex]): Images to check against, if any.
+        limits (Optional[Limits]): Resource sizes to check against, if any.
+        snap (bool, optional): Snap invalid sizes to the nearest offered ones.
+            Defaults to False.
+
+    Returns:
+        List[CreateSpec]: Specifications, with snapped sizes if requested.
+
+    Raises:
+        ParameterError: Listing every problem found.
+    """
+    problems: List[str] = []
+    if catalog is not None:
+        problems += catalog.problems(spec.image for spec in specs)
+    if limits is not None:
+        checked: List[CreateSpec] = []
+        for spec in specs:
+            snapped, issues = limits.check(spec, snap)
+            if snapped is not spec:
+                log.info(
+                    f"{spec.name}: snapped to {snapped.cores} cores, "
+                    f"{snapped.ram}G RAM, {snapped.gpus or 0} GPUs"
+                )
+            checked.append(snapped)
+            problems += issues
+        specs = checked
+    if problems:
+        raise ParameterError(f"{len(problems)} problem(s): " + "; ".join(problems))
+    return specs
+
+
+def query(
+    kind: Optional[str] = None,
+    status: Optional[str] = None,
+    view: Optional[str] = None,
+    user: Optional[str] = None,
+    prefix: Optional[str] = None,
+    since: Optional[Union[str, datetime]] = None,
+) -> FetchSpec:
+    """Build the specification of a session listing, dropping unset filters.
+
+    Returns:
+        FetchSpec: Validated specification.
+    """
+    values: Dict[str, Any] = {
+        "kind": kind,
+        "status": status,
+        "view": view,
+        "user": user,
+        "prefix": prefix,
+        "since": since,
+    }
+    return FetchSpec(**{key: value for key, value in values.items() if value})
+
+
 class Session(SkahaClient):
     """Skaha Session Management Client.
 
@@ -26,6 +324,9 @@ class Session(SkahaClient):
         Session: Skaha Session Management Client.
     """
 
+    _cursors: Dict[str, Cursor] = PrivateAttr(default_factory=dict)
+    _limits: Optional[Limits] = PrivateAttr(default=None)
+
     @model_validator(mode="after")
     def set_server(self) -> Self:
         """Sets the server path after validation."""
@@ -34,11 +335,65 @@ class Session(SkahaClient):
         log.debug(f"Server set to {self.server}")
         return self
 
+    def limits(self, refresh: bool = False) -> Limits:
+        """Core, RAM and GPU sizes offered by the server.
+
+        The sizes are fetched once per client, or through its `cache` if one is
+        configured, and used by the `validation` of new sessions.
+
+        Args:
+            refresh (bool, optional): Fetch the sizes again. Defaults to False.
+
+        Returns:
+            Limits: Sizes offered by the server.
+        """
+        if self._limits is None or refresh or self.cache is not None:
+            url = re.sub(r"/session$", "/context", str(self.server))
+            self._limits = Limits.parse(self._get_json("context", url))
+        return self._limits
+
+    def _validate(self, specs: List[CreateSpec]) -> List[CreateSpec]:
+        """Check specifications against the `catalog` and the `validation` mode."""
+        limits = self.limits() if self.validation else None
+        return validate(specs, self.catalog, limits, self.validation == "snap")
+
+    def _scale(
+        self,
+        function: Callable[..., Any],
+        arguments: Iterable[Dict[str, Any]],
+        concurrency: Optional[int] = None,
+    ) -> List[Any]:
+        """Run a bulk request on the shared executor.
+
+        Args:
+            function (Callable[..., Any]): HTTP method of the requests session.
+            arguments (Iterable[Dict[str, Any]]): Keyword arguments for each call,
+                consumed lazily.
+            concurrency (Optional[int], optional): Maximum number of requests in
+                flight, capped by the client concurrency. Defaults to None.
+
+        Returns:
+            List[Any]: Responses or exceptions, in the same order as the arguments.
+        """
+        loop = get_event_loop()
+        return loop.run_until_complete(
+            scale(
+                function,
+                arguments,
+                concurrency=min(concurrency or self.concurrency, self.concurrency),
+                rate=self.rate,
+                executor=self.executor,
+            )
+        )
+
     def fetch(
         self,
         kind: Optional[str] = None,
         status: Optional[str] = None,
         view: Optional[str] = None,
+        user: Optional[str] = None,
+        prefix: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
     ) -> List[Dict[str, str]]:
         """List open sessions for the user.
 
@@ -46,10 +401,18 @@ class Session(SkahaClient):
             kind (str, optional): Session kind. Defaults to None.
             status (str, optional): Session status. Defaults to None.
             view (str, optional): Session view level. Defaults to None.
+            user (str, optional): Only sessions of this user. Defaults to None.
+            prefix (str, optional): Only sessions whose name starts with this
+                prefix. Defaults to None.
+            since (Union[str, datetime], optional): Only sessions started after
+                this time. Defaults to None.
 
         Notes:
             By default, only the calling user's sessions are listed. If views is
             set to 'all', all user sessions are listed (with limited information).
+            The `user`, `prefix` and `since` filters are sent to the server to
+            narrow the response, and applied again locally in case the server
+            ignores them.
 
         Returns:
             list: Sessions information.
@@ -78,16 +441,68 @@ class Session(SkahaClient):
               'startTime': '2222-12-07T05:45:58Z'},
               ...]
         """
-        values: Dict[str, str] = {}
-        for key, value in {"kind": kind, "status": status, "view": view}.items():
-            if value:
-                values[key] = value
-        spec = FetchSpec(**values)
-        parameters = spec.model_dump(exclude_none=True)
+        spec = query(kind, status, view, user, prefix, since)
+        parameters = spec.model_dump(mode="json", exclude_none=True)
         log.debug(parameters)
         response: Response = self.session.get(url=self.server, params=parameters)  # type: ignore # noqa: E501
         response.raise_for_status()  # type: ignore # noqa: E501
-        return response.json()
+        records = [record for record in response.json() if spec.matches(record)]
+        if self.ledger is not None:
+            self.ledger.observe(records)
+        return records
+
+    def fetch_since(
+        self, snapshot: Union[Delta, List[Dict[str, Any]]], **filters: Any
+    ) -> Delta:
+        """List the sessions added, removed or changed since a previous fetch.
+
+        Args:
+            snapshot (Union[Delta, List[Dict[str, Any]]]): Result of a previous
+                `fetch()` or `fetch_since()` call.
+            **filters: Passed on to `fetch()`, e.g. `view="all"`.
+
+        Returns:
+            Delta: The changes, and the new snapshot.
+
+        Examples:
+            >>> from skaha.session import Session
+            >>> session = Session()
+            >>> delta = session.fetch_since([], view="all")
+            >>> delta = session.fetch_since(delta, view="all")
+            >>> delta.added, delta.removed, delta.changed
+        """
+        if isinstance(snapshot, Delta):
+            snapshot = snapshot.snapshot
+        return diff(snapshot, self.fetch(**filters))
+
+    def table(
+        self,
+        kind: Optional[str] = None,
+        status: Optional[str] = None,
+        view: Optional[str] = None,
+    ) -> SessionTable:
+        """List sessions as a compact, typed table.
+
+        Takes the same arguments as `fetch()`, but parses the resource units and
+        timestamps once into columns, which suits cluster-wide views with
+        thousands of sessions.
+
+        Args:
+            kind (str, optional): Session kind. Defaults to None.
+            status (str, optional): Session status. Defaults to None.
+            view (str, optional): Session view level. Defaults to None.
+
+        Returns:
+            SessionTable: Sessions information.
+
+        Examples:
+            >>> from skaha.session import Session
+            >>> session = Session()
+            >>> table = session.table(view="all")
+            >>> table.count("status")
+            {'Running': 1021, 'Pending': 14}
+        """
+        return SessionTable.from_records(self.fetch(kind, status, view))
 
     def stats(self) -> Dict[str, Any]:
         """Get statistics for the entire skaha cluster.
@@ -131,14 +546,15 @@ class Session(SkahaClient):
         arguments: List[Any] = []
         for value in id:
             arguments.append({"url": f"{self.server}/{value}", "params": parameters})
-        loop = get_event_loop()
-        results = loop.run_until_complete(scale(self.session.get, arguments))
+        results = self._scale(self.session.get, arguments)
         responses: List[Dict[str, Any]] = []
         for response in results:
             try:
+                if isinstance(response, BaseException):
+                    raise response
                 response.raise_for_status()
                 responses.append(response.json())
-            except HTTPError as err:
+            except (RequestException, APIError) as err:
                 log.error(err)
         return responses
 
@@ -161,18 +577,296 @@ class Session(SkahaClient):
         arguments: List[Any] = []
         for value in id:
             arguments.append({"url": f"{self.server}/{value}", "params": parameters})
-        loop = get_event_loop()
-        results = loop.run_until_complete(scale(self.session.get, arguments))
+        results = self._scale(self.session.get, arguments)
         responses: Dict[str, str] = {}
-        for index, identity in enumerate(id):
+        for identity, response in zip(id, results):
             responses[identity] = ""
             try:
-                results[index].raise_for_status()
-                responses[identity] = results[index].text
-            except HTTPError as err:
+                if isinstance(response, BaseException):
+                    raise response
+                response.raise_for_status()
+                responses[identity] = response.text
+            except (RequestException, APIError) as err:
                 log.error(err)
         return responses
 
+    def stream_logs(
+        self,
+        id: Union[List[str], str],
+        follow: bool = True,
+        interval: float = 5.0,
+        chunk: int = 65536,
+    ) -> Iterator[Tuple[str, str]]:
+        """Stream logs from session[s], line by line, as they are written.
+
+        Logs are read in chunks and never held in memory as a whole. The byte
+        offset of each session is remembered on the client, so subsequent polls
+        (and subsequent calls) only fetch content that has not been seen yet.
+        A session whose log cannot be read is skipped for a growing number of
+        polls and read again from its offset, without stopping the others.
+
+        Args:
+            id (Union[List[str], str]): Session ID[s].
+            follow (bool, optional): Keep polling for new lines until the sessions
+                finish. Defaults to True.
+            interval (float, optional): Seconds between polls. Defaults to 5.0.
+            chunk (int, optional): Read size in bytes. Defaults to 65536.
+
+        Yields:
+            Tuple[str, str]: Session ID and log line.
+
+        Examples:
+            >>> for identity, line in session.stream_logs(["hjko98yghj", "ikvp1jtp"]):
+            ...     print(identity, line)
+        """
+        if isinstance(id, str):
+            id = [id]
+        active = list(dict.fromkeys(id))
+        retry = Retry()
+        while active:
+            finished = self._finished(active) if follow else active
+            for identity in active:
+                if not retry.due(identity):
+                    continue
+                try:
+                    for line in self._tail(identity, chunk):
+                        yield identity, line
+                except (RequestException, APIError) as err:
+                    log.warning(f"{identity}: reading logs failed, retrying: {err}")
+                    retry.failed(identity)
+                else:
+                    retry.succeeded(identity)
+            # Keep finished sessions whose last read failed for another attempt
+            finished = [
+                identity for identity in finished if not retry.pending(identity)
+            ]
+            for identity in finished:
+                for line in self._cursors[identity].flush():
+                    yield identity, line
+            active = [identity for identity in active if identity not in finished]
+            if active:
+                sleep(interval)
+
+    def download_logs(
+        self,
+        id: Union[List[str], str],
+        directory: Union[str, Path],
+        compression: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        chunk: int = 65536,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Save the logs of session[s] to files, streaming them to disk.
+
+        Each log is written chunk by chunk as it arrives, so memory use does
+        not depend on the log sizes. Logs already in the directory are resumed:
+        only the bytes past the saved ones are requested, with a `Range`
+        header, or skipped as they arrive if the server ignores it. A
+        `manifest.json` describing every saved log is kept in the directory.
+
+        Args:
+            id (Union[List[str], str]): Session ID[s].
+            directory (Union[str, Path]): Directory to save the logs in, created
+                if missing. Each log is saved as `<id>.log`, `<id>.log.gz` or
+                `<id>.log.zst`.
+            compression (Optional[str], optional): None, "gzip" or "zstd", the
+                latter requiring the `zstandard` package. Defaults to None.
+            concurrency (Optional[int], optional): Maximum number of downloads in
+                flight, capped by the client concurrency. Defaults to None.
+            chunk (int, optional): Read size in bytes. Defaults to 65536.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Manifest entry of each session, with the
+                `file` name, uncompressed `bytes`, `stored` bytes, `compression`,
+                whether it is `complete` and the `error` if not.
+
+        Examples:
+            >>> manifest = session.download_logs(ids, "logs", compression="gzip")
+            >>> manifest["hjko98yghj"]
+            {'file': 'hjko98yghj.log.gz', 'bytes': 16777216, 'stored': 40521,
+             'compression': 'gzip', 'complete': True, 'error': None,
+             'updated': '2024-06-01T12:00:00+00:00'}
+        """
+        if isinstance(id, str):
+            id = [id]
+        if compression not in SUFFIXES:
+            raise ParameterError(f"unsupported compression {compression!r}")
+        folder = Path(directory)
+        folder.mkdir(parents=True, exist_ok=True)
+        manifest = Manifest(folder)
+        ids = list(dict.fromkeys(id))
+        arguments: List[Dict[str, Any]] = [
+            {
+                "identity": identity,
+                "folder": folder,
+                "manifest": manifest,
+                "compression": compression,
+                "chunk": chunk,
+            }
+            for identity in ids
+        ]
+        results = self._scale(self._download, arguments, concurrency)
+        entries: Dict[str, Dict[str, Any]] = {}
+        for identity, result in zip(ids, results):
+            if isinstance(result, BaseException):
+                log.error(f"{identity}: {result}")
+                result = manifest.update(
+                    identity,
+                    file=f"{identity}{SUFFIXES[compression]}",
+                    compression=compression,
+                    complete=False,
+                    error=f"{type(result).__name__}: {result}",
+                )
+            entries[identity] = result
+        return entries
+
+    def _download(
+        self,
+        identity: str,
+        folder: Path,
+        manifest: Manifest,
+        compression: Optional[str],
+        chunk: int,
+    ) -> Dict[str, Any]:
+        """Stream the unsaved part of a session log to its file.
+
+        Args:
+            identity (str): Session ID.
+            folder (Path): Directory of the logs.
+            manifest (Manifest): Manifest of the directory.
+            compression (Optional[str]): None, "gzip" or "zstd".
+            chunk (int): Read size in bytes.
+
+        Returns:
+            Dict[str, Any]: Updated manifest entry.
+        """
+        path = folder / f"{identity}{SUFFIXES[compression]}"
+        sink = Sink(path, compression, manifest.offset(identity, path, compression))
+        headers = {"Range": f"bytes={sink.offset}-"} if sink.offset else {}
+        with self.session.get(
+            url=f"{self.server}/{identity}",
+            params={"view": "logs"},
+            headers=headers,
+            stream=True,
+        ) as response:
+            # Nothing new past the saved part
+            if response.status_code != 416:
+                response.raise_for_status()
+                sink.begin(partial=response.status_code == 206)
+                try:
+                    for data in response.iter_content(chunk_size=chunk):
+                        sink.write(data)
+                except BaseException:
+                    sink.close(failed=True)
+                    raise
+                sink.close()
+        if self.ledger is not None:
+            self.ledger.locate(identity, path)
+        return manifest.update(
+            identity,
+            file=path.name,
+            bytes=sink.total,
+            stored=path.stat().st_size,
+            compression=compression,
+            complete=True,
+            error=None,
+        )
+
+    def watch(
+        self,
+        id: Union[List[str], str],
+        until: Iterable[str] = TERMINAL,
+        interval: float = 1.0,
+        maximum: float = 30.0,
+        callback: Optional[Callable[[Event], Any]] = None,
+    ) -> Iterator[Event]:
+        """Watch session[s] and yield status transitions.
+
+        Each poll issues a single `fetch()` for all watched sessions and diffs it
+        against the previous snapshot, so only changes are reported. The polling
+        interval doubles while nothing changes, up to `maximum`, and resets on
+        every change. A session stops being watched once it reaches a status in
+        `until` or disappears from the listing.
+
+        Args:
+            id (Union[List[str], str]): Session ID[s].
+            until (Iterable[str], optional): Final statuses.
+                Defaults to ["Succeeded", "Error"].
+            interval (float, optional): Initial polling interval in seconds.
+                Defaults to 1.0.
+            maximum (float, optional): Longest polling interval in seconds.
+                Defaults to 30.0.
+            callback (Optional[Callable[[Event], Any]], optional): Called with each
+                event as it is observed. Defaults to None.
+
+        Yields:
+            Event: Session status transitions, starting with the initial status.
+
+        Examples:
+            >>> for event in session.watch(["hjko98yghj", "ikvp1jtp"]):
+            ...     print(event.id, event.previous, "->", event.current)
+        """
+        if isinstance(id, str):
+            id = [id]
+        watcher = Watcher(id, until)
+        backoff = Backoff(interval, maximum)
+        while watcher.pending:
+            events = watcher.update(self.fetch())
+            for event in events:
+                if callback:
+                    callback(event)
+                yield event
+            if watcher.pending:
+                sleep(backoff.next(changed=bool(events)))
+
+    def _tail(self, identity: str, chunk: int) -> Iterator[str]:
+        """Read the unseen part of a session log.
+
+        Args:
+            identity (str): Session ID.
+            chunk (int): Read size in bytes.
+
+        Yields:
+            str: Complete log lines.
+
+        Raises:
+            RequestException: If the log could not be read, with the cursor kept
+                at the last consumed byte.
+        """
+        cursor = self._cursors.setdefault(identity, Cursor())
+        try:
+            with self.session.get(
+                url=f"{self.server}/{identity}",
+                params={"view": "logs"},
+                headers=cursor.headers,
+                stream=True,
+            ) as response:
+                # Nothing new past the current offset
+                if response.status_code == 416:
+                    return
+                response.raise_for_status()
+                cursor.begin(partial=response.status_code == 206)
+                for data in response.iter_content(chunk_size=chunk):
+                    yield from cursor.feed(data)
+        except HTTPError as err:
+            log.error(err)
+
+    def _finished(self, ids: List[str]) -> List[str]:
+        """Session IDs that reached a terminal status or no longer exist.
+
+        Args:
+            ids (List[str]): Session IDs.
+
+        Returns:
+            List[str]: Finished session IDs.
+        """
+        status = {item["id"]: item["status"] for item in self.fetch()}
+        # Sessions missing from the listing have already been removed
+        return [
+            identity
+            for identity in ids
+            if identity not in status or status[identity] in TERMINAL
+        ]
+
     def create(
         self,
         name: str,
@@ -186,6 +880,7 @@ class Session(SkahaClient):
         env: Dict[str, Any] = {},
         replicas: int = 1,
         registry: Optional[ContainerRegistry] = None,
+        overrides: Optional[Iterable[Dict[str, Any]]] = None,
     ) -> List[str]:
         """Launch a skaha session.
 
@@ -201,12 +896,21 @@ class Session(SkahaClient):
             env (Optional[Dict[str, Any]], optional): Environment variables to inject.
                 Defaults to None.
             replicas (int, optional): Number of sessions to launch. Defaults to 1.
+            overrides (Optional[Iterable[Dict[str, Any]]], optional): Per-replica
+                `cmd`, `args` and `env`, one mapping per replica, e.g. the rows
+                of a table or a generator consumed as requests are sent.
+                Defaults to None.
 
         Notes:
             The name of the session suffixed with the replica number. eg. test-1, test-2
             Each container will have the following environment variables injected:
                 * REPLICA_ID - The replica number
                 * REPLICA_COUNT - The total number of replicas
+            With a `ledger`, the name is also the name of the sweep: replicas
+            already launched by a previous call are not launched again, and
+            their session IDs are returned along with the new ones.
+            With a `catalog`, the image is checked before any session is
+            launched, and so are the resources with a `validation` mode.
 
         Returns:
             List[str]: A list of session IDs for the launched sessions.
@@ -237,28 +941,264 @@ class Session(SkahaClient):
             env=env,
             replicas=replicas,
         )
-        data: Dict[str, Any] = specification.model_dump(exclude_none=True)
+        specification = self._validate([specification])[0]
         log.info(f"Creating {replicas} session(s) with parameters:")
-        log.info(data)
-        payload: List[Tuple[str, Any]] = []
-        arguments: List[Any] = []
-        for replica in range(replicas):
-            data["name"] = name + "-" + str(replica + 1)
-            data["env"].update({"REPLICA_ID": str(replica + 1)})
-            data["env"].update({"REPLICA_COUNT": str(replicas)})
-            log.debug(f"Replica Data: {data}")
-            payload = convert.dict_to_tuples(data)
-            arguments.append({"url": self.server, "params": payload})
-        loop = get_event_loop()
-        results = loop.run_until_complete(scale(self.session.post, arguments))
-        responses: List[str] = []
-        for response in results:
+        log.info(specification.model_dump(exclude_none=True))
+        return self._create(specification, overrides)
+
+    def _create(
+        self,
+        specification: CreateSpec,
+        overrides: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """Launch the replicas of a validated specification.
+
+        Args:
+            specification (CreateSpec): Session specification.
+            overrides (Optional[Iterable[Dict[str, Any]]], optional): Per-replica
+                overrides, see `payloads`. Defaults to None.
+
+        Returns:
+            List[str]: Session IDs of the launched replicas, in replica order.
+        """
+        name = specification.name
+        self._reconcile([name])
+        launched, remaining = resume(self.ledger, specification, overrides)
+        submitted: List[str] = []
+
+        def arguments() -> Iterator[Dict[str, Any]]:
+            # Payloads are built as requests start, not held for the whole batch
+            for replica, payload in remaining:
+                submitted.append(replica)
+                yield {"url": self.server, "params": payload}
+
+        results = self._scale(self.session.post, arguments())
+        for replica, response in zip(submitted, results):
             try:
+                if isinstance(response, BaseException):
+                    raise response
                 response.raise_for_status()
-                responses.append(response.text.rstrip("\r\n"))
-            except HTTPError as err:
+                launched[replica] = response.text.rstrip("\r\n")
+                record(self.ledger, name, replica, launched[replica])
+            except (RequestException, APIError) as err:
                 log.error(err)
-        return responses
+                record(self.ledger, name, replica, None, err)
+        return [
+            launched[replica]
+            for replica in replica_names(specification)
+            if replica in launched
+        ]
+
+    def sweep(self, sweep: Sweep) -> List[str]:
+        """Launch a parameter sweep over headless sessions.
+
+        The parts of the sweep, of at most 256 replicas each, are launched one
+        after the other, every replica with the `cmd`, `args` and `env` of its
+        rows. Each part is checked like `create` before it is launched and, with
+        a `ledger`, resumed under its own name.
+
+        Args:
+            sweep (Sweep): Template specification and parameter rows.
+
+        Returns:
+            List[str]: Session IDs of the launched sessions, in row order.
+
+        Examples:
+            >>> from skaha.models import CreateSpec
+            >>> from skaha.sweep import Sweep
+            >>> template = CreateSpec(name="fft", image=image, kind="headless",
+            ...                       cmd="fft", args="--beam {beam}", env={})
+            >>> session.sweep(Sweep(template, "beams.csv", per=1))
+            ["hjko98yghj", "ikvp1jtp", ...]
+        """
+        log.info(f"Sweeping {sweep.total or 'an unknown number of'} row(s)")
+        ids: List[str] = []
+        for part, overrides in sweep.parts():
+            part = self._validate([part])[0]
+            log.info(f"{part.name}: creating {part.replicas} session(s)")
+            ids += self._create(part, overrides)
+        return ids
+
+    def create_many(
+        self,
+        specs: Iterable[CreateSpec],
+        wave: int = 64,
+        concurrency: Optional[int] = None,
+        retries: int = 2,
+        delay: float = 1.0,
+    ) -> List[Launch]:
+        """Launch many heterogeneous sessions in waves.
+
+        Every spec is expanded into its replicas (named `name-1`, `name-2`, ...)
+        and serialized once up front. Jobs are then submitted in waves of `wave`
+        requests; within a wave, failures caused by connection errors, HTTP 429
+        or 5xx responses are retried up to `retries` times with exponential
+        backoff before moving on to the next wave.
+
+        With a `ledger`, replicas already launched by a previous call are not
+        launched again; their result has the recorded ID and no attempts. With a
+        `catalog` or a `validation` mode, every spec is checked up front and all
+        problems are reported in a single `ParameterError`.
+
+        Args:
+            specs (Iterable[CreateSpec]): Session specifications, each with its own
+                image, resources, cmd, args, env and replicas.
+            wave (int, optional): Number of jobs submitted per wave. Defaults to 64.
+            concurrency (Optional[int], optional): Maximum number of requests in
+                flight, capped by the client concurrency. Defaults to None.
+            retries (int, optional): Retries per failed job. Defaults to 2.
+            delay (float, optional): Initial delay in seconds between retries.
+                Defaults to 1.0.
+
+        Returns:
+            List[Launch]: One result per job, including the failed ones, those
+                resumed from the ledger first and the others in submission order.
+
+        Examples:
+            >>> from skaha.models import CreateSpec
+            >>> specs = [
+            ...     CreateSpec(name="fft", image=image, kind="headless", cmd="fft",
+            ...                env={}, replicas=128),
+            ...     CreateSpec(name="plot", image=other, kind="headless", cmd="plot",
+            ...                env={}, replicas=4),
+            ... ]
+            >>> results = session.create_many(specs, wave=32)
+            >>> [result.name for result in results if not result.ok]
+            ['fft-17']
+        """
+        assert wave >= 1, "wave must be at least 1"
+        specs = self._validate(list(specs))
+        self._reconcile([spec.name for spec in specs])
+        launches: List[Launch] = []
+        jobs: List[Tuple[CreateSpec, str, List[Tuple[str, Any]]]] = []
+        for spec in specs:
+            launched, remaining = resume(self.ledger, spec)
+            launches += [
+                Launch(name, spec, identity, None, 0)
+                for name, identity in launched.items()
+            ]
+            jobs += [(spec, name, payload) for name, payload in remaining]
+        log.info(f"Creating {len(jobs)} session(s) in waves of {wave}")
+        for start in range(0, len(jobs), wave):
+            stop = start + wave
+            launches += self._launch(jobs[start:stop], concurrency, retries, delay)
+        return launches
+
+    def _reconcile(self, names: List[str]) -> None:
+        """Adopt the sessions created by requests that were never answered.
+
+        Sessions are only listed if the ledger has replicas of the sweeps
+        requested but not resolved, see `Ledger.unresolved`.
+
+        Args:
+            names (List[str]): Sweep names.
+        """
+        if self.ledger is None or not any(map(self.ledger.unresolved, names)):
+            return
+        self.fetch(prefix=names[0] if len(names) == 1 else None)
+
+    def _launch(
+        self,
+        batch: List[Tuple[CreateSpec, str, List[Tuple[str, Any]]]],
+        concurrency: Optional[int] = None,
+        retries: int = 2,
+        delay: float = 1.0,
+    ) -> List[Launch]:
+        """Submit a single wave of jobs, retrying transient failures.
+
+        Args:
+            batch (List[Tuple[CreateSpec, str, List[Tuple[str, Any]]]]): Spec,
+                replica name and request parameters of each job.
+            concurrency (Optional[int], optional): Maximum number of requests in
+                flight. Defaults to None.
+            retries (int, optional): Retries per failed job. Defaults to 2.
+            delay (float, optional): Initial delay in seconds between retries.
+                Defaults to 1.0.
+
+        Returns:
+            List[Launch]: One result per job, in the same order.
+        """
+        outcome: Dict[int, Launch] = {}
+        pending = list(range(len(batch)))
+        since = datetime.now(timezone.utc) - SKEW
+        for attempt in range(1, retries + 2):
+            if attempt > 1:
+                sleep(delay * 2 ** (attempt - 2))
+                pending = self._unlaunched(batch, pending, outcome, since)
+                if not pending:
+                    break
+            arguments = [
+                {"url": self.server, "params": batch[index][2]} for index in pending
+            ]
+            results = self._scale(self.session.post, arguments, concurrency)
+            retry: List[int] = []
+            for index, response in zip(pending, results):
+                spec, name, _ = batch[index]
+                try:
+                    if isinstance(response, BaseException):
+                        raise response
+                    response.raise_for_status()
+                    identity = response.text.rstrip("\r\n")
+                    outcome[index] = Launch(name, spec, identity, None, attempt)
+                except Exception as err:
+                    outcome[index] = Launch(name, spec, None, err, attempt)
+                    if transient(err):
+                        retry.append(index)
+            pending = retry
+            if not pending:
+                break
+        for index in range(len(batch)):
+            launch = outcome[index]
+            if launch.error is not None:
+                log.error(f"{launch.name}: {launch.error}")
+            record(self.ledger, launch.spec.name, launch.name, launch.id, launch.error)
+        return [outcome[index] for index in range(len(batch))]
+
+    def _unlaunched(
+        self,
+        batch: List[Tuple[CreateSpec, str, List[Tuple[str, Any]]]],
+        pending: List[int],
+        outcome: Dict[int, Launch],
+        since: datetime,
+    ) -> List[int]:
+        """Adopt the sessions created by failed requests, before retrying them.
+
+        Creating a session is not idempotent: a request that timed out or failed
+        with a server error may still have created its session. Sessions started
+        since the wave began, named after a pending job and not already launched,
+        are adopted instead of being created again.
+
+        Args:
+            batch (List[Tuple[CreateSpec, str, List[Tuple[str, Any]]]]): Jobs of
+                the wave.
+            pending (List[int]): Indices of the jobs to retry.
+            outcome (Dict[int, Launch]): Results of the jobs, updated in place.
+            since (datetime): Start of the wave.
+
+        Returns:
+            List[int]: Indices of the jobs still to retry, none if the sessions
+                cannot be listed.
+        """
+        try:
+            records = self.fetch(since=since)
+        except (RequestException, APIError) as err:
+            log.warning(f"Not retrying {len(pending)} session(s): {err}")
+            return []
+        claimed = {launch.id for launch in outcome.values() if launch.id}
+        found: Dict[str, List[str]] = {}
+        for session in records:
+            if session.get("id") and session["id"] not in claimed:
+                found.setdefault(session.get("name", ""), []).append(session["id"])
+        retry: List[int] = []
+        for index in pending:
+            name = batch[index][1]
+            if not found.get(name):
+                retry.append(index)
+                continue
+            identity = found[name].pop()
+            log.info(f"{name}: adopting session {identity} of a failed request")
+            outcome[index] = outcome[index]._replace(id=identity, error=None)
+        return retry
 
     def destroy(self, id: Union[str, List[str]]) -> Dict[str, bool]:
         """Destroy skaha session[s].
@@ -279,14 +1219,729 @@ class Session(SkahaClient):
         arguments: List[Any] = []
         for value in id:
             arguments.append({"url": f"{self.server}/{value}"})
-        loop = get_event_loop()
-        results = loop.run_until_complete(scale(self.session.delete, arguments))
+        results = self._scale(self.session.delete, arguments)
         responses: Dict[str, bool] = {}
-        for index, identity in enumerate(id):
+        for identity, response in zip(id, results):
             try:
-                results[index].raise_for_status()
+                if isinstance(response, BaseException):
+                    raise response
+                response.raise_for_status()
                 responses[identity] = True
-            except HTTPError as err:
+                if self.ledger is not None:
+                    self.ledger.destroyed(identity)
+            except (RequestException, APIError) as err:
                 log.error(err)
                 responses[identity] = False
+                if self.ledger is not None:
+                    self.ledger.destroyed(identity, err)
         return responses
+
+    def bulk(
+        self, operation: str, id: Union[str, List[str]], redrive: int = 0
+    ) -> BulkResult:
+        """Run a bulk operation, with a structured outcome for every session.
+
+        Unlike `info()`, `logs()` and `destroy()`, failures are not only logged:
+        each session gets its value or a `skaha.exceptions` error, the request
+        latency and the number of attempts. Sessions that failed with a
+        transient error can be re-driven, without repeating the whole batch,
+        after a jittered backoff and once the circuit breaker has closed.
+        Destroyed sessions are marked in the ledger, if any.
+
+        Args:
+            operation (str): One of "info", "logs" or "destroy".
+            id (Union[str, List[str]]): Session ID[s].
+            redrive (int, optional): Rounds of re-driving the sessions that
+                failed with a transient error. Defaults to 0.
+
+        Returns:
+            BulkResult: Outcomes keyed by session ID.
+
+        Examples:
+            >>> result = session.bulk("destroy", ids, redrive=2)
+            >>> result.succeeded
+            {'hjko98yghj': True, ...}
+            >>> result.failed
+            {'ikvp1jtp': ParameterError('HTTPError: 404 Client Error: ...')}
+        """
+        method, params, decode = OPERATIONS[operation]
+        if isinstance(id, str):
+            id = [id]
+
+        def drive(keys: List[str]) -> BulkResult:
+            arguments = [
+                {"method": method, "url": f"{self.server}/{key}", "params": params}
+                for key in keys
+            ]
+            results: List[Tuple[Any, float]] = self._scale(
+                timed(self.session.request), arguments
+            )
+            return BulkResult(
+                {
+                    key: outcome(response, latency, decode)
+                    for key, (response, latency) in zip(keys, results)
+                }
+            )
+
+        result = drive(list(dict.fromkeys(id)))
+        for attempt in range(1, redrive + 1):
+            pending = result.pending()
+            if not pending:
+                break
+            delay = pause(attempt, self.policy, self.breaker)
+            log.info(f"Re-driving {len(pending)} failed session(s) in {delay:.1f}s")
+            sleep(delay)
+            result = result.merge(drive(pending))
+        if operation == "destroy" and self.ledger is not None:
+            for key, item in result.items():
+                self.ledger.destroyed(key, item.error)
+        return result
+
+
+class AsyncSession(SkahaClient):
+    """Asynchronous Skaha Session Management Client.
+
+    All requests are issued through a single pooled, keep-alive HTTPX client, so
+    the methods can be awaited from an already running event loop and thousands
+    of session operations can be driven without a thread per request.
+
+    Args:
+        SkahaClient (SkahaClient): Base HTTP client.
+
+    Returns:
+        AsyncSession: Asynchronous Skaha Session Management Client.
+
+    Examples:
+        >>> from skaha.session import AsyncSession
+        >>> async with AsyncSession() as session:
+        ...     await session.fetch(kind="headless")
+    """
+
+    _cursors: Dict[str, Cursor] = PrivateAttr(default_factory=dict)
+    _limits: Optional[Limits] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def set_server(self) -> Self:
+        """Sets the server path after validation."""
+        suffix = "session"
+        self.server = f"{self.server}/{self.version}/{suffix}"  # type: ignore
+        log.debug(f"Server set to {self.server}")
+        return self
+
+    async def limits(self, refresh: bool = False) -> Limits:
+        """Core, RAM and GPU sizes offered by the server.
+
+        See `Session.limits`.
+
+        Args:
+            refresh (bool, optional): Fetch the sizes again. Defaults to False.
+
+        Returns:
+            Limits: Sizes offered by the server.
+        """
+        if self._limits is None or refresh or self.cache is not None:
+            url = re.sub(r"/session$", "/context", str(self.server))
+            self._limits = Limits.parse(await self._aget_json("context", url))
+        return self._limits
+
+    async def _gather(
+        self,
+        method: str,
+        arguments: Iterable[Dict[str, Any]],
+        latencies: Optional[List[float]] = None,
+    ) -> List[Union[httpx.Response, BaseException]]:
+        """Issue requests concurrently, bounded by the client concurrency and rate.
+
+        A fixed pool of workers pulls the arguments one as each request starts,
+        so a generator of arguments is never materialized.
+
+        Args:
+            method (str): HTTP method.
+            arguments (Iterable[Dict[str, Any]]): Keyword arguments for each
+                request.
+            latencies (Optional[List[float]]): If given, filled with the seconds
+                taken by each request as it completes, in the same order as the
+                arguments.
+
+        Returns:
+            List[Union[httpx.Response, BaseException]]: Responses or exceptions,
+                in the same order as the arguments.
+
+        Raises:
+            Exception: Any error raised while generating the arguments, once the
+                requests already started have completed.
+        """
+        client = self._async_client()
+        throttle = Throttle(self.rate) if self.rate else None
+        jobs = enumerate(arguments)
+        results: Dict[int, Union[httpx.Response, BaseException]] = {}
+        failures: List[Exception] = []
+        if latencies is not None:
+            latencies.clear()
+
+        async def work() -> None:
+            while not failures:
+                try:
+                    index, kwargs = next(jobs)
+                except StopIteration:
+                    return
+                except Exception as error:
+                    failures.append(error)
+                    return
+                if throttle:
+                    await throttle.wait()
+                start = perf_counter()
+                try:
+                    results[index] = await client.request(method, **kwargs)
+                except Exception as error:
+                    results[index] = error
+                if latencies is not None:
+                    latencies.extend([0.0] * (index + 1 - len(latencies)))
+                    latencies[index] = perf_counter() - start
+
+        await asyncio.gather(*[work() for _ in range(self.concurrency)])
+        if failures:
+            raise failures[0]
+        return [results[index] for index in range(len(results))]
+
+    async def fetch(
+        self,
+        kind: Optional[str] = None,
+        status: Optional[str] = None,
+        view: Optional[str] = None,
+        user: Optional[str] = None,
+        prefix: Optional[str] = None,
+        since: Optional[Union[str, datetime]] = None,
+    ) -> List[Dict[str, str]]:
+        """List open sessions for the user.
+
+        Args:
+            kind (str, optional): Session kind. Defaults to None.
+            status (str, optional): Session status. Defaults to None.
+            view (str, optional): Session view level. Defaults to None.
+            user (str, optional): Only sessions of this user. Defaults to None.
+            prefix (str, optional): Only sessions whose name starts with this
+                prefix. Defaults to None.
+            since (Union[str, datetime], optional): Only sessions started after
+                this time. Defaults to None.
+
+        Returns:
+            list: Sessions information.
+
+        Examples:
+            >>> await session.fetch(kind="notebook")
+        """
+        spec = query(kind, status, view, user, prefix, since)
+        parameters = spec.model_dump(mode="json", exclude_none=True)
+        log.debug(parameters)
+        client = self._async_client()
+        response = await client.get(url=str(self.server), params=parameters)
+        response.raise_for_status()
+        records = [record for record in response.json() if spec.matches(record)]
+        if self.ledger is not None:
+            self.ledger.observe(records)
+        return records
+
+    async def fetch_since(
+        self, snapshot: Union[Delta, List[Dict[str, Any]]], **filters: Any
+    ) -> Delta:
+        """List the sessions added, removed or changed since a previous fetch.
+
+        Args:
+            snapshot (Union[Delta, List[Dict[str, Any]]]): Result of a previous
+                `fetch()` or `fetch_since()` call.
+            **filters: Passed on to `fetch()`, e.g. `view="all"`.
+
+        Returns:
+            Delta: The changes, and the new snapshot.
+
+        Examples:
+            >>> delta = await session.fetch_since(delta, view="all")
+        """
+        if isinstance(snapshot, Delta):
+            snapshot = snapshot.snapshot
+        return diff(snapshot, await self.fetch(**filters))
+
+    async def table(
+        self,
+        kind: Optional[str] = None,
+        status: Optional[str] = None,
+        view: Optional[str] = None,
+    ) -> SessionTable:
+        """List sessions as a compact, typed table.
+
+        Args:
+            kind (str, optional): Session kind. Defaults to None.
+            status (str, optional): Session status. Defaults to None.
+            view (str, optional): Session view level. Defaults to None.
+
+        Returns:
+            SessionTable: Sessions information.
+
+        Examples:
+            >>> table = await session.table(view="all")
+        """
+        return SessionTable.from_records(await self.fetch(kind, status, view))
+
+    async def stats(self) -> Dict[str, Any]:
+        """Get statistics for the entire skaha cluster.
+
+        Returns:
+            Dict[str, Any]: Cluster statistics.
+
+        Examples:
+            >>> await session.stats()
+        """
+        parameters = {"view": "stats"}
+        log.debug(parameters)
+        client = self._async_client()
+        response = await client.get(url=str(self.server), params=parameters)
+        response.raise_for_status()
+        return response.json()
+
+    async def info(self, id: Union[List[str], str]) -> List[Dict[str, Any]]:
+        """Get information about session[s].
+
+        Args:
+            id (Union[List[str], str]): Session ID[s].
+
+        Returns:
+            List[Dict[str, Any]]: Session information.
+
+        Examples:
+            >>> await session.info(id=["hjko98yghj", "ikvp1jtp"])
+        """
+        if isinstance(id, str):
+            id = [id]
+        parameters: Dict[str, str] = {"view": "event"}
+        arguments: List[Dict[str, Any]] = []
+        for value in id:
+            arguments.append({"url": f"{self.server}/{value}", "params": parameters})
+        results = await self._gather("GET", arguments)
+        responses: List[Dict[str, Any]] = []
+        for response in results:
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                response.raise_for_status()
+                responses.append(response.json())
+            except (httpx.HTTPError, APIError) as err:
+                log.error(err)
+        return responses
+
+    async def logs(self, id: Union[List[str], str]) -> Dict[str, str]:
+        """Get logs from a session[s].
+
+        Args:
+            id (Union[List[str], str]): Session ID[s].
+
+        Returns:
+            Dict[str, str]: Logs in text/plain format.
+
+        Examples:
+            >>> await session.logs(id=["hjko98yghj", "ikvp1jtp"])
+        """
+        if isinstance(id, str):
+            id = [id]
+        parameters: Dict[str, str] = {"view": "logs"}
+        arguments: List[Dict[str, Any]] = []
+        for value in id:
+            arguments.append({"url": f"{self.server}/{value}", "params": parameters})
+        results = await self._gather("GET", arguments)
+        responses: Dict[str, str] = {}
+        for identity, response in zip(id, results):
+            responses[identity] = ""
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                response.raise_for_status()
+                responses[identity] = response.text
+            except (httpx.HTTPError, APIError) as err:
+                log.error(err)
+        return responses
+
+    async def stream_logs(
+        self,
+        id: Union[List[str], str],
+        follow: bool = True,
+        interval: float = 5.0,
+        chunk: int = 65536,
+    ) -> AsyncIterator[Tuple[str, str]]:
+        """Stream logs from session[s], line by line, as they are written.
+
+        All sessions are tailed concurrently and their lines are multiplexed
+        into a single iterator. See `Session.stream_logs` for details.
+
+        Args:
+            id (Union[List[str], str]): Session ID[s].
+            follow (bool, optional): Keep polling for new lines until the sessions
+                finish. Defaults to True.
+            interval (float, optional): Seconds between polls. Defaults to 5.0.
+            chunk (int, optional): Read size in bytes. Defaults to 65536.
+
+        Yields:
+            Tuple[str, str]: Session ID and log line.
+
+        Examples:
+            >>> async for identity, line in session.stream_logs("hjko98yghj"):
+            ...     print(identity, line)
+        """
+        if isinstance(id, str):
+            id = [id]
+        active = list(dict.fromkeys(id))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        retry = Retry()
+        while active:
+            finished = await self._finished(active) if follow else active
+            queue: "asyncio.Queue[Tuple[str, Optional[str]]]" = asyncio.Queue()
+
+            async def tail(identity: str) -> None:
+                try:
+                    async with semaphore:
+                        async for line in self._tail(identity, chunk):
+                            await queue.put((identity, line))
+                except (httpx.TransportError, APIError) as err:
+                    log.warning(f"{identity}: reading logs failed, retrying: {err}")
+                    retry.failed(identity)
+                else:
+                    retry.succeeded(identity)
+                finally:
+                    await queue.put((identity, None))
+
+            tasks = [
+                asyncio.create_task(tail(identity))
+                for identity in active
+                if retry.due(identity)
+            ]
+            try:
+                remaining = len(tasks)
+                while remaining:
+                    identity, line = await queue.get()
+                    if line is None:
+                        remaining -= 1
+                        continue
+                    yield identity, line
+                # Surface any unexpected errors from the tailing tasks
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            # Keep finished sessions whose last read failed for another attempt
+            finished = [
+                identity for identity in finished if not retry.pending(identity)
+            ]
+            for identity in finished:
+                for line in self._cursors[identity].flush():
+                    yield identity, line
+            active = [identity for identity in active if identity not in finished]
+            if active:
+                await asyncio.sleep(interval)
+
+    async def watch(
+        self,
+        id: Union[List[str], str],
+        until: Iterable[str] = TERMINAL,
+        interval: float = 1.0,
+        maximum: float = 30.0,
+        callback: Optional[Callable[[Event], Any]] = None,
+    ) -> AsyncIterator[Event]:
+        """Watch session[s] and yield status transitions.
+
+        See `Session.watch` for details.
+
+        Args:
+            id (Union[List[str], str]): Session ID[s].
+            until (Iterable[str], optional): Final statuses.
+                Defaults to ["Succeeded", "Error"].
+            interval (float, optional): Initial polling interval in seconds.
+                Defaults to 1.0.
+            maximum (float, optional): Longest polling interval in seconds.
+                Defaults to 30.0.
+            callback (Optional[Callable[[Event], Any]], optional): Called with each
+                event as it is observed. Defaults to None.
+
+        Yields:
+            Event: Session status transitions, starting with the initial status.
+
+        Examples:
+            >>> async for event in session.watch(ids, until={"Succeeded", "Error"}):
+            ...     print(event.id, event.current)
+        """
+        if isinstance(id, str):
+            id = [id]
+        watcher = Watcher(id, until)
+        backoff = Backoff(interval, maximum)
+        while watcher.pending:
+            events = watcher.update(await self.fetch())
+            for event in events:
+                if callback:
+                    callback(event)
+                yield event
+            if watcher.pending:
+                await asyncio.sleep(backoff.next(changed=bool(events)))
+
+    async def _tail(self, identity: str, chunk: int) -> AsyncIterator[str]:
+        """Read the unseen part of a session log.
+
+        Args:
+            identity (str): Session ID.
+            chunk (int): Read size in bytes.
+
+        Yields:
+            str: Complete log lines.
+
+        Raises:
+            httpx.TransportError: If the log could not be read, with the cursor
+                kept at the last consumed byte.
+        """
+        cursor = self._cursors.setdefault(identity, Cursor())
+        client = self._async_client()
+        try:
+            async with client.stream(
+                "GET",
+                url=f"{self.server}/{identity}",
+                params={"view": "logs"},
+                headers=cursor.headers,
+            ) as response:
+                # Nothing new past the current offset
+                if response.status_code == 416:
+                    return
+                response.raise_for_status()
+                cursor.begin(partial=response.status_code == 206)
+                async for data in response.aiter_bytes(chunk_size=chunk):
+                    for line in cursor.feed(data):
+                        yield line
+        except httpx.HTTPStatusError as err:
+            log.error(err)
+
+    async def _finished(self, ids: List[str]) -> List[str]:
+        """Session IDs that reached a terminal status or no longer exist.
+
+        Args:
+            ids (List[str]): Session IDs.
+
+        Returns:
+            List[str]: Finished session IDs.
+        """
+        status = {item["id"]: item["status"] for item in await self.fetch()}
+        # Sessions missing from the listing have already been removed
+        return [
+            identity
+            for identity in ids
+            if identity not in status or status[identity] in TERMINAL
+        ]
+
+    async def create(
+        self,
+        name: str,
+        image: str,
+        cores: int = 2,
+        ram: int = 4,
+        kind: str = "headless",
+        gpu: Optional[int] = None,
+        cmd: Optional[str] = None,
+        args: Optional[str] = None,
+        env: Dict[str, Any] = {},
+        replicas: int = 1,
+        overrides: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """Launch skaha session[s].
+
+        Args:
+            name (str): A unique name for the session.
+            image (str): Container image to use for the session.
+            cores (int, optional): Number of cores. Defaults to 2.
+            ram (int, optional): Amount of RAM (GB). Defaults to 4.
+            kind (str, optional): Type of skaha session. Defaults to "headless".
+            gpu (Optional[int], optional): Number of GPUs. Defaults to None.
+            cmd (Optional[str], optional): Command to run. Defaults to None.
+            args (Optional[str], optional): Arguments to the command. Defaults to None.
+            env (Optional[Dict[str, Any]], optional): Environment variables to inject.
+                Defaults to None.
+            replicas (int, optional): Number of sessions to launch. Defaults to 1.
+            overrides (Optional[Iterable[Dict[str, Any]]], optional): Per-replica
+                `cmd`, `args` and `env`, one mapping per replica, e.g. the rows
+                of a table or a generator consumed as requests are sent.
+                Defaults to None.
+
+        Notes:
+            See `Session.create` for the replica naming and environment conventions,
+            for resuming sweeps recorded in a `ledger` and for checking specs
+            against a `catalog` or a `validation` mode.
+
+        Returns:
+            List[str]: A list of session IDs for the launched sessions.
+
+        Examples:
+            >>> await session.create(name="test", image="...", cmd="env", replicas=2)
+            ["hjko98yghj", "ikvp1jtp"]
+        """
+        specification: CreateSpec = CreateSpec(
+            name=name,
+            image=image,
+            cores=cores,
+            ram=ram,
+            kind=kind,
+            gpus=gpu,
+            cmd=cmd,
+            args=args,
+            env=env,
+            replicas=replicas,
+        )
+        specification = (await self._validate([specification]))[0]
+        log.info(f"Creating {replicas} session(s) with parameters:")
+        log.info(specification.model_dump(exclude_none=True))
+        return await self._create(specification, overrides)
+
+    async def _validate(self, specs: List[CreateSpec]) -> List[CreateSpec]:
+        """Check specifications against the `catalog` and the `validation` mode."""
+        limits = await self.limits() if self.validation else None
+        return validate(specs, self.catalog, limits, self.validation == "snap")
+
+    async def _create(
+        self,
+        specification: CreateSpec,
+        overrides: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """Launch the replicas of a validated specification.
+
+        Args:
+            specification (CreateSpec): Session specification.
+            overrides (Optional[Iterable[Dict[str, Any]]], optional): Per-replica
+                overrides, see `payloads`. Defaults to None.
+
+        Returns:
+            List[str]: Session IDs of the launched replicas, in replica order.
+        """
+        name = specification.name
+        if self.ledger is not None and self.ledger.unresolved(name):
+            # Adopt sessions created by requests that were never answered
+            await self.fetch(prefix=name)
+        launched, remaining = resume(self.ledger, specification, overrides)
+        submitted: List[str] = []
+
+        def arguments() -> Iterator[Dict[str, Any]]:
+            # Payloads are built as requests start, not held for the whole batch
+            for replica, payload in remaining:
+                submitted.append(replica)
+                yield {"url": str(self.server), "params": payload}
+
+        results = await self._gather("POST", arguments())
+        for replica, response in zip(submitted, results):
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                response.raise_for_status()
+                launched[replica] = response.text.rstrip("\r\n")
+                record(self.ledger, name, replica, launched[replica])
+            except (httpx.HTTPError, APIError) as err:
+                log.error(err)
+                record(self.ledger, name, replica, None, err)
+        return [
+            launched[replica]
+            for replica in replica_names(specification)
+            if replica in launched
+        ]
+
+    async def sweep(self, sweep: Sweep) -> List[str]:
+        """Launch a parameter sweep over headless sessions.
+
+        See `Session.sweep`.
+
+        Args:
+            sweep (Sweep): Template specification and parameter rows.
+
+        Returns:
+            List[str]: Session IDs of the launched sessions, in row order.
+        """
+        ids: List[str] = []
+        for part, overrides in sweep.parts():
+            part = (await self._validate([part]))[0]
+            log.info(f"{part.name}: creating {part.replicas} session(s)")
+            ids += await self._create(part, overrides)
+        return ids
+
+    async def destroy(self, id: Union[str, List[str]]) -> Dict[str, bool]:
+        """Destroy skaha session[s].
+
+        Args:
+            id (Union[str, List[str]]): Session ID[s].
+
+        Returns:
+            Dict[str, bool]: A dictionary of session IDs
+            and a bool indicating if the session was destroyed.
+
+        Examples:
+            >>> await session.destroy(id=["hjko98yghj", "ikvp1jtp"])
+        """
+        if isinstance(id, str):
+            id = [id]
+        arguments: List[Dict[str, Any]] = []
+        for value in id:
+            arguments.append({"url": f"{self.server}/{value}"})
+        results = await self._gather("DELETE", arguments)
+        responses: Dict[str, bool] = {}
+        for identity, response in zip(id, results):
+            try:
+                if isinstance(response, BaseException):
+                    raise response
+                response.raise_for_status()
+                responses[identity] = True
+                if self.ledger is not None:
+                    self.ledger.destroyed(identity)
+            except (httpx.HTTPError, APIError) as err:
+                log.error(err)
+                responses[identity] = False
+                if self.ledger is not None:
+                    self.ledger.destroyed(identity, err)
+        return responses
+
+    async def bulk(
+        self, operation: str, id: Union[str, List[str]], redrive: int = 0
+    ) -> BulkResult:
+        """Run a bulk operation, with a structured outcome for every session.
+
+        See `Session.bulk` for details.
+
+        Args:
+            operation (str): One of "info", "logs" or "destroy".
+            id (Union[str, List[str]]): Session ID[s].
+            redrive (int, optional): Rounds of re-driving the sessions that
+                failed with a transient error. Defaults to 0.
+
+        Returns:
+            BulkResult: Outcomes keyed by session ID.
+
+        Examples:
+            >>> result = await session.bulk("info", ids, redrive=1)
+        """
+        method, params, decode = OPERATIONS[operation]
+        if isinstance(id, str):
+            id = [id]
+
+        async def drive(keys: List[str]) -> BulkResult:
+            arguments = [
+                {"url": f"{self.server}/{key}", "params": params} for key in keys
+            ]
+            latencies: List[float] = []
+            results = await self._gather(method, arguments, latencies)
+            return BulkResult(
+                {
+                    key: outcome(result, latency, decode)
+                    for key, result, latency in zip(keys, results, latencies)
+                }
+            )
+
+        result = await drive(list(dict.fromkeys(id)))
+        for attempt in range(1, redrive + 1):
+            pending = result.pending()
+            if not pending:
+                break
+            delay = pause(attempt, self.policy, self.breaker)
+            log.info(f"Re-driving {len(pending)} failed session(s) in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            result = result.merge(await drive(pending))
+        if operation == "destroy" and self.ledger is not None:
+            for key, item in result.items():
+                self.ledger.destroyed(key, item.error)
+        return result
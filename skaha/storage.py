@@ -0,0 +1,449 @@
+"""Parallel staging of job inputs and outputs to and from CANFAR storage.
+
+Files are transferred concurrently, and skipped when an identical copy, by MD5
+checksum, is already at the destination. Every call returns a
+`Report` with the outcome of each file and the overall throughput.
+
+The storage service is reached through a `Backend`: `VOSpace`, using the `vos`
+client, or `LocalBackend`, a local directory standing in for VOSpace in tests
+and dry runs.
+
+Examples:
+    >>> from skaha.storage import Storage, tree
+        storage = Storage(concurrency=16)
+        report = storage.upload(tree("inputs", "vos:username/run42/inputs"))
+        report.summary()
+        {'files': 512, 'transferred': 12, 'skipped': 500, 'failed': 0,
+         'bytes': 1610612736, 'seconds': 41.2, 'throughput': 39.1}
+        storage.download({"vos:username/run42/out/result.h5": "result.h5"})
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from skaha.exceptions import ParameterError
+from skaha.utils import logs
+from skaha.utils.threaded import get_event_loop, scale
+
+log = logs.get_logger(__name__)
+
+# Default transfer chunk size in bytes
+CHUNK = 2**20
+
+
+def md5(path: Path, chunk: int = CHUNK) -> str:
+    """MD5 checksum of a local file, read in chunks.
+
+    Args:
+        path (Path): File path.
+        chunk (int): Read size in bytes.
+
+    Returns:
+        str: Hexadecimal digest.
+    """
+    # MD5 only detects unchanged copies, as VOSpace does; usedforsecurity=False
+    # requires Python 3.9
+    digest = hashlib.md5()  # nosec: B324
+    with open(path, "rb") as file:
+        for data in iter(lambda: file.read(chunk), b""):
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def tree(directory: Union[str, Path], uri: str) -> Dict[Path, str]:
+    """Map every file below a local directory to a URI below `uri`.
+
+    Args:
+        directory (Union[str, Path]): Local directory.
+        uri (str): Destination URI, e.g. "vos:username/inputs".
+
+    Returns:
+        Dict[Path, str]: Destination URI by local path.
+    """
+    root = Path(directory)
+    return {
+        path: f"{uri.rstrip('/')}/{path.relative_to(root).as_posix()}"
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+class Transfer(NamedTuple):
+    """Outcome of staging a single file.
+
+    Attributes:
+        source (str): Source path or URI.
+        destination (str): Destination path or URI.
+        bytes (int): Bytes transferred, 0 if skipped or failed.
+        seconds (float): Time taken, including the checksum comparison.
+        skipped (bool): Whether an identical copy was already at the destination.
+        error (Optional[Exception]): Error, None if the transfer succeeded.
+    """
+
+    source: str
+    destination: str
+    bytes: int = 0
+    seconds: float = 0.0
+    skipped: bool = False
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file was transferred or skipped."""
+        return self.error is None
+
+
+class Report:
+    """Outcomes of a staging call, with the overall throughput.
+
+    Args:
+        transfers (List[Transfer]): Outcome of each file.
+        seconds (float): Wall-clock time of the call.
+    """
+
+    def __init__(self, transfers: List[Transfer], seconds: float) -> None:
+        """Initialize the report."""
+        self.transfers = transfers
+        self.seconds = seconds
+
+    def __iter__(self) -> Iterator[Transfer]:
+        """Iterate over the transfers."""
+        return iter(self.transfers)
+
+    def __len__(self) -> int:
+        """Number of files."""
+        return len(self.transfers)
+
+    def __repr__(self) -> str:
+        """Summary of the report."""
+        items = ", ".join(f"{key}={value}" for key, value in self.summary().items())
+        return f"Report({items})"
+
+    @property
+    def ok(self) -> bool:
+        """Whether every file was transferred or skipped."""
+        return all(transfer.ok for transfer in self.transfers)
+
+    @property
+    def failed(self) -> List[Transfer]:
+        """Transfers that failed."""
+        return [transfer for transfer in self.transfers if not transfer.ok]
+
+    @property
+    def bytes(self) -> int:
+        """Bytes transferred."""
+        return sum(transfer.bytes for transfer in self.transfers)
+
+    @property
+    def throughput(self) -> float:
+        """Transfer rate in MB/s over the whole call."""
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts of transferred, skipped and failed files, bytes and rate.
+
+        Returns:
+            Dict[str, Any]: Summary, with the throughput in MB/s.
+        """
+        skipped = sum(transfer.skipped for transfer in self.transfers)
+        failed = len(self.failed)
+        return {
+            "files": len(self.transfers),
+            "transferred": len(self.transfers) - skipped - failed,
+            "skipped": skipped,
+            "failed": failed,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "throughput": round(self.throughput, 3),
+        }
+
+    def raise_for_errors(self) -> None:
+        """Raise the error of the first failed transfer, if any."""
+        for transfer in self.failed:
+            assert transfer.error is not None
+            raise transfer.error
+
+
+class Backend(ABC):
+    """Storage service holding files addressed by URI."""
+
+    @abstractmethod
+    def checksum(self, uri: str) -> Optional[str]:
+        """MD5 checksum of a remote file.
+
+        Args:
+            uri (str): File URI.
+
+        Returns:
+            Optional[str]: Hexadecimal digest, None if the file does not exist.
+        """
+
+    @abstractmethod
+    def makedirs(self, uri: str) -> None:
+        """Create a remote directory and its parents, if missing.
+
+        Args:
+            uri (str): Directory URI.
+        """
+
+    @abstractmethod
+    def upload(self, path: Path, uri: str) -> int:
+        """Copy a local file to a remote URI.
+
+        Args:
+            path (Path): Local file.
+            uri (str): Destination URI, in an existing directory.
+
+        Returns:
+            int: Bytes transferred.
+        """
+
+    @abstractmethod
+    def download(self, uri: str, path: Path) -> int:
+        """Copy a remote file to a local path.
+
+        Args:
+            uri (str): Source URI.
+            path (Path): Local file, in an existing directory.
+
+        Returns:
+            int: Bytes transferred.
+        """
+
+
+class VOSpace(Backend):
+    """CANFAR VOSpace, through the `vos` client.
+
+    Transfers are streamed by `vos`, in its own block size, and uploads are
+    verified with their MD5.
+
+    Args:
+        certificate (Optional[Union[str, Path]]): X509 certificate, defaults to
+            `~/.ssl/cadcproxy.pem`.
+    """
+
+    def __init__(self, certificate: Optional[Union[str, Path]] = None) -> None:
+        """Initialize the `vos` client."""
+        import vos
+
+        certificate = certificate or Path.home() / ".ssl" / "cadcproxy.pem"
+        self.client = vos.Client(vospace_certfile=str(certificate))
+
+    def checksum(self, uri: str) -> Optional[str]:
+        """MD5 checksum of a remote file, None if it does not exist."""
+        if not self.client.isfile(uri):
+            return None
+        return self.client.get_node(uri, force=True).props.get("MD5")
+
+    def makedirs(self, uri: str) -> None:
+        """Create a remote directory and its parents, if missing."""
+        scheme, _, path = uri.partition(":")
+        parts = [part for part in path.split("/") if part]
+        for index in range(1, len(parts) + 1):
+            directory = f"{scheme}:{'/'.join(parts[:index])}"
+            if not self.client.isdir(directory):
+                self.client.mkdir(directory)
+
+    def upload(self, path: Path, uri: str) -> int:
+        """Copy a local file to a remote URI."""
+        self.client.copy(str(path), uri, send_md5=True)
+        return path.stat().st_size
+
+    def download(self, uri: str, path: Path) -> int:
+        """Copy a remote file to a local path."""
+        self.client.copy(uri, str(path))
+        return path.stat().st_size
+
+
+class LocalBackend(Backend):
+    """Local directory standing in for VOSpace.
+
+    A URI `vos:username/dir/file` maps to `<root>/username/dir/file`.
+
+    Args:
+        root (Union[str, Path]): Directory holding the files.
+        chunk (int): Copy size in bytes.
+    """
+
+    def __init__(self, root: Union[str, Path], chunk: int = CHUNK) -> None:
+        """Initialize the backend."""
+        self.root = Path(root)
+        self.chunk = chunk
+
+    def path(self, uri: str) -> Path:
+        """Local path of a URI.
+
+        Raises:
+            ParameterError: If the URI is not below the root.
+        """
+        _, _, relative = uri.partition(":")
+        path = (self.root / relative.lstrip("/")).resolve()
+        try:
+            path.relative_to(self.root.resolve())
+        except ValueError as error:
+            raise ParameterError(f"{uri} is outside of {self.root}") from error
+        return path
+
+    def checksum(self, uri: str) -> Optional[str]:
+        """MD5 checksum of a remote file, None if it does not exist."""
+        path = self.path(uri)
+        return md5(path) if path.is_file() else None
+
+    def makedirs(self, uri: str) -> None:
+        """Create a remote directory and its parents, if missing."""
+        self.path(uri).mkdir(parents=True, exist_ok=True)
+
+    def upload(self, path: Path, uri: str) -> int:
+        """Copy a local file to a remote URI, in chunks."""
+        return self._copy(path, self.path(uri))
+
+    def download(self, uri: str, path: Path) -> int:
+        """Copy a remote file to a local path, in chunks."""
+        source = self.path(uri)
+        if not source.is_file():
+            raise FileNotFoundError(uri)
+        return self._copy(source, path)
+
+    def _copy(self, source: Path, destination: Path) -> int:
+        """Copy a file in chunks, replacing the destination only once complete."""
+        partial = destination.with_name(f".{destination.name}.part")
+        size = 0
+        with open(source, "rb") as reader, open(partial, "wb") as writer:
+            for data in iter(lambda: reader.read(self.chunk), b""):
+                writer.write(data)
+                size += len(data)
+        partial.replace(destination)
+        return size
+
+
+class Storage:
+    """Stage many files to and from CANFAR storage in parallel.
+
+    Args:
+        backend (Optional[Backend]): Storage service. Defaults to `VOSpace`
+            with the given certificate.
+        concurrency (int): Maximum number of files in flight.
+        chunk (int): Read size in bytes when computing local checksums.
+        certificate (Optional[Union[str, Path]]): X509 certificate for the
+            default backend.
+        progress (Optional[Callable[[Transfer], Any]]): Called with the outcome
+            of each file as soon as it is done.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Backend] = None,
+        concurrency: int = 8,
+        chunk: int = CHUNK,
+        certificate: Optional[Union[str, Path]] = None,
+        progress: Optional[Callable[[Transfer], Any]] = None,
+    ) -> None:
+        """Initialize the stager."""
+        assert concurrency >= 1, "concurrency must be at least 1"
+        self.backend = backend or VOSpace(certificate)
+        self.concurrency = concurrency
+        self.chunk = chunk
+        self.progress = progress
+
+    def upload(
+        self, files: Mapping[Union[str, Path], str], skip: bool = True
+    ) -> Report:
+        """Upload local files.
+
+        Args:
+            files (Mapping[Union[str, Path], str]): Destination URI by local
+                path, e.g. from `tree()`.
+            skip (bool): Skip files whose remote copy has the same checksum.
+
+        Returns:
+            Report: Outcome of each file.
+        """
+        parents = {uri.rsplit("/", 1)[0] for uri in files.values() if "/" in uri}
+        for parent in sorted(parents):
+            self.backend.makedirs(parent)
+        return self._stage(
+            [{"source": str(path), "destination": uri} for path, uri in files.items()],
+            self._upload,
+            skip,
+        )
+
+    def download(
+        self, files: Mapping[str, Union[str, Path]], skip: bool = True
+    ) -> Report:
+        """Download remote files.
+
+        Args:
+            files (Mapping[str, Union[str, Path]]): Local path by source URI.
+            skip (bool): Skip files whose local copy has the same checksum.
+
+        Returns:
+            Report: Outcome of each file.
+        """
+        for path in files.values():
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        return self._stage(
+            [{"source": uri, "destination": str(path)} for uri, path in files.items()],
+            self._download,
+            skip,
+        )
+
+    def _stage(
+        self,
+        arguments: List[Dict[str, Any]],
+        function: Callable[[str, str, bool], Optional[int]],
+        skip: bool,
+    ) -> Report:
+        """Run transfers concurrently and report their outcomes."""
+
+        def run(source: str, destination: str) -> Transfer:
+            start = perf_counter()
+            try:
+                size = function(source, destination, skip)
+            except Exception as error:
+                log.error(f"{source} -> {destination}: {error}")
+                transfer = Transfer(source, destination, 0, perf_counter() - start)
+                transfer = transfer._replace(error=error)
+            else:
+                elapsed = perf_counter() - start
+                transfer = Transfer(
+                    source, destination, size or 0, elapsed, skipped=size is None
+                )
+            if self.progress is not None:
+                self.progress(transfer)
+            return transfer
+
+        start = perf_counter()
+        transfers = get_event_loop().run_until_complete(
+            scale(run, arguments, concurrency=self.concurrency)
+        )
+        report = Report(transfers, perf_counter() - start)
+        log.info(report)
+        return report
+
+    def _upload(self, source: str, destination: str, skip: bool) -> Optional[int]:
+        """Upload a file, returning the bytes sent or None if it was skipped."""
+        path = Path(source)
+        if skip and md5(path, self.chunk) == self.backend.checksum(destination):
+            return None
+        return self.backend.upload(path, destination)
+
+    def _download(self, source: str, destination: str, skip: bool) -> Optional[int]:
+        """Download a file, returning the bytes received or None if it was skipped."""
+        path = Path(destination)
+        if skip and path.is_file():
+            if md5(path, self.chunk) == self.backend.checksum(source):
+                return None
+        return self.backend.download(source, path)
@@ -0,0 +1,304 @@
+"""Parameter sweeps fanned out over headless sessions.
+
+A `Sweep` takes parameter rows, from a `Grid`, a list of mappings, a CSV or a
+Parquet file, and turns them into per-replica `cmd`, `args` and `env`
+overrides of a template `CreateSpec`. When there are far more rows than
+sessions, each session processes a contiguous chunk of rows, and sessions are
+split into specifications of at most 256 replicas. Rows and overrides are
+generated lazily, one specification at a time.
+
+Every replica receives the `SWEEP_START` and `SWEEP_STOP` environment
+variables, the half-open range of its rows, and unless disabled `SWEEP_ROWS`,
+its rows encoded as JSON, which must fit in the URL of the create request. The
+`cmd`, `args` and string `env` values of the template are formatted with
+`{job}`, `{start}` and `{stop}` and, with a single row per session, with
+`{index}` and the columns of the row.
+
+Examples:
+    >>> from skaha.models import CreateSpec
+        from skaha.session import Session
+        from skaha.sweep import Grid, Sweep
+        template = CreateSpec(
+            name="fft",
+            image="images.canfar.net/chimefrb/fft:latest",
+            kind="headless",
+            cmd="fft",
+            args="--rows {start}:{stop}",
+            env={},
+        )
+        grid = Grid(beam=range(1024), dm=range(100, 1100, 10))
+        sweep = Sweep(template, grid, sessions=400, embed=False)
+        len(sweep), sweep.per, sweep.count
+        (102400, 256, 400)
+        ids = Session().sweep(sweep)
+"""
+
+import csv
+import json
+import math
+from itertools import count as counter
+from itertools import islice, product
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Sized,
+    Tuple,
+    Union,
+)
+from urllib.parse import quote_plus
+
+from skaha.exceptions import ParameterError
+from skaha.models import CreateSpec
+from skaha.utils import logs
+
+log = logs.get_logger(__name__)
+
+Row = Dict[str, Any]
+Source = Union[str, Path, Iterable[Row]]
+
+# Maximum replicas of a single session specification
+REPLICAS = 256
+# Rows read from Parquet files at a time
+BATCH = 4096
+# Most bytes of `SWEEP_ROWS`, URL-encoded into the query of the create request
+EMBED = 6144
+
+
+class Grid:
+    """Cartesian product of parameter values, generated lazily.
+
+    Args:
+        **axes (Iterable[Any]): Values of each parameter.
+
+    Examples:
+        >>> grid = Grid(beam=range(3), dm=[100, 200])
+        >>> len(grid), next(iter(grid))
+        (6, {'beam': 0, 'dm': 100})
+    """
+
+    def __init__(self, **axes: Iterable[Any]) -> None:
+        """Initialize the grid."""
+        self.axes: Dict[str, Sequence[Any]] = {
+            name: values if isinstance(values, Sequence) else list(values)
+            for name, values in axes.items()
+        }
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return math.prod(len(values) for values in self.axes.values())
+
+    def __iter__(self) -> Iterator[Row]:
+        """Rows of the grid, the last parameter varying fastest."""
+        names = list(self.axes)
+        for values in product(*self.axes.values()):
+            yield dict(zip(names, values))
+
+
+def rows(source: Source) -> Iterator[Row]:
+    """Read parameter rows lazily.
+
+    Args:
+        source (Source): Rows, or the path of a `.csv` or `.parquet` file. CSV
+            values are read as strings.
+
+    Yields:
+        Row: One mapping of column to value per row.
+
+    Raises:
+        ParameterError: If the file type is unsupported, or reading Parquet
+            files without `pyarrow` installed.
+    """
+    if not isinstance(source, (str, Path)):
+        yield from source
+        return
+    path = Path(source)
+    if path.suffix == ".csv":
+        with open(path, newline="") as file:
+            yield from csv.DictReader(file)
+    elif path.suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as parquet
+        except ImportError as error:
+            raise ParameterError("parquet rows require pyarrow") from error
+        for batch in parquet.ParquetFile(path).iter_batches(batch_size=BATCH):
+            yield from batch.to_pylist()
+    else:
+        raise ParameterError(f"unsupported rows file {path.name}")
+
+
+def count(source: Source) -> Optional[int]:
+    """Number of parameter rows, if it can be known without holding them.
+
+    Args:
+        source (Source): Rows, or the path of a `.csv` or `.parquet` file.
+
+    Returns:
+        Optional[int]: Number of rows, None for iterators of unknown length.
+    """
+    if isinstance(source, Sized) and not isinstance(source, (str, Path)):
+        return len(source)
+    if not isinstance(source, (str, Path)):
+        return None
+    path = Path(source)
+    if path.suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as parquet
+        except ImportError as error:
+            raise ParameterError("parquet rows require pyarrow") from error
+        return int(parquet.ParquetFile(path).metadata.num_rows)
+    return sum(1 for _ in rows(path))
+
+
+def render(template: Any, context: Dict[str, Any]) -> Any:
+    """Format a string template, leaving other values as they are.
+
+    Args:
+        template (Any): Template, e.g. `"--beam {beam}"`.
+        context (Dict[str, Any]): Fields of the template.
+
+    Returns:
+        Any: Formatted template.
+
+    Raises:
+        ParameterError: If the template uses a field that is not defined.
+    """
+    if not isinstance(template, str):
+        return template
+    try:
+        return template.format(**context)
+    except (KeyError, IndexError) as error:
+        raise ParameterError(
+            f"undefined sweep field {error} in {template!r}"
+        ) from error
+
+
+class Sweep:
+    """Parameter rows fanned out over the replicas of a template specification.
+
+    Args:
+        spec (CreateSpec): Template of the sessions. Its `cmd`, `args` and string
+            `env` values are formatted for each replica; its replicas are ignored.
+        source (Source): Parameter rows, see `rows`.
+        per (Optional[int], optional): Rows processed by each session. Defaults to
+            spreading the rows evenly over `sessions`.
+        sessions (int, optional): Target number of sessions, when `per` is not
+            given. Defaults to 256.
+        embed (bool, optional): Pass the rows of each session in `SWEEP_ROWS`,
+            at most `EMBED` bytes once URL-encoded. Disable for large chunks,
+            sessions then read their range of rows from the source themselves.
+            Defaults to True.
+
+    Raises:
+        ParameterError: If the number of rows is unknown and `per` is not given,
+            `per` is less than 1, or the template is not a headless session.
+    """
+
+    def __init__(
+        self,
+        spec: CreateSpec,
+        source: Source,
+        per: Optional[int] = None,
+        sessions: int = REPLICAS,
+        embed: bool = True,
+    ) -> None:
+        """Initialize the sweep, counting the rows if possible."""
+        if spec.kind != "headless":
+            raise ParameterError("sweeps are only supported for headless sessions")
+        self.spec = spec
+        self.source = source
+        self.embed = embed
+        self.total = count(source)
+        if per is None:
+            if self.total is None:
+                raise ParameterError("rows of unknown length require `per`")
+            per = max(1, math.ceil(self.total / sessions))
+        if per < 1:
+            raise ParameterError(f"per must be at least 1, got {per}")
+        self.per = per
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        if self.total is None:
+            raise TypeError("rows of unknown length")
+        return self.total
+
+    @property
+    def count(self) -> Optional[int]:
+        """Number of sessions, None if the number of rows is unknown."""
+        if self.total is None:
+            return None
+        return math.ceil(self.total / self.per)
+
+    @property
+    def single(self) -> bool:
+        """Whether all sessions fit in a single specification."""
+        return self.count is not None and self.count <= REPLICAS
+
+    def jobs(self) -> Iterator[Row]:
+        """Per-session overrides, see `skaha.session.payloads`.
+
+        Yields:
+            Row: `cmd`, `args` and `env` of each session.
+
+        Raises:
+            ParameterError: If the rows of a session are too large to embed.
+        """
+        spec = self.spec
+        rows_ = rows(self.source)
+        start = 0
+        for job in counter(1):
+            chunk = list(islice(rows_, self.per))
+            if not chunk:
+                return
+            stop = start + len(chunk)
+            context: Dict[str, Any] = (
+                dict(chunk[0], index=start) if self.per == 1 else {}
+            )
+            context.update(job=job, start=start, stop=stop)
+            env = {key: render(value, context) for key, value in spec.env.items()}
+            env.update(SWEEP_START=start, SWEEP_STOP=stop)
+            if self.embed:
+                embedded = json.dumps(chunk, separators=(",", ":"), default=str)
+                size = len(quote_plus(embedded))
+                if size > EMBED:
+                    raise ParameterError(
+                        f"rows {start}:{stop} take {size} bytes in SWEEP_ROWS, over "
+                        f"{EMBED}; lower `per` or disable `embed`"
+                    )
+                env["SWEEP_ROWS"] = embedded
+            override: Row = {"env": env}
+            if spec.cmd is not None:
+                override["cmd"] = render(spec.cmd, context)
+            if spec.args is not None:
+                override["args"] = render(spec.args, context)
+            yield override
+            start = stop
+
+    def parts(self) -> Iterator[Tuple[CreateSpec, List[Row]]]:
+        """Specifications of at most 256 replicas, with their overrides.
+
+        Parts are named after the template, suffixed with their number unless
+        the whole sweep fits in a single specification. Only one part is held in
+        memory at a time.
+
+        Yields:
+            Tuple[CreateSpec, List[Row]]: Specification and per-replica overrides.
+        """
+        jobs = self.jobs()
+        part = 0
+        while True:
+            overrides = list(islice(jobs, REPLICAS))
+            if not overrides:
+                return
+            part += 1
+            name = self.spec.name if self.single else f"{self.spec.name}-{part}"
+            log.debug(f"Sweep part {name}: {len(overrides)} session(s)")
+            yield self.spec.model_copy(
+                update={"name": name, "replicas": len(overrides)}
+            ), overrides
@@ -0,0 +1,253 @@
+"""Structured, per-item results of bulk operations."""
+
+from time import perf_counter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+import httpx
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
+
+from skaha.exceptions import (
+    APIError,
+    ClientError,
+    ConnectionError,
+    InternalError,
+    NotAuthenticated,
+    ParameterError,
+    PermissionDeniedError,
+    ServiceBusyError,
+    UnknownError,
+)
+from skaha.utils.transport import CircuitBreaker, RetryPolicy
+
+STATUSES: Dict[int, Type[Exception]] = {
+    400: ParameterError,
+    401: NotAuthenticated,
+    403: PermissionDeniedError,
+    404: ParameterError,
+    429: ServiceBusyError,
+    500: InternalError,
+    502: ServiceBusyError,
+    503: ServiceBusyError,
+    504: ServiceBusyError,
+}
+# Errors worth re-driving, as they may not happen again
+TRANSIENT: Tuple[Type[Exception], ...] = (
+    ConnectionError,
+    InternalError,
+    ServiceBusyError,
+)
+
+
+def classify(error: BaseException) -> Exception:
+    """Translate an HTTP client error into the matching `skaha.exceptions` type.
+
+    Args:
+        error (BaseException): Error raised by requests, httpx or the transport.
+
+    Returns:
+        Exception: Skaha exception, chained to the original error.
+    """
+    if isinstance(error, (APIError, ClientError)):
+        return error
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    kind: Type[Exception] = UnknownError
+    if isinstance(status, int):
+        kind = STATUSES.get(status, InternalError if status >= 500 else APIError)
+    elif isinstance(error, (RequestsConnectionError, Timeout, httpx.TransportError)):
+        kind = ConnectionError
+    classified = kind(f"{type(error).__name__}: {error}")
+    classified.__cause__ = error
+    return classified
+
+
+def timed(function: Callable[..., Any]) -> Callable[..., Tuple[Any, float]]:
+    """Wrap a request function to also return its latency.
+
+    The wrapper never raises; errors are returned in place of the result.
+
+    Args:
+        function (Callable[..., Any]): Function to wrap.
+
+    Returns:
+        Callable[..., Tuple[Any, float]]: Wrapped function, returning the result
+            or the error, and the elapsed time in seconds.
+    """
+
+    def wrapper(**kwargs: Any) -> Tuple[Any, float]:
+        start = perf_counter()
+        try:
+            return function(**kwargs), perf_counter() - start
+        except Exception as error:
+            return error, perf_counter() - start
+
+    return wrapper
+
+
+def pause(attempt: int, policy: RetryPolicy, breaker: CircuitBreaker) -> float:
+    """Delay before re-driving the items that failed.
+
+    Busy responses and an open breaker are transient, so re-driving at once
+    would likely fail again: rounds are spaced out with the jittered backoff of
+    the retry policy, and wait for the breaker to close.
+
+    Args:
+        attempt (int): Number of the round that just failed, from 1.
+        policy (RetryPolicy): Retry policy of the client.
+        breaker (CircuitBreaker): Circuit breaker of the client.
+
+    Returns:
+        float: Delay in seconds.
+    """
+    return max(breaker.remaining, policy.delay(attempt))
+
+
+class Outcome(NamedTuple):
+    """Result of a bulk operation for a single item.
+
+    Attributes:
+        value (Any): Decoded result, None if the item failed.
+        error (Optional[Exception]): Skaha exception, None if the item succeeded.
+        latency (float): Seconds taken by the last request for the item.
+        attempts (int): HTTP attempts made for the item, across re-drives.
+    """
+
+    value: Any = None
+    error: Optional[Exception] = None
+    latency: float = 0.0
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item succeeded."""
+        return self.error is None
+
+
+def outcome(
+    result: Any, latency: float, decode: Callable[[Any], Any], attempts: int = 1
+) -> Outcome:
+    """Build the outcome of a single request.
+
+    Args:
+        result (Any): Response, or the error raised by the request.
+        latency (float): Seconds taken by the request.
+        decode (Callable[[Any], Any]): Extracts the value from a response.
+        attempts (int): Attempts made, if not recorded on the response.
+
+    Returns:
+        Outcome: Value or classified error.
+    """
+    attempts = getattr(result, "attempts", attempts)
+    try:
+        if isinstance(result, BaseException):
+            raise result
+        result.raise_for_status()
+        return Outcome(decode(result), None, latency, attempts)
+    except Exception as error:
+        return Outcome(None, classify(error), latency, attempts)
+
+
+class BulkResult(Mapping[str, Outcome]):
+    """Outcomes of a bulk operation, keyed by session ID.
+
+    Args:
+        outcomes (Dict[str, Outcome]): Outcome of each item.
+
+    Examples:
+        >>> result = session.bulk("destroy", ids, redrive=2)
+        >>> result.ok
+        False
+        >>> result.failed
+        {'ikvp1jtp': ParameterError('HTTPError: 404 Client Error: ...')}
+        >>> result["hjko98yghj"]
+        Outcome(value=True, error=None, latency=0.12, attempts=1)
+    """
+
+    def __init__(self, outcomes: Dict[str, Outcome]) -> None:
+        """Initialize the result."""
+        self.outcomes = outcomes
+
+    def __getitem__(self, key: str) -> Outcome:
+        """Outcome of an item."""
+        return self.outcomes[key]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the item keys."""
+        return iter(self.outcomes)
+
+    def __len__(self) -> int:
+        """Number of items."""
+        return len(self.outcomes)
+
+    def __repr__(self) -> str:
+        """Summary of the result."""
+        return f"BulkResult(succeeded={len(self.succeeded)}, failed={len(self.failed)})"
+
+    @property
+    def ok(self) -> bool:
+        """Whether every item succeeded."""
+        return all(item.ok for item in self.outcomes.values())
+
+    @property
+    def succeeded(self) -> Dict[str, Any]:
+        """Values of the items that succeeded."""
+        return {key: item.value for key, item in self.outcomes.items() if item.ok}
+
+    @property
+    def failed(self) -> Dict[str, Exception]:
+        """Errors of the items that failed."""
+        return {
+            key: item.error
+            for key, item in self.outcomes.items()
+            if item.error is not None
+        }
+
+    def pending(self, errors: Tuple[Type[Exception], ...] = TRANSIENT) -> List[str]:
+        """Items that failed with one of the given errors, to be re-driven.
+
+        Args:
+            errors (Tuple[Type[Exception], ...]): Errors worth retrying. Defaults
+                to connection errors, internal errors and busy responses.
+
+        Returns:
+            List[str]: Item keys.
+        """
+        return [key for key, error in self.failed.items() if isinstance(error, errors)]
+
+    def merge(self, other: "BulkResult") -> "BulkResult":
+        """Combine with the result of re-driving some of the items.
+
+        Args:
+            other (BulkResult): Result for a subset of the items.
+
+        Returns:
+            BulkResult: New result, with the outcomes of `other` taking precedence
+                and the attempts added up.
+        """
+        outcomes = dict(self.outcomes)
+        for key, item in other.items():
+            previous = outcomes.get(key)
+            attempts = item.attempts + (previous.attempts if previous else 0)
+            outcomes[key] = item._replace(attempts=attempts)
+        return BulkResult(outcomes)
+
+    def raise_for_errors(self) -> None:
+        """Raise the first error, if any item failed.
+
+        Raises:
+            Exception: The error of the first failed item.
+        """
+        for error in self.failed.values():
+            raise error
@@ -0,0 +1,226 @@
+"""Client-side response cache."""
+
+import json
+import threading
+from collections import Counter, OrderedDict
+from hashlib import sha256
+from os import getpid
+from pathlib import Path
+from time import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from skaha.utils import logs
+
+log = logs.get_logger(__name__)
+
+
+class Entry(NamedTuple):
+    """A cached JSON response.
+
+    Attributes:
+        value (Any): Decoded JSON body.
+        expires (float): Expiry time (epoch seconds).
+        etag (Optional[str]): ETag header of the response.
+        modified (Optional[str]): Last-Modified header of the response.
+    """
+
+    value: Any
+    expires: float
+    etag: Optional[str] = None
+    modified: Optional[str] = None
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry can be used without contacting the server."""
+        return time() < self.expires
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers to revalidate a stale entry."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.modified:
+            headers["If-Modified-Since"] = self.modified
+        return headers
+
+
+class Cache:
+    """Size-bounded LRU cache of JSON responses with per-endpoint TTLs.
+
+    Stale entries that carry an ETag or Last-Modified header are revalidated
+    with a conditional request instead of being downloaded again. With a
+    `directory`, entries are also persisted on disk, so that short-lived
+    processes share the cache.
+
+    Args:
+        ttl (Dict[str, float]): Time to live in seconds, keyed by endpoint.
+        default (float): Time to live for endpoints not in `ttl`.
+        size (int): Maximum number of entries held in memory.
+        directory (Optional[Union[str, Path]]): On-disk cache location.
+
+    Examples:
+        >>> from skaha.images import Images
+            from skaha.utils.cache import Cache
+            cache = Cache(ttl={"image": 3600}, directory="~/.cache/skaha")
+            images = Images(cache=cache)
+            images.fetch()
+            cache.stats()
+            {'image': {'hits': 0, 'misses': 1, 'revalidated': 0}, ...}
+    """
+
+    def __init__(
+        self,
+        ttl: Dict[str, float] = {"image": 300.0, "context": 300.0},
+        default: float = 60.0,
+        size: int = 128,
+        directory: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """Initialize the cache."""
+        assert size > 0, "size must be positive"
+        self.ttl = dict(ttl)
+        self.default = default
+        self.size = size
+        self.directory = Path(directory).expanduser() if directory else None
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.entries: "OrderedDict[str, Entry]" = OrderedDict()
+        self.counters: Counter = Counter()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, params: Any = None) -> str:
+        """Cache key for a request.
+
+        Args:
+            url (str): Request URL.
+            params (Any): Query parameters.
+
+        Returns:
+            str: Cache key.
+        """
+        if isinstance(params, dict):
+            params = sorted(params.items())
+        return f"{url}?{json.dumps(params or [], default=str)}"
+
+    def lookup(self, endpoint: str, key: str) -> Tuple[Optional[Entry], bool]:
+        """Look up a cached entry.
+
+        Args:
+            endpoint (str): Endpoint name, e.g. "image".
+            key (str): Cache key.
+
+        Returns:
+            Tuple[Optional[Entry], bool]: The entry, if any, and whether it is
+                fresh enough to be used directly.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self._load(key)
+            if entry is not None and entry.fresh:
+                self.entries.move_to_end(key)
+                self.counters[endpoint, "hits"] += 1
+                return entry, True
+            self.counters[endpoint, "misses"] += 1
+            return entry, False
+
+    def store(
+        self, endpoint: str, key: str, value: Any, headers: Mapping[str, str]
+    ) -> Any:
+        """Cache a response body.
+
+        Args:
+            endpoint (str): Endpoint name.
+            key (str): Cache key.
+            value (Any): Decoded JSON body.
+            headers (Mapping[str, str]): Response headers, case-insensitive.
+
+        Returns:
+            Any: The cached value.
+        """
+        entry = Entry(
+            value=value,
+            expires=time() + self.ttl.get(endpoint, self.default),
+            etag=headers.get("ETag"),
+            modified=headers.get("Last-Modified"),
+        )
+        with self.lock:
+            self._put(key, entry)
+        return value
+
+    def renew(self, endpoint: str, key: str, entry: Entry) -> Any:
+        """Extend a stale entry after the server confirmed it is unchanged.
+
+        Args:
+            endpoint (str): Endpoint name.
+            key (str): Cache key.
+            entry (Entry): The revalidated entry.
+
+        Returns:
+            Any: The cached value.
+        """
+        expires = time() + self.ttl.get(endpoint, self.default)
+        with self.lock:
+            self.counters[endpoint, "revalidated"] += 1
+            self._put(key, entry._replace(expires=expires))
+        return entry.value
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit, miss and revalidation counters per endpoint.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Counters keyed by endpoint.
+        """
+        with self.lock:
+            endpoints = sorted({endpoint for endpoint, _ in self.counters})
+            return {
+                endpoint: {
+                    name: self.counters[endpoint, name]
+                    for name in ("hits", "misses", "revalidated")
+                }
+                for endpoint in endpoints
+            }
+
+    def clear(self) -> None:
+        """Remove all entries, in memory and on disk."""
+        with self.lock:
+            self.entries.clear()
+            if self.directory:
+                for path in self.directory.glob("*.json"):
+                    path.unlink(missing_ok=True)
+
+    def _put(self, key: str, entry: Entry) -> None:
+        """Insert an entry, evicting the least recently used ones."""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        if self.directory:
+            path = self._path(key)
+            temporary = path.with_suffix(f".{getpid()}.tmp")
+            temporary.write_text(json.dumps(list(entry)))
+            temporary.replace(path)
+
+    def _load(self, key: str) -> Optional[Entry]:
+        """Read an entry from disk into memory."""
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            fields: List[Any] = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError as error:
+            log.warning(f"Ignoring corrupt cache entry {path}: {error}")
+            return None
+        entry = Entry(*fields)
+        self.entries[key] = entry
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return entry
+
+    def _path(self, key: str) -> Path:
+        """Location of an entry on disk."""
+        assert self.directory is not None
+        return self.directory / f"{sha256(key.encode()).hexdigest()}.json"
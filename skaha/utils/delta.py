@@ -0,0 +1,66 @@
+"""Differences between successive session listings."""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+Record = Dict[str, Any]
+
+
+class Delta(NamedTuple):
+    """Sessions added, removed and changed since a previous listing.
+
+    Attributes:
+        added (List[Record]): Sessions not in the previous listing.
+        removed (List[Record]): Sessions no longer listed, as last seen.
+        changed (List[Record]): Sessions whose record changed, as seen now.
+        snapshot (List[Record]): The complete current listing, to pass on to the
+            next incremental fetch.
+    """
+
+    added: List[Record]
+    removed: List[Record]
+    changed: List[Record]
+    snapshot: List[Record]
+
+    @property
+    def empty(self) -> bool:
+        """Whether nothing changed."""
+        return not (self.added or self.removed or self.changed)
+
+
+def identity(record: Record) -> Tuple[Any, ...]:
+    """Key identifying a session across listings.
+
+    Cluster-wide listings (`view="all"`) omit the session id, so the user, kind,
+    name and start time are used instead.
+
+    Args:
+        record (Record): Session record.
+
+    Returns:
+        Tuple[Any, ...]: Identifying key.
+    """
+    if record.get("id"):
+        return (record["id"],)
+    return tuple(record.get(field) for field in ("userid", "type", "name", "startTime"))
+
+
+def diff(previous: Iterable[Record], current: List[Record]) -> Delta:
+    """Compare two listings of sessions.
+
+    Args:
+        previous (Iterable[Record]): Earlier listing.
+        current (List[Record]): Current listing.
+
+    Returns:
+        Delta: The differences.
+    """
+    before = {identity(record): record for record in previous}
+    added: List[Record] = []
+    changed: List[Record] = []
+    for record in current:
+        old = before.pop(identity(record), None)
+        if old is None:
+            added.append(record)
+        elif old != record:
+            changed.append(record)
+    return Delta(added, list(before.values()), changed, current)
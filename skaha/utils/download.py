@@ -0,0 +1,177 @@
+"""Streaming of session logs to disk, with optional compression and resume."""
+
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Optional
+
+from skaha.exceptions import ParameterError
+
+MANIFEST = "manifest.json"
+# File name suffix of each supported compression
+SUFFIXES: Dict[Optional[str], str] = {
+    None: ".log",
+    "gzip": ".log.gz",
+    "zstd": ".log.zst",
+}
+
+
+def opener(path: Path, compression: Optional[str], append: bool) -> IO[bytes]:
+    """Open a log file for writing.
+
+    Appending to a compressed file adds a new gzip member or zstd frame, both
+    formats decompress concatenated members as a single stream.
+
+    Args:
+        path (Path): File path.
+        compression (Optional[str]): None, "gzip" or "zstd".
+        append (bool): Append to the file instead of truncating it.
+
+    Returns:
+        IO[bytes]: Writable file object.
+
+    Raises:
+        ParameterError: If the compression is unknown or its package missing.
+    """
+    mode = "ab" if append else "wb"
+    if compression is None:
+        return open(path, mode)
+    if compression == "gzip":
+        return gzip.open(path, mode)  # type: ignore
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as error:
+            raise ParameterError("zstd compression requires zstandard") from error
+        return zstandard.ZstdCompressor().stream_writer(open(path, mode))
+    raise ParameterError(f"unsupported compression {compression!r}")
+
+
+class Sink:
+    """Log file receiving a response body, possibly starting past an offset.
+
+    Args:
+        path (Path): File path.
+        compression (Optional[str]): None, "gzip" or "zstd".
+        offset (int): Bytes of the log already on disk.
+    """
+
+    def __init__(self, path: Path, compression: Optional[str], offset: int) -> None:
+        """Initialize the sink, without opening the file."""
+        self.path = path
+        self.compression = compression
+        self.offset = offset
+        self.received = 0
+        self.skip = 0
+        self.size = path.stat().st_size if offset and path.exists() else 0
+        self.file: Optional[IO[bytes]] = None
+
+    def begin(self, partial: bool) -> None:
+        """Open the file for a response body.
+
+        Args:
+            partial (bool): True if the body starts at the offset (HTTP 206),
+                False if it holds the entire log, whose first `offset` bytes are
+                then skipped.
+        """
+        self.skip = 0 if partial else self.offset
+        self.file = opener(self.path, self.compression, append=self.offset > 0)
+
+    def write(self, chunk: bytes) -> None:
+        """Write a chunk of the response body."""
+        assert self.file is not None, "sink not started"
+        if self.skip:
+            if len(chunk) <= self.skip:
+                self.skip -= len(chunk)
+                return
+            skip, self.skip = self.skip, 0
+            chunk = chunk[skip:]
+        self.file.write(chunk)
+        self.received += len(chunk)
+
+    def close(self, failed: bool = False) -> None:
+        """Close the file.
+
+        Args:
+            failed (bool): The body was not received entirely. Compressed files
+                are then truncated back to their previous size, as a partial
+                gzip member or zstd frame could not be appended to. Plain files
+                are kept, to resume from their size.
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if failed and self.compression is not None and self.path.exists():
+            os.truncate(self.path, self.size)
+            self.received = 0
+
+    @property
+    def total(self) -> int:
+        """Bytes of the log saved, uncompressed."""
+        return self.offset + self.received
+
+
+class Manifest:
+    """Description of the logs saved in a directory, kept in `manifest.json`.
+
+    Each session has an entry with the file name, the uncompressed and stored
+    sizes in bytes, the compression, whether the last download completed, its
+    error if not, and the time of the last update. The manifest is rewritten
+    atomically after every download, so it survives an interrupted run.
+
+    Args:
+        directory (Path): Directory holding the logs.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Load the manifest of the directory, if there is one."""
+        self.path = directory / MANIFEST
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text()).get("sessions", {})
+
+    def offset(self, identity: str, path: Path, compression: Optional[str]) -> int:
+        """Bytes of a log already saved, from which to resume.
+
+        Args:
+            identity (str): Session ID.
+            path (Path): Log file.
+            compression (Optional[str]): Requested compression.
+
+        Returns:
+            int: Offset to resume from, 0 to download the entire log.
+        """
+        if not path.exists():
+            return 0
+        if compression is None:
+            return path.stat().st_size
+        entry = self.entries.get(identity, {})
+        if (
+            entry.get("complete")
+            and entry.get("compression") == compression
+            and entry.get("stored") == path.stat().st_size
+        ):
+            return int(entry["bytes"])
+        return 0
+
+    def update(self, identity: str, **fields: Any) -> Dict[str, Any]:
+        """Update the entry of a session and save the manifest.
+
+        Args:
+            identity (str): Session ID.
+            **fields: Entry fields.
+
+        Returns:
+            Dict[str, Any]: Updated entry.
+        """
+        with self.lock:
+            entry = self.entries.setdefault(identity, {})
+            entry.update(fields, updated=datetime.now(timezone.utc).isoformat())
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps({"sessions": self.entries}, indent=2))
+            os.replace(temporary, self.path)
+            return dict(entry)
@@ -0,0 +1,354 @@
+"""Index of container images, for fast lookups and tag resolution."""
+
+import re
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from skaha.exceptions import ParameterError
+from skaha.utils.delta import Delta, Record, diff
+
+# Semantic-like versions, e.g. 1.1.2, v22.11, 2.0.0-rc1
+VERSION = re.compile(r"^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?(?:[-+.]?(.+))?$")
+
+Version = Tuple[int, int, int, int, str]
+
+
+def version(tag: Optional[str]) -> Optional[Version]:
+    """Sort key of an image tag, if it is a version.
+
+    Missing minor and patch numbers count as 0, and pre-releases such as
+    `2.0.0-rc1` sort before their release.
+
+    Args:
+        tag (Optional[str]): Image tag.
+
+    Returns:
+        Optional[Version]: Sort key, None if the tag is not a version.
+
+    Examples:
+        >>> version("1.1.2") > version("1.1.2-rc1") > version("1.1")
+        True
+    """
+    match = VERSION.match(tag or "")
+    if match is None:
+        return None
+    major, minor, patch, extra = match.groups()
+    return (
+        int(major),
+        int(minor or 0),
+        int(patch or 0),
+        0 if extra else 1,
+        extra or "",
+    )
+
+
+def split(reference: str) -> Tuple[str, Optional[str]]:
+    """Split an image reference into its repository and tag.
+
+    Args:
+        reference (str): Image reference, e.g. `images.canfar.net/skaha/terminal:1.1.2`.
+
+    Returns:
+        Tuple[str, Optional[str]]: Repository and tag, None if untagged.
+    """
+    head, _, tail = reference.rpartition("/")
+    if ":" not in tail:
+        return reference, None
+    name, tag = tail.split(":", 1)
+    return f"{head}/{name}" if head else name, tag
+
+
+class Image(NamedTuple):
+    """Container image of the catalog.
+
+    Attributes:
+        id (str): Full image reference.
+        registry (str): Registry host, e.g. `images.canfar.net`.
+        project (str): Registry project, e.g. `skaha`.
+        repository (str): Image reference without its tag.
+        tag (Optional[str]): Image tag, None if untagged.
+        types (Tuple[str, ...]): Session types the image can be used for.
+        digest (Optional[str]): Image digest, if reported.
+        record (Record): Record of the image, as returned by the server.
+    """
+
+    id: str
+    registry: str
+    project: str
+    repository: str
+    tag: Optional[str]
+    types: Tuple[str, ...]
+    digest: Optional[str]
+    record: Record
+
+    @classmethod
+    def parse(cls, record: Record) -> "Image":
+        """Create an image from its record.
+
+        Args:
+            record (Record): Image record, with at least an `id`.
+
+        Returns:
+            Image: The image.
+        """
+        identity = str(record["id"])
+        repository, tag = split(identity)
+        parts = repository.split("/")
+        registry = parts[0] if len(parts) > 1 else ""
+        project = parts[1] if len(parts) > 2 else ""
+        return cls(
+            identity,
+            registry,
+            project,
+            repository,
+            tag,
+            tuple(record.get("types") or ()),
+            record.get("digest"),
+            record,
+        )
+
+    @property
+    def version(self) -> Optional[Version]:
+        """Sort key of the tag, None if it is not a version."""
+        return version(self.tag)
+
+
+class ImageIndex:
+    """In-memory index of the image catalog.
+
+    Images are indexed by ID for constant time existence checks, by repository
+    for tag resolution and by project, with a sorted list of IDs for prefix
+    searches. The index is refreshed incrementally: only images added, removed
+    or changed since the last listing are re-indexed.
+
+    Args:
+        records (Iterable[Record], optional): Image records, as returned by the
+            `image` endpoint. Defaults to none.
+
+    Examples:
+        >>> from skaha.images import Images
+        >>> index = Images().index()
+        >>> "images.canfar.net/skaha/terminal:1.1.2" in index
+        True
+        >>> index.latest("images.canfar.net/skaha/terminal").id
+        'images.canfar.net/skaha/terminal:1.1.2'
+    """
+
+    def __init__(self, records: Iterable[Record] = ()) -> None:
+        """Build the index."""
+        self.images: Dict[str, Image] = {}
+        self.ids: List[str] = []
+        self.repositories: Dict[str, Dict[Optional[str], Image]] = {}
+        self.projects: Dict[str, Set[str]] = {}
+        self.update(list(records))
+
+    def __len__(self) -> int:
+        """Number of images."""
+        return len(self.images)
+
+    def __iter__(self) -> Iterator[Image]:
+        """Images, sorted by ID."""
+        return (self.images[identity] for identity in self.ids)
+
+    def __contains__(self, reference: object) -> bool:
+        """Whether an image reference is in the catalog."""
+        return reference in self.images
+
+    def get(self, reference: str) -> Optional[Image]:
+        """Get an image by its full reference.
+
+        Args:
+            reference (str): Image reference.
+
+        Returns:
+            Optional[Image]: The image, None if not in the catalog.
+        """
+        return self.images.get(reference)
+
+    def update(self, records: List[Record]) -> Delta:
+        """Refresh the index from a complete listing of the catalog.
+
+        Args:
+            records (List[Record]): Image records, as returned by the server.
+
+        Returns:
+            Delta: Image records added, removed and changed.
+        """
+        delta = diff((image.record for image in self.images.values()), records)
+        for record in delta.removed:
+            self._remove(str(record["id"]))
+        for record in delta.changed:
+            self._remove(str(record["id"]))
+            self._add(Image.parse(record))
+        for record in delta.added:
+            self._add(Image.parse(record))
+        return delta
+
+    def _add(self, image: Image) -> None:
+        """Index an image."""
+        self.images[image.id] = image
+        insort(self.ids, image.id)
+        self.repositories.setdefault(image.repository, {})[image.tag] = image
+        self.projects.setdefault(image.project, set()).add(image.repository)
+
+    def _remove(self, identity: str) -> None:
+        """Remove an image from the index."""
+        image = self.images.pop(identity)
+        del self.ids[bisect_left(self.ids, identity)]
+        tags = self.repositories[image.repository]
+        del tags[image.tag]
+        if not tags:
+            del self.repositories[image.repository]
+            self.projects[image.project].discard(image.repository)
+            if not self.projects[image.project]:
+                del self.projects[image.project]
+
+    def search(
+        self,
+        prefix: str = "",
+        project: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> List[Image]:
+        """Find images by ID prefix, project and session type.
+
+        Args:
+            prefix (str, optional): Start of the image ID. Defaults to "".
+            project (Optional[str], optional): Registry project. Defaults to None.
+            kind (Optional[str], optional): Session type. Defaults to None.
+
+        Returns:
+            List[Image]: Matching images, sorted by ID.
+        """
+        images: List[Image] = []
+        start = bisect_left(self.ids, prefix)
+        for identity in islice(self.ids, start, None):
+            if not identity.startswith(prefix):
+                break
+            image = self.images[identity]
+            if project is not None and image.project != project:
+                continue
+            if kind is not None and kind not in image.types:
+                continue
+            images.append(image)
+        return images
+
+    def tags(self, repository: str) -> List[str]:
+        """Tags of a repository, from the latest version to the earliest.
+
+        Tags that are not versions come last, in alphabetical order.
+
+        Args:
+            repository (str): Image reference without its tag.
+
+        Returns:
+            List[str]: Tags of the repository, empty if it is unknown.
+        """
+        versions: List[Tuple[Version, str]] = []
+        others: List[str] = []
+        for tag in self.repositories.get(repository, {}):
+            key = version(tag)
+            if key is not None:
+                versions.append((key, str(tag)))
+            elif tag:
+                others.append(tag)
+        return [tag for _, tag in sorted(versions, reverse=True)] + sorted(others)
+
+    def latest(self, repository: str, kind: Optional[str] = None) -> Optional[Image]:
+        """Image with the highest version tag of a repository.
+
+        Releases are preferred over pre-releases, which are only considered if
+        the repository has no release. Repositories without version tags resolve
+        to their `latest` tag.
+
+        Args:
+            repository (str): Image reference without its tag.
+            kind (Optional[str], optional): Only consider images usable for this
+                session type. Defaults to None.
+
+        Returns:
+            Optional[Image]: The latest image, None if there is none.
+        """
+        images = [
+            image
+            for image in self.repositories.get(repository, {}).values()
+            if kind is None or kind in image.types
+        ]
+        versioned = [image for image in images if image.version]
+        releases = [image for image in versioned if image.version[3]]  # type: ignore
+        versioned = releases or versioned
+        if versioned:
+            return max(versioned, key=lambda image: image.version)  # type: ignore
+        for image in images:
+            if image.tag == "latest":
+                return image
+        return None
+
+    def resolve(self, reference: str, kind: Optional[str] = None) -> str:
+        """Resolve an image reference to an image of the catalog.
+
+        References in the catalog resolve to themselves. Untagged references, and
+        `latest` ones when no image is tagged as such, resolve to the highest
+        version of their repository.
+
+        Args:
+            reference (str): Image reference.
+            kind (Optional[str], optional): Session type the image is for.
+                Defaults to None.
+
+        Returns:
+            str: Full image reference.
+
+        Raises:
+            ParameterError: If the reference does not resolve to an image.
+        """
+        image = self.images.get(reference)
+        if image is not None and (kind is None or kind in image.types):
+            return reference
+        repository, tag = split(reference)
+        if tag in (None, "latest"):
+            image = self.latest(repository, kind)
+            if image is not None:
+                return image.id
+        raise ParameterError(self.explain(reference))
+
+    def problems(self, references: Iterable[str]) -> List[str]:
+        """Describe the image references not in the catalog.
+
+        Args:
+            references (Iterable[str]): Image references.
+
+        Returns:
+            List[str]: One problem per distinct missing image, empty if none.
+        """
+        missing = sorted({ref for ref in references if ref not in self.images})
+        return [self.explain(reference) for reference in missing]
+
+    def require(self, references: Iterable[str]) -> None:
+        """Check that images are in the catalog.
+
+        Args:
+            references (Iterable[str]): Image references.
+
+        Raises:
+            ParameterError: Naming every image not in the catalog.
+        """
+        problems = self.problems(references)
+        if problems:
+            raise ParameterError("; ".join(problems))
+
+    def explain(self, reference: str) -> str:
+        """Describe why an image reference is not in the catalog."""
+        repository, _ = split(reference)
+        tags = self.tags(repository)
+        if tags:
+            return f"{reference} not found, available tags: {', '.join(tags[:5])}"
+        return f"{reference} not found in the catalog of {len(self)} images"
+
+    def summary(self) -> Dict[str, Any]:
+        """Number of images, repositories and projects indexed."""
+        return {
+            "images": len(self.images),
+            "repositories": len(self.repositories),
+            "projects": len(self.projects),
+        }
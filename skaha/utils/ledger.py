@@ -0,0 +1,377 @@
+"""Persistent, local ledger of launched sessions, backed by SQLite.
+
+Every create and destroy request, the session ID returned for it, the status
+transitions seen while polling and the location of downloaded logs are
+recorded. Sessions are grouped into sweeps, named after the specification
+they were created from, with one row per replica (`name-1`, `name-2`, ...).
+Since the ledger survives the process, a sweep interrupted midway can be
+resumed: only the replicas without a session ID are launched again.
+
+Examples:
+    >>> from skaha.session import Session
+        from skaha.utils.ledger import Ledger
+        session = Session(ledger=Ledger("sweeps.db"))
+        session.create(name="fft", image=image, cmd="fft", replicas=500)
+        # ... the process dies, and is started again ...
+        session.create(name="fft", image=image, cmd="fft", replicas=500)
+        session.ledger.count("fft")
+        {'Running': 480, 'Succeeded': 20}
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from skaha.utils import logs
+from skaha.utils.table import timestamp
+
+log = logs.get_logger(__name__)
+
+# Statuses recorded by the ledger itself, in addition to the server's
+REQUESTED = "Requested"
+FAILED = "Failed"
+DESTROYED = "Destroyed"
+# Statement updating each column of the sessions table that can change, so that
+# no column name is ever formatted into SQL
+UPDATES = {
+    "status": "UPDATE sessions SET status = ?, updated = ? WHERE sweep = ? AND name = ?",
+    "logs": "UPDATE sessions SET logs = ?, updated = ? WHERE sweep = ? AND name = ?",
+}
+# Seconds a session may appear to start before it was requested, clock skew
+SKEW = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    sweep TEXT NOT NULL,
+    name TEXT NOT NULL,
+    id TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    logs TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (sweep, name)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS sessions_id ON sessions (id);
+CREATE INDEX IF NOT EXISTS sessions_status ON sessions (status, sweep);
+CREATE TABLE IF NOT EXISTS events (
+    sequence INTEGER PRIMARY KEY AUTOINCREMENT,
+    sweep TEXT NOT NULL,
+    name TEXT NOT NULL,
+    id TEXT,
+    kind TEXT NOT NULL,
+    value TEXT,
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_sweep ON events (sweep, name);
+CREATE INDEX IF NOT EXISTS events_id ON events (id);
+"""
+
+
+class Ledger:
+    """SQLite ledger of sessions, safe to share between threads.
+
+    Args:
+        path (Union[str, Path]): Database file, created if missing. Defaults to
+            an in-memory database, lost when the ledger is closed.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:") -> None:
+        """Open the ledger, creating its tables if needed."""
+        self.path = str(path)
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.lock, self.connection:
+            if self.path != ":memory:":
+                self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+
+    def request(self, sweep: str, names: Iterable[str]) -> None:
+        """Record create requests, before they are sent.
+
+        Args:
+            sweep (str): Sweep name.
+            names (Iterable[str]): Replica names.
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            for name in names:
+                self.connection.execute(
+                    "INSERT INTO sessions (sweep, name, status, created, updated) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT (sweep, name) DO UPDATE "
+                    "SET status = excluded.status, error = NULL, "
+                    "updated = excluded.updated",
+                    (sweep, name, REQUESTED, now, now),
+                )
+                self._event(sweep, name, None, "create", None, now)
+
+    def launched(
+        self,
+        sweep: str,
+        name: str,
+        id: Optional[str] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Record the outcome of a create request.
+
+        A request is only recorded as failed if the server answered it with an
+        error status. After a timeout or a lost connection the session may
+        still have been created, so the replica stays requested, with the error
+        noted, for its session to be adopted when next listed.
+
+        Args:
+            sweep (str): Sweep name.
+            name (str): Replica name.
+            id (Optional[str]): Session ID, None if the request failed.
+            error (Optional[BaseException]): Error of a failed request.
+        """
+        now = time.time()
+        response = getattr(error, "response", None)
+        answered = getattr(response, "status_code", None) is not None
+        status = FAILED if not id and answered else REQUESTED
+        message = None if error is None else f"{type(error).__name__}: {error}"
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO sessions "
+                "(sweep, name, id, status, error, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (sweep, name) DO UPDATE "
+                "SET id = excluded.id, status = excluded.status, "
+                "error = excluded.error, updated = excluded.updated",
+                (sweep, name, id, status, message, now, now),
+            )
+            self._event(sweep, name, id, "launched", id or message, now)
+
+    def destroyed(self, id: str, error: Optional[BaseException] = None) -> None:
+        """Record the outcome of a destroy request.
+
+        Args:
+            id (str): Session ID.
+            error (Optional[BaseException]): Error of a failed request.
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            row = self._row(id)
+            if row is None:
+                return
+            if error is None:
+                self._update(row, "status", DESTROYED, now)
+            else:
+                message = f"{type(error).__name__}: {error}"
+                self._event(row["sweep"], row["name"], id, "destroy", message, now)
+
+    def observe(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Record status transitions from a session listing.
+
+        Records of unknown sessions are ignored, unless their name matches a
+        replica whose create request got no answer, e.g. because the process
+        died while waiting for it, and they started after the request; the
+        session is then adopted by the replica.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Session records, e.g. returned
+                by `Session.fetch()`.
+
+        Returns:
+            int: Number of transitions recorded.
+        """
+        now, transitions = time.time(), 0
+        with self.lock, self.connection:
+            for record in records:
+                identity, status = record.get("id"), record.get("status")
+                if not identity or not status:
+                    continue
+                row = self._row(identity)
+                if row is None and record.get("name"):
+                    row = self._adopt(record, now)
+                if row is not None and row["status"] not in (status, DESTROYED):
+                    self._update(row, "status", status, now)
+                    transitions += 1
+        return transitions
+
+    def locate(self, id: str, location: Union[str, Path]) -> None:
+        """Record where the logs of a session were saved.
+
+        Args:
+            id (str): Session ID.
+            location (Union[str, Path]): Path or URL of the logs.
+        """
+        now = time.time()
+        with self.lock, self.connection:
+            row = self._row(id)
+            if row is not None:
+                self._update(row, "logs", str(location), now)
+
+    def replicas(self, sweep: str) -> Dict[str, str]:
+        """Session IDs of the replicas of a sweep that were launched.
+
+        Args:
+            sweep (str): Sweep name.
+
+        Returns:
+            Dict[str, str]: Session ID by replica name.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name, id FROM sessions WHERE sweep = ? AND id IS NOT NULL",
+                (sweep,),
+            ).fetchall()
+        return {row["name"]: row["id"] for row in rows}
+
+    def unresolved(self, sweep: str) -> List[str]:
+        """Replicas of a sweep whose create request got no answer.
+
+        Args:
+            sweep (str): Sweep name.
+
+        Returns:
+            List[str]: Replica names.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name FROM sessions WHERE sweep = ? AND id IS NULL "
+                "AND status = ?",
+                (sweep, REQUESTED),
+            ).fetchall()
+        return [row["name"] for row in rows]
+
+    def sessions(
+        self, sweep: Optional[str] = None, status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Recorded sessions, optionally of a single sweep or status.
+
+        Args:
+            sweep (Optional[str]): Sweep name.
+            status (Optional[str]): Last known status.
+
+        Returns:
+            List[Dict[str, Any]]: Rows, with the sweep, name, id, status, error,
+                logs location and creation and update times.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT * FROM sessions WHERE (:sweep IS NULL OR sweep = :sweep) "
+                "AND (:status IS NULL OR status = :status) "
+                "ORDER BY sweep, created, name",
+                {"sweep": sweep, "status": status},
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, sweep: Optional[str] = None) -> Dict[str, int]:
+        """Number of sessions per status.
+
+        Args:
+            sweep (Optional[str]): Only count the sessions of this sweep.
+
+        Returns:
+            Dict[str, int]: Count by status.
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT status, COUNT(*) FROM sessions "
+                "WHERE (:sweep IS NULL OR sweep = :sweep) GROUP BY status",
+                {"sweep": sweep or None},
+            ).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def history(self, id: str) -> List[Dict[str, Any]]:
+        """Recorded events of a session, oldest first.
+
+        Args:
+            id (str): Session ID.
+
+        Returns:
+            List[Dict[str, Any]]: Events with their kind, value and time.
+        """
+        with self.lock:
+            row = self._row(id)
+            if row is None:
+                return []
+            rows = self.connection.execute(
+                "SELECT kind, value, time FROM events WHERE sweep = ? AND name = ? "
+                "ORDER BY sequence",
+                (row["sweep"], row["name"]),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def forget(self, sweep: str) -> None:
+        """Remove a sweep, so that running it again launches every replica.
+
+        Args:
+            sweep (str): Sweep name.
+        """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM sessions WHERE sweep = ?", (sweep,))
+            self.connection.execute("DELETE FROM events WHERE sweep = ?", (sweep,))
+
+    def close(self) -> None:
+        """Close the database."""
+        with self.lock:
+            self.connection.close()
+
+    def __enter__(self) -> "Ledger":
+        """Use the ledger as a context manager."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close the database on exit."""
+        self.close()
+
+    def _row(self, id: str) -> Optional[sqlite3.Row]:
+        """Row of a session by ID."""
+        return self.connection.execute(
+            "SELECT * FROM sessions WHERE id = ?", (id,)
+        ).fetchone()
+
+    def _adopt(self, record: Dict[str, Any], now: float) -> Optional[sqlite3.Row]:
+        """Assign a session to the only unanswered replica with its name.
+
+        Sessions started before the replica was requested, give or take the
+        clock skew, belong to an earlier run and are left alone.
+        """
+        name, id = record["name"], record["id"]
+        started = timestamp(record.get("startTime"))
+        if math.isnan(started):
+            return None
+        rows = self.connection.execute(
+            "SELECT * FROM sessions WHERE name = ? AND id IS NULL AND status = ? "
+            "AND created <= ?",
+            (name, REQUESTED, started + SKEW),
+        ).fetchall()
+        if len(rows) != 1:
+            return None
+        self.connection.execute(
+            "UPDATE sessions SET id = ?, updated = ? WHERE sweep = ? AND name = ?",
+            (id, now, rows[0]["sweep"], name),
+        )
+        self._event(rows[0]["sweep"], name, id, "adopted", id, now)
+        log.info(f"{name}: adopted session {id}")
+        return self._row(id)
+
+    def _update(self, row: sqlite3.Row, column: str, value: str, now: float) -> None:
+        """Update a column of a session, recording the change as an event."""
+        if column not in UPDATES:
+            raise ValueError(f"unknown ledger column {column!r}")
+        self.connection.execute(
+            UPDATES[column], (value, now, row["sweep"], row["name"])
+        )
+        self._event(row["sweep"], row["name"], row["id"], column, value, now)
+
+    def _event(
+        self,
+        sweep: str,
+        name: str,
+        id: Optional[str],
+        kind: str,
+        value: Optional[str],
+        now: float,
+    ) -> None:
+        """Append an event."""
+        self.connection.execute(
+            "INSERT INTO events (sweep, name, id, kind, value, time) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (sweep, name, id, kind, value, now),
+        )
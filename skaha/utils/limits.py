@@ -0,0 +1,87 @@
+"""Validation of session specifications against the resources a server offers."""
+
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from skaha.models import CreateSpec
+
+# Context fields listing the sizes offered for each resource
+FIELDS: Dict[str, str] = {
+    "cores": "availableCores",
+    "ram": "availableRAM",
+    "gpus": "availableGPUs",
+}
+
+
+def nearest(value: int, sizes: Tuple[int, ...]) -> int:
+    """Snap a resource request to the nearest size offered, rounding ties up.
+
+    Args:
+        value (int): Requested amount.
+        sizes (Tuple[int, ...]): Sizes offered, sorted.
+
+    Returns:
+        int: Nearest offered size.
+    """
+    return min(sizes, key=lambda size: (abs(size - value), -size))
+
+
+class Limits(NamedTuple):
+    """Core, RAM and GPU sizes offered by the server.
+
+    Empty sizes are not checked, e.g. when the server reports no GPUs.
+
+    Attributes:
+        cores (Tuple[int, ...]): Cores offered per session.
+        ram (Tuple[int, ...]): RAM in GB offered per session.
+        gpus (Tuple[int, ...]): GPUs offered per session.
+    """
+
+    cores: Tuple[int, ...] = ()
+    ram: Tuple[int, ...] = ()
+    gpus: Tuple[int, ...] = ()
+
+    @classmethod
+    def parse(cls, context: Dict[str, Any]) -> "Limits":
+        """Create the limits from a response of the `context` endpoint.
+
+        Args:
+            context (Dict[str, Any]): Available resources, see `Context.resources`.
+
+        Returns:
+            Limits: Sizes offered, sorted.
+        """
+        return cls(
+            *(
+                tuple(sorted(int(size) for size in context.get(key) or ()))
+                for key in FIELDS.values()
+            )
+        )
+
+    def check(
+        self, spec: CreateSpec, snap: bool = False
+    ) -> Tuple[CreateSpec, List[str]]:
+        """Check the resources of a specification.
+
+        Args:
+            spec (CreateSpec): Session specification.
+            snap (bool, optional): Snap invalid sizes to the nearest offered ones
+                instead of reporting them. Defaults to False.
+
+        Returns:
+            Tuple[CreateSpec, List[str]]: Specification, snapped if requested, and
+                its problems.
+        """
+        update: Dict[str, int] = {}
+        problems: List[str] = []
+        for field, sizes in zip(FIELDS, self):
+            value: Optional[int] = getattr(spec, field)
+            if value is None or not sizes or value in sizes:
+                continue
+            if snap:
+                update[field] = nearest(value, sizes)
+                continue
+            offered = ", ".join(str(size) for size in sizes)
+            problems.append(f"{spec.name}: {field}={value} not in [{offered}]")
+        if update:
+            spec = spec.model_copy(update=update)
+        return spec, problems
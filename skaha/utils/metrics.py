@@ -0,0 +1,314 @@
+"""Request instrumentation: latency histograms, counters and optional tracing."""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from skaha.utils import logs
+
+log = logs.get_logger(__name__)
+
+# Latency buckets in seconds, upper bounds
+BUCKETS: Tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+RESOURCES: Tuple[str, ...] = ("session", "image", "context", "availability")
+
+
+def endpoint(url: str) -> str:
+    """Endpoint of a request URL, with session IDs replaced by a placeholder.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        str: Endpoint, e.g. "session", "session/{id}" or "image".
+
+    Examples:
+        >>> endpoint("https://ws-uv.canfar.net/skaha/v0/session/hjko98yghj")
+        'session/{id}'
+    """
+    parts = [part for part in urlsplit(url).path.split("/") if part]
+    for index, part in enumerate(parts):
+        if part in RESOURCES:
+            return f"{part}/{{id}}" if index + 1 < len(parts) else part
+    return parts[-1] if parts else "/"
+
+
+class Histogram:
+    """Cumulative latency histogram.
+
+    Args:
+        buckets (Sequence[float]): Bucket upper bounds, in increasing order.
+    """
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single value."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Cumulative counts per upper bound, ending with "+Inf"."""
+        total, counts = 0, []
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            total += count
+            counts.append((bound, total))
+        return counts
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile, as the upper bound of the bucket holding it."""
+        rank, total = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank and total:
+                return bound
+        return float("inf")
+
+
+class Sample:
+    """Outcome of a single request attempt, filled in by the transport.
+
+    Args:
+        metrics (Metrics): Registry the attempt is recorded in.
+        key (Tuple[str, str]): Method and endpoint of the attempt.
+    """
+
+    def __init__(self, metrics: "Metrics", key: Tuple[str, str]) -> None:
+        """Initialize an empty sample."""
+        self.metrics = metrics
+        self.key = key
+        self.status: Optional[int] = None
+
+    def response(self, status: int) -> None:
+        """Record the response status."""
+        self.status = status
+
+    def receive(self, size: int) -> None:
+        """Count response body bytes as they are read, even after the attempt."""
+        with self.metrics.lock:
+            self.metrics.received[self.key] += size
+
+
+class Metrics:
+    """In-process registry of request metrics.
+
+    Every request attempt, including retries, is recorded per method and
+    endpoint: a latency histogram (time until the response headers arrive),
+    status code counters, error counters by exception type, the number of
+    requests in flight, the bytes sent in query strings and request bodies, and
+    the response body bytes as they are read, streamed or not. Optionally, each
+    attempt is also wrapped in an OpenTelemetry span, if `opentelemetry-api` is
+    installed.
+
+    Args:
+        buckets (Sequence[float]): Latency bucket upper bounds in seconds.
+        tracing (bool): Emit OpenTelemetry spans.
+
+    Examples:
+        >>> from skaha.session import Session
+            from skaha.utils.metrics import Metrics
+            metrics = Metrics()
+            session = Session(metrics=metrics)
+            session.info(ids)
+            metrics.summary()
+            {'GET session/{id}': {'count': 500, 'p50': 0.1, 'p99': 0.5, ...}}
+            print(metrics.prometheus())
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = BUCKETS, tracing: bool = False
+    ) -> None:
+        """Initialize the registry."""
+        self.buckets = tuple(buckets)
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.retries: Counter = Counter()
+        self.inflight: Counter = Counter()
+        self.sent: Counter = Counter()
+        self.received: Counter = Counter()
+        self.lock = threading.Lock()
+        self.tracer: Any = None
+        if tracing:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                log.warning("opentelemetry-api is not installed, tracing disabled")
+            else:
+                self.tracer = trace.get_tracer("skaha")
+
+    @contextmanager
+    def track(self, method: str, url: str, sent: int = 0) -> Iterator[Sample]:
+        """Record a request attempt around the code sending it.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            sent (int): Size of the request body in bytes, the query string of
+                the URL is counted on top.
+
+        Yields:
+            Sample: To be filled in with the response.
+        """
+        key = (method, endpoint(url))
+        sample = Sample(self, key)
+        span = None
+        if self.tracer is not None:
+            span = self.tracer.start_span(
+                f"{method} {key[1]}",
+                attributes={"http.request.method": method, "url.full": url},
+            )
+        with self.lock:
+            self.inflight[key] += 1
+        start = time.perf_counter()
+        try:
+            yield sample
+        except BaseException as error:
+            with self.lock:
+                self.errors[(*key, type(error).__name__)] += 1
+            if span is not None:
+                span.record_exception(error)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.inflight[key] -= 1
+                histogram = self.latency.get(key)
+                if histogram is None:
+                    histogram = self.latency[key] = Histogram(self.buckets)
+                histogram.observe(elapsed)
+                if sample.status is not None:
+                    self.statuses[(*key, sample.status)] += 1
+                self.sent[key] += sent + len(urlsplit(url).query)
+            if span is not None:
+                if sample.status is not None:
+                    span.set_attribute("http.response.status_code", sample.status)
+                span.end()
+
+    def retry(self, method: str, url: str) -> None:
+        """Record that a request attempt is being retried."""
+        with self.lock:
+            self.retries[(method, endpoint(url))] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Overview of the recorded requests per method and endpoint.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Count, mean and estimated p50/p99
+                latency in seconds, retries, errors and status codes.
+        """
+        with self.lock:
+            summary: Dict[str, Dict[str, Any]] = {}
+            for key, histogram in sorted(self.latency.items()):
+                summary[" ".join(key)] = {
+                    "count": histogram.count,
+                    "mean": histogram.sum / histogram.count,
+                    "p50": histogram.quantile(0.5),
+                    "p99": histogram.quantile(0.99),
+                    "retries": self.retries[key],
+                    "errors": sum(
+                        count
+                        for (*labels, _), count in self.errors.items()
+                        if tuple(labels) == key
+                    ),
+                    "statuses": {
+                        status: count
+                        for (*labels, status), count in self.statuses.items()
+                        if tuple(labels) == key
+                    },
+                }
+            return summary
+
+    def prometheus(self) -> str:
+        """Export the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text.
+        """
+
+        def labels(method: str, path: str, **extra: Any) -> str:
+            pairs = {"method": method, "endpoint": path, **extra}
+            return ",".join(f'{key}="{value}"' for key, value in pairs.items())
+
+        lines: List[str] = []
+        with self.lock:
+            lines += [
+                "# HELP skaha_request_seconds Request latency until response headers.",
+                "# TYPE skaha_request_seconds histogram",
+            ]
+            for (method, path), histogram in sorted(self.latency.items()):
+                for bound, count in histogram.cumulative():
+                    text = labels(method, path, le=bound)
+                    lines.append(f"skaha_request_seconds_bucket{{{text}}} {count}")
+                text = labels(method, path)
+                lines.append(f"skaha_request_seconds_sum{{{text}}} {histogram.sum}")
+                lines.append(f"skaha_request_seconds_count{{{text}}} {histogram.count}")
+            counters = [
+                ("skaha_requests_total", "Responses by status code.", self.statuses),
+                (
+                    "skaha_request_errors_total",
+                    "Failed attempts by error.",
+                    self.errors,
+                ),
+                ("skaha_request_retries_total", "Retried attempts.", self.retries),
+                (
+                    "skaha_request_bytes_total",
+                    "Query string and body bytes sent.",
+                    self.sent,
+                ),
+                (
+                    "skaha_response_bytes_total",
+                    "Response body bytes received.",
+                    self.received,
+                ),
+            ]
+            for name, description, counter in counters:
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+                for key, count in sorted(counter.items(), key=str):
+                    method, path, *rest = key
+                    extra = {}
+                    if rest:
+                        label = "status" if counter is self.statuses else "error"
+                        extra[label] = rest[0]
+                    lines.append(f"{name}{{{labels(method, path, **extra)}}} {count}")
+            name = "skaha_requests_inflight"
+            lines += [f"# HELP {name} Requests in flight.", f"# TYPE {name} gauge"]
+            for (method, path), count in sorted(self.inflight.items()):
+                lines.append(f"{name}{{{labels(method, path)}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Forget all recorded metrics, except requests still in flight."""
+        with self.lock:
+            for counter in (
+                self.statuses,
+                self.errors,
+                self.retries,
+                self.sent,
+                self.received,
+            ):
+                counter.clear()
+            self.latency.clear()
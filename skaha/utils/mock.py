@@ -0,0 +1,371 @@
+"""Local mock of the Skaha API, for offline testing and benchmarking.
+
+The mock implements the `session`, `image`, `context` and `availability`
+endpoints in memory, with configurable latency, error rate and payload sizes.
+It is deterministic for a given `seed`, so benchmark results can be compared
+across releases.
+
+Examples:
+    >>> from skaha.session import Session
+        from skaha.utils.mock import MockServer
+        with MockServer(latency=0.01, error_rate=0.05) as mock:
+            mock.populate(10000)
+            session = Session(server=mock.url, certificate="proxy.pem")
+            session.fetch(view="all")
+"""
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+AVAILABILITY = """<?xml version="1.0" encoding="UTF-8"?>
+<vosi:availability xmlns:vosi="http://www.ivoa.net/xml/VOSIAvailability/v1.0">
+  <vosi:available>{available}</vosi:available>
+</vosi:availability>
+"""
+CONTEXT: Dict[str, Any] = {
+    "defaultCores": 2,
+    "defaultCoresHeadless": 1,
+    "availableCores": [1, 2, 4, 8, 16],
+    "defaultRAM": 16,
+    "defaultRAMHeadless": 4,
+    "availableRAM": [1, 2, 4, 8, 16, 32, 64, 128, 192],
+    "availableGPUs": [1, 2, 3, 4],
+}
+TYPES: Tuple[str, ...] = ("headless", "notebook", "desktop", "carta")
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answer requests from the state of the owning `MockServer`."""
+
+    protocol_version = "HTTP/1.1"
+    server: "Server"
+
+    def log_message(self, *args: Any) -> None:
+        """Silence request logging."""
+
+    @property
+    def mock(self) -> "MockServer":
+        """State of the mock."""
+        return self.server.mock
+
+    def reply(
+        self,
+        code: int,
+        body: Any = "",
+        kind: str = "text/plain",
+        headers: Dict[str, str] = {},
+    ) -> None:
+        """Send a response with an explicit content length."""
+        if isinstance(body, bytes):
+            data = body
+        else:
+            if not isinstance(body, str):
+                body, kind = json.dumps(body), "application/json"
+            data = body.encode()
+        self.send_response(code)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def route(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        """Split the request into path segments and query parameters."""
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part][1:]
+        return parts, parse_qs(url.query)
+
+    def fault(self) -> bool:
+        """Delay the request, and fail it if a fault is due.
+
+        Returns:
+            bool: Whether an error response was sent.
+        """
+        self.mock.requests["total"] += 1
+        if self.mock.latency:
+            time.sleep(self.mock.latency)
+        code = None
+        with self.mock.lock:
+            if self.mock.faults:
+                code = self.mock.faults.pop(0)
+            elif self.mock.error_rate and self.mock.random() < self.mock.error_rate:
+                code = 503
+        if code is None:
+            return False
+        self.mock.requests["faults"] += 1
+        self.reply(code, "", headers={"Retry-After": "0"})
+        return True
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle GET requests."""
+        if self.fault():
+            return
+        parts, query = self.route()
+        view = query.get("view", [None])[0]
+        if parts == ["availability"]:
+            self.mock.requests["availability"] += 1
+            available = str(self.mock.available).lower()
+            return self.reply(200, AVAILABILITY.format(available=available), "text/xml")
+        if parts == ["v0", "image"]:
+            self.mock.requests["image"] += 1
+            if self.headers.get("If-None-Match") == '"catalog"':
+                return self.reply(304)
+            return self.reply(200, self.mock.images, headers={"ETag": '"catalog"'})
+        if parts == ["v0", "context"]:
+            return self.reply(200, CONTEXT)
+        if parts == ["v0", "session"]:
+            self.mock.expire()
+            if view == "stats":
+                return self.reply(200, self.mock.stats())
+            return self.reply(200, list(self.mock.sessions.values()))
+        if len(parts) == 3 and parts[2] in self.mock.sessions:
+            if view == "logs":
+                return self.tail(parts[2])
+            return self.reply(200, self.mock.sessions[parts[2]])
+        return self.reply(404, "not found")
+
+    def tail(self, identity: str) -> None:
+        """Serve a session log, honouring byte ranges when enabled."""
+        data = self.mock.log(identity)
+        offset = int(self.headers.get("Range", "bytes=0-")[6:-1])
+        if not self.mock.ranges or not offset:
+            return self.reply(200, data)
+        if offset >= len(data):
+            return self.reply(416)
+        return self.reply(206, data[offset:])
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Handle session creation."""
+        if self.fault():
+            return
+        _, query = self.route()
+        name = query["name"][0]
+        with self.mock.lock:
+            if self.mock.failures.get(name, 0) > 0:
+                self.mock.failures[name] -= 1
+                return self.reply(503, "busy")
+        if query["image"][0].endswith(":missing"):
+            return self.reply(400, "image not found")
+        identity = self.mock.identity()
+        self.mock.sessions[identity] = {
+            **self.mock.record(identity, name, query["kind"][0]),
+            "image": query["image"][0],
+            "env": query.get("env", []),
+            "requestedCPUCores": query.get("cores", ["1"])[0],
+            "requestedRAM": f"{query.get('ram', ['1'])[0]}G",
+        }
+        self.mock.started[identity] = time.monotonic()
+        with self.mock.lock:
+            if self.mock.lost.get(name, 0) > 0:
+                self.mock.lost[name] -= 1
+                return self.reply(504, "gateway timeout")
+        self.reply(200, f"{identity}\n")
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        """Handle session deletion."""
+        if self.fault():
+            return
+        parts, _ = self.route()
+        if self.mock.sessions.pop(parts[-1], None) is None:
+            return self.reply(404, "not found")
+        self.reply(200)
+
+
+class Server(ThreadingHTTPServer):
+    """Threaded HTTP server bound to a mock."""
+
+    daemon_threads = True
+
+    def __init__(self, port: int, mock: "MockServer") -> None:
+        """Initialize the server."""
+        self.mock = mock
+        super().__init__(("127.0.0.1", port), Handler)
+
+
+class MockServer:
+    """In-memory Skaha API served on localhost.
+
+    The state (`sessions`, `logs`, `failures`, `faults`, ...) can be inspected
+    and modified freely, also while the server is running.
+
+    Args:
+        latency (float): Seconds added to every request.
+        error_rate (float): Fraction of requests answered with HTTP 503.
+        log_size (int): Size in bytes of generated session logs.
+        images (int): Number of images in the catalog.
+        seed (Optional[int]): Seed for error injection and session IDs.
+        port (int): Port to listen on, any free port if 0.
+        cores (int): Cores of the cluster, reported by the stats view.
+        lifetime (Optional[float]): Seconds after which created sessions
+            succeed, never if None.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        log_size: int = 0,
+        images: int = 1,
+        seed: Optional[int] = 0,
+        port: int = 0,
+        cores: int = 960,
+        lifetime: Optional[float] = None,
+    ) -> None:
+        """Initialize the mock, without starting it."""
+        assert 0.0 <= error_rate <= 1.0, "error_rate must be between 0 and 1"
+        self.latency = latency
+        self.error_rate = error_rate
+        self.log_size = log_size
+        self.port = port
+        self.cores = cores
+        self.lifetime = lifetime
+        self.images: List[Dict[str, Any]] = [
+            {
+                "id": f"images.canfar.net/skaha/terminal:1.1.{index + 2}",
+                "types": ["headless", "notebook"],
+                "digest": f"sha256:{index:064x}",
+            }
+            for index in range(images)
+        ]
+        self.generator = random.Random(seed)  # nosec: B311
+        self.lock = threading.Lock()
+        self.server: Optional[Server] = None
+        self.thread: Optional[threading.Thread] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all sessions, logs and injected faults."""
+        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.started: Dict[str, float] = {}
+        self.logs: Dict[str, bytes] = {}
+        self.ranges = True
+        self.available = True
+        self.requests: Counter = Counter()
+        self.failures: Dict[str, int] = {}
+        self.lost: Dict[str, int] = {}
+        self.faults: List[int] = []
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running mock, to be used as the client `server`."""
+        assert self.server is not None, "mock server is not running"
+        return f"http://127.0.0.1:{self.server.server_address[1]}/skaha"
+
+    def start(self) -> "MockServer":
+        """Serve in a background thread."""
+        self.server = Server(self.port, self)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving."""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "MockServer":
+        """Start the mock on entering the context."""
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        """Stop the mock on exit."""
+        self.stop()
+
+    def random(self) -> float:
+        """Next number of the seeded generator, in [0, 1)."""
+        return self.generator.random()
+
+    def identity(self) -> str:
+        """New, unused session ID."""
+        with self.lock:
+            identity = f"{self.generator.getrandbits(32):08x}"
+            while identity in self.sessions:
+                identity = f"{self.generator.getrandbits(32):08x}"
+            return identity
+
+    def record(self, identity: str, name: str, kind: str) -> Dict[str, Any]:
+        """Session record, with the fields returned by the Skaha API."""
+        return {
+            "id": identity,
+            "userid": f"user{int(identity, 16) % 100}",
+            "image": self.images[0]["id"],
+            "type": kind,
+            "status": "Running",
+            "name": name,
+            "startTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "connectURL": "not-applicable",
+            "requestedRAM": "16G",
+            "requestedCPUCores": "2",
+            "requestedGPUCores": "<none>",
+            "coresInUse": "250m",
+            "ramInUse": "101Mi",
+        }
+
+    def expire(self) -> None:
+        """Mark created sessions as succeeded once their lifetime is over."""
+        if self.lifetime is None:
+            return
+        now = time.monotonic()
+        with self.lock:
+            for identity, started in list(self.started.items()):
+                if now - started >= self.lifetime and identity in self.sessions:
+                    self.sessions[identity]["status"] = "Succeeded"
+                    del self.started[identity]
+
+    def stats(self) -> Dict[str, Any]:
+        """Cluster statistics, with the cores requested by active sessions."""
+        active = [
+            record
+            for record in list(self.sessions.values())
+            if record.get("status") in ("Pending", "Running")
+        ]
+        return {
+            "instances": {"total": len(self.sessions)},
+            "cores": {
+                "requestedCPUCores": sum(
+                    int(record.get("requestedCPUCores", 0)) for record in active
+                ),
+                "coresAvailable": self.cores,
+                "maxCores": {
+                    "cores": max(CONTEXT["availableCores"]),
+                    "withRam": "192G",
+                },
+            },
+            "ram": {"maxRAM": {"ram": "192G", "withCores": 16}},
+        }
+
+    def populate(self, count: int) -> List[str]:
+        """Add running sessions.
+
+        Args:
+            count (int): Number of sessions to add.
+
+        Returns:
+            List[str]: IDs of the new sessions.
+        """
+        ids: List[str] = []
+        for index in range(count):
+            identity = self.identity()
+            kind = TYPES[index % len(TYPES)]
+            self.sessions[identity] = self.record(identity, f"mock-{index}", kind)
+            ids.append(identity)
+        return ids
+
+    def log(self, identity: str) -> bytes:
+        """Log of a session, generated with `log_size` bytes if not set."""
+        if identity not in self.logs:
+            line = f"{identity} line\n".encode()
+            if not self.log_size:
+                return line * 3
+            count = -(-self.log_size // len(line))
+            self.logs[identity] = line * count
+        return self.logs[identity]
@@ -0,0 +1,290 @@
+"""Compact, typed tables of session records."""
+
+import re
+import sys
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+NAN = float("nan")
+QUANTITY = re.compile(r"^([0-9]*\.?[0-9]+)([A-Za-z]*)$")
+UNITS: Dict[str, float] = {
+    "": 1.0,
+    "K": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+    "Ki": 2.0**10,
+    "Mi": 2.0**20,
+    "Gi": 2.0**30,
+    "Ti": 2.0**40,
+}
+
+
+def cores(value: Optional[str]) -> float:
+    """Parse a CPU quantity, e.g. "2" or "250m", into cores.
+
+    Args:
+        value (Optional[str]): Quantity reported by the server.
+
+    Returns:
+        float: Number of cores, NaN if unknown.
+    """
+    if not value or value.startswith("<"):
+        return NAN
+    try:
+        if value.endswith("m"):
+            return float(value[:-1]) / 1000
+        return float(value)
+    except ValueError:
+        return NAN
+
+
+def memory(value: Optional[str]) -> float:
+    """Parse a memory quantity, e.g. "16G" or "101Mi", into bytes.
+
+    Args:
+        value (Optional[str]): Quantity reported by the server.
+
+    Returns:
+        float: Number of bytes, NaN if unknown.
+    """
+    if not value or value.startswith("<"):
+        return NAN
+    match = QUANTITY.match(value)
+    if not match or match.group(2) not in UNITS:
+        return NAN
+    return float(match.group(1)) * UNITS[match.group(2)]
+
+
+def timestamp(value: Optional[str]) -> float:
+    """Parse an ISO 8601 timestamp, e.g. "2222-12-14T02:24:06Z", into epoch seconds.
+
+    Args:
+        value (Optional[str]): Timestamp reported by the server.
+
+    Returns:
+        float: Seconds since the epoch, NaN if unknown.
+    """
+    if not value:
+        return NAN
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return NAN
+
+
+class Row(NamedTuple):
+    """A single session, with parsed units."""
+
+    id: str
+    user: str
+    name: str
+    image: str
+    type: str
+    status: str
+    start: float
+    cores: float
+    ram: float
+    gpus: float
+    cores_in_use: float
+    ram_in_use: float
+
+
+# Column name, server field and parser. Text columns are interned, since
+# users, types, statuses and images repeat across many sessions.
+TEXT: Dict[str, str] = {
+    "id": "id",
+    "user": "userid",
+    "name": "name",
+    "image": "image",
+    "type": "type",
+    "status": "status",
+}
+NUMERIC: Dict[str, Any] = {
+    "start": ("startTime", timestamp),
+    "cores": ("requestedCPUCores", cores),
+    "ram": ("requestedRAM", memory),
+    "gpus": ("requestedGPUCores", cores),
+    "cores_in_use": ("coresInUse", cores),
+    "ram_in_use": ("ramInUse", memory),
+}
+
+
+class SessionTable:
+    """Columnar table of sessions, with units parsed once.
+
+    Text columns are lists of interned strings, numeric columns are compact
+    `array("d")`s: cores in cores, memory in bytes and start times in epoch
+    seconds, with NaN for unknown values. This takes a fraction of the memory of
+    the list of dicts returned by `Session.fetch()` and avoids parsing units
+    again on every use.
+
+    Args:
+        columns (Dict[str, Sequence[Any]]): Column data, keyed by column name.
+
+    Examples:
+        >>> from skaha.session import Session
+        >>> table = Session().table(view="all")
+        >>> running = table.filter(status="Running", type={"headless", "notebook"})
+        >>> running.count("user")
+        {'bmajor': 12, 'shinybrar': 3}
+        >>> running.sum("cores", by="user")
+        {'bmajor': 24.0, 'shinybrar': 6.0}
+    """
+
+    columns: Dict[str, Sequence[Any]]
+
+    def __init__(self, columns: Dict[str, Sequence[Any]]) -> None:
+        """Initialize the table."""
+        self.columns = columns
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "SessionTable":
+        """Build a table from session records, as returned by `Session.fetch()`.
+
+        Args:
+            records (Iterable[Dict[str, Any]]): Session records.
+
+        Returns:
+            SessionTable: Parsed table.
+        """
+        columns: Dict[str, Any] = {name: [] for name in TEXT}
+        columns.update({name: array("d") for name in NUMERIC})
+        intern = sys.intern
+        for record in records:
+            for name, field in TEXT.items():
+                columns[name].append(intern(str(record.get(field) or "")))
+            for name, (field, parse) in NUMERIC.items():
+                columns[name].append(parse(record.get(field)))
+        return cls(columns)
+
+    def __len__(self) -> int:
+        """Number of sessions."""
+        return len(self.columns["id"])
+
+    def __getitem__(self, name: str) -> Sequence[Any]:
+        """Column by name."""
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[Row]:
+        """Iterate over the sessions as rows."""
+        return map(Row._make, zip(*(self.columns[name] for name in Row._fields)))
+
+    def take(self, indices: Sequence[int]) -> "SessionTable":
+        """Table with the selected rows.
+
+        Args:
+            indices (Sequence[int]): Row indices.
+
+        Returns:
+            SessionTable: New table.
+        """
+        columns: Dict[str, Sequence[Any]] = {}
+        for name, values in self.columns.items():
+            selected = [values[index] for index in indices]
+            columns[name] = array("d", selected) if name in NUMERIC else selected
+        return SessionTable(columns)
+
+    def filter(
+        self,
+        predicate: Optional[Callable[[Row], bool]] = None,
+        **conditions: Union[Any, Iterable[Any]],
+    ) -> "SessionTable":
+        """Sessions matching all conditions.
+
+        Args:
+            predicate (Optional[Callable[[Row], bool]]): Arbitrary row filter,
+                only called for the rows matching the conditions.
+            **conditions: Column values to match. A set, list or tuple matches
+                any of its values.
+
+        Returns:
+            SessionTable: New table.
+
+        Examples:
+            >>> table.filter(user="bmajor", status={"Pending", "Running"})
+            >>> table.filter(lambda row: row.ram > 64 * 2**30)
+        """
+        indices: Iterable[int] = range(len(self))
+        for name, expected in conditions.items():
+            values = self.columns[name]
+            if isinstance(expected, (set, frozenset, list, tuple)):
+                allowed = set(expected)
+                indices = [index for index in indices if values[index] in allowed]
+            else:
+                indices = [index for index in indices if values[index] == expected]
+        if predicate is not None:
+            fields = [self.columns[name] for name in Row._fields]
+            indices = [
+                index
+                for index in indices
+                if predicate(Row._make(values[index] for values in fields))
+            ]
+        return self.take(list(indices))
+
+    def groupby(self, column: str) -> Dict[Any, "SessionTable"]:
+        """Split the table by the values of a column.
+
+        Args:
+            column (str): Column name, e.g. "user", "type" or "status".
+
+        Returns:
+            Dict[Any, SessionTable]: Tables keyed by column value.
+        """
+        groups: Dict[Any, List[int]] = {}
+        for index, value in enumerate(self.columns[column]):
+            groups.setdefault(value, []).append(index)
+        return {value: self.take(indices) for value, indices in groups.items()}
+
+    def count(self, column: str) -> Dict[Any, int]:
+        """Number of sessions per value of a column.
+
+        Args:
+            column (str): Column name.
+
+        Returns:
+            Dict[Any, int]: Counts keyed by column value.
+        """
+        return dict(Counter(self.columns[column]))
+
+    def sum(self, column: str, by: Optional[str] = None) -> Any:
+        """Sum of a numeric column, ignoring unknown values.
+
+        Args:
+            column (str): Numeric column name, e.g. "cores" or "ram".
+            by (Optional[str]): Column to group by.
+
+        Returns:
+            Any: The total, or totals keyed by the `by` column values.
+        """
+        values = self.columns[column]
+        if by is None:
+            return sum(value for value in values if value == value)
+        totals: Dict[Any, float] = {}
+        for key, value in zip(self.columns[by], values):
+            if value == value:
+                totals[key] = totals.get(key, 0.0) + value
+            else:
+                totals.setdefault(key, 0.0)
+        return totals
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Rows as dictionaries keyed by column name.
+
+        Returns:
+            List[Dict[str, Any]]: Session rows.
+        """
+        return [row._asdict() for row in self]
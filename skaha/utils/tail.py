@@ -0,0 +1,140 @@
+"""Incremental log tailing."""
+
+from typing import Dict, List
+
+# Most polls skipped between reads of a log that keeps failing
+SKIPS = 8
+
+
+class Cursor:
+    r"""Byte offset and partial line of a log being tailed.
+
+    The cursor remembers how many bytes of a log have already been consumed,
+    so the next poll only needs the content after `offset`. If the server does
+    not honour the `Range` request header, the bytes before the offset are
+    skipped as they arrive instead.
+
+    Examples:
+        >>> cursor = Cursor()
+            cursor.begin(partial=False)
+            cursor.feed(b"first\nsec")
+            ['first']
+            cursor.feed(b"ond\n")
+            ['second']
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cursor at the start of the log."""
+        self.offset: int = 0
+        self.partial: bytes = b""
+        self.skip: int = 0
+
+    @property
+    def headers(self) -> dict:
+        """HTTP headers requesting only the unread part of the log."""
+        return {"Range": f"bytes={self.offset}-"} if self.offset else {}
+
+    def begin(self, partial: bool) -> None:
+        """Start consuming a response body.
+
+        Args:
+            partial (bool): True if the body starts at the offset (HTTP 206),
+                False if it holds the entire log.
+        """
+        self.skip = 0 if partial else self.offset
+
+    def feed(self, chunk: bytes) -> List[str]:
+        """Consume a chunk of the response body.
+
+        Args:
+            chunk (bytes): Raw bytes from the response.
+
+        Returns:
+            List[str]: Complete lines, without line endings.
+        """
+        if self.skip:
+            if len(chunk) <= self.skip:
+                self.skip -= len(chunk)
+                return []
+            skip, self.skip = self.skip, 0
+            chunk = chunk[skip:]
+        self.offset += len(chunk)
+        *lines, self.partial = (self.partial + chunk).split(b"\n")
+        return [line.decode(errors="replace").rstrip("\r") for line in lines]
+
+    def flush(self) -> List[str]:
+        """Return the trailing partial line, if any.
+
+        Returns:
+            List[str]: The partial line, or an empty list.
+        """
+        line, self.partial = self.partial, b""
+        return [line.decode(errors="replace").rstrip("\r")] if line else []
+
+
+class Retry:
+    """Back off failed log reads, per session, counted in polls.
+
+    After `n` consecutive failures a session sits out the next `2**(n-1) - 1`
+    polls, up to `SKIPS`. Its cursor is left untouched, so the next read
+    resumes where the failed one stopped.
+
+    Args:
+        limit (int): Consecutive failures after which a finished session is
+            given up on.
+
+    Examples:
+        >>> retry = Retry()
+            retry.failed("hjko98yghj")
+            retry.due("hjko98yghj")
+            True
+    """
+
+    def __init__(self, limit: int = 5) -> None:
+        """Initialize without failures."""
+        self.limit = limit
+        self.failures: Dict[str, int] = {}
+        self.skips: Dict[str, int] = {}
+
+    def due(self, identity: str) -> bool:
+        """Whether the session is read at this poll, consuming a skip if not.
+
+        Args:
+            identity (str): Session ID.
+
+        Returns:
+            bool: True if the session should be read.
+        """
+        if self.skips.get(identity, 0):
+            self.skips[identity] -= 1
+            return False
+        return True
+
+    def failed(self, identity: str) -> None:
+        """Record a failed read.
+
+        Args:
+            identity (str): Session ID.
+        """
+        failures = self.failures[identity] = self.failures.get(identity, 0) + 1
+        self.skips[identity] = min(2 ** (failures - 1) - 1, SKIPS)
+
+    def succeeded(self, identity: str) -> None:
+        """Record a successful read.
+
+        Args:
+            identity (str): Session ID.
+        """
+        self.failures.pop(identity, None)
+        self.skips.pop(identity, None)
+
+    def pending(self, identity: str) -> bool:
+        """Whether a failed read of the session should still be retried.
+
+        Args:
+            identity (str): Session ID.
+
+        Returns:
+            bool: True if the last read failed and the limit is not reached.
+        """
+        return 0 < self.failures.get(identity, 0) < self.limit
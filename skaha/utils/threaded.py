@@ -3,22 +3,65 @@
 import asyncio
 import concurrent.futures
 from functools import partial
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sized
+
+
+class Throttle:
+    """Space out the start of calls to at most `rate` per second.
+
+    Args:
+        rate (float): Maximum number of calls per second.
+
+    Examples:
+        >>> throttle = Throttle(rate=10)
+            await throttle.wait()
+    """
+
+    def __init__(self, rate: float) -> None:
+        """Initialize the throttle."""
+        assert rate > 0, "rate must be positive"
+        self.interval = 1.0 / rate
+        self.next = 0.0
+
+    async def wait(self) -> None:
+        """Wait until the next call is allowed to start."""
+        now = asyncio.get_running_loop().time()
+        start = max(now, self.next)
+        self.next = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
 
 
 async def scale(
     function: Callable[[Any, Any], Any],
-    arguments: List[Dict[Any, Any]] = [{}],
+    arguments: Iterable[Dict[Any, Any]] = [{}],
+    concurrency: Optional[int] = None,
+    rate: Optional[float] = None,
+    executor: Optional[concurrent.futures.Executor] = None,
 ) -> List[Any]:
     """Scales a function across multiple arguments.
 
+    Arguments are consumed lazily, one as each call starts, so a generator of
+    arguments is never materialized when a concurrency is given.
+
     Args:
         function (Callable): The function to be scaled.
-        arguments (List[Dict[Any, Any]], optional): The arguments to be passed to each
-            function, by default [{}]
+        arguments (Iterable[Dict[Any, Any]], optional): The arguments to be passed
+            to each function, by default [{}]
+        concurrency (Optional[int], optional): Maximum number of calls in flight at
+            once, by default one per argument.
+        rate (Optional[float], optional): Maximum number of calls started per second,
+            by default unlimited.
+        executor (Optional[Executor], optional): Shared executor to run the calls on.
+            If None, a temporary thread pool sized to the concurrency is used.
 
     Returns:
-        List: The results of the function.
+        List: The results of the function, or the exceptions raised, in the same
+            order as the arguments.
+
+    Raises:
+        Exception: Any error raised while generating the arguments, once the calls
+            already started have completed.
 
     Examples:
         >>> from skaha.threaded import scale
@@ -26,14 +69,44 @@ async def scale(
             loop = get_event_loop()
             loop.run_until_complete(scale(lambda x: x**2, [{'x': i} for i in range(10)]))
     """
-    workers = len(arguments)
-    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
-        loop = asyncio.get_event_loop()
-        futures = [
-            loop.run_in_executor(executor, partial(function, **arguments[index]))
-            for index in range(workers)
-        ]
-        return await asyncio.gather(*futures, return_exceptions=True)
+    if concurrency is None and not isinstance(arguments, Sized):
+        arguments = list(arguments)
+    if isinstance(arguments, Sized):
+        workers = min(concurrency or len(arguments), len(arguments)) or 1
+    else:
+        workers = concurrency or 1
+    if executor is None:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            return await scale(function, arguments, workers, rate, pool)
+
+    loop = asyncio.get_running_loop()
+    throttle = Throttle(rate) if rate else None
+    jobs = enumerate(arguments)
+    results: Dict[int, Any] = {}
+    failures: List[Exception] = []
+
+    async def work() -> None:
+        while not failures:
+            try:
+                index, kwargs = next(jobs)
+            except StopIteration:
+                return
+            except Exception as error:
+                failures.append(error)
+                return
+            if throttle:
+                await throttle.wait()
+            try:
+                results[index] = await loop.run_in_executor(
+                    executor, partial(function, **kwargs)
+                )
+            except Exception as error:
+                results[index] = error
+
+    await asyncio.gather(*[work() for _ in range(workers)])
+    if failures:
+        raise failures[0]
+    return [results[index] for index in range(len(results))]
 
 
 def get_event_loop() -> asyncio.AbstractEventLoop:
@@ -52,3 +125,19 @@ def get_event_loop() -> asyncio.AbstractEventLoop:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         return loop
+
+
+def close_event_loop() -> None:
+    """Close the event loop of the current thread, if it has one.
+
+    Threads other than the main one get their own loop from `get_event_loop`,
+    which is not closed when the thread ends.
+    """
+    policy = asyncio.get_event_loop_policy()
+    try:
+        loop = policy.get_event_loop()
+    except RuntimeError:
+        return
+    if not loop.is_running():
+        loop.close()
+        policy.set_event_loop(None)
@@ -0,0 +1,533 @@
+"""HTTP transport with timeouts, retries, a circuit breaker and health checks."""
+
+import asyncio
+import random
+import ssl
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Set, Tuple, Union
+
+import httpx
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
+
+from skaha.exceptions import ConnectionError, ServiceBusyError
+from skaha.utils import logs
+from skaha.utils.metrics import Metrics, Sample
+
+log = logs.get_logger(__name__)
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a request.
+
+    Only idempotent methods are retried, on connection errors, timeouts and the
+    configured HTTP statuses. Delays grow exponentially with full jitter, unless
+    the server asks for a specific delay with a `Retry-After` header.
+
+    Args:
+        total (int): Maximum number of retries per request.
+        backoff (float): Base delay in seconds.
+        maximum (float): Longest delay in seconds.
+        statuses (Set[int]): HTTP statuses that are retried.
+        methods (Set[str]): HTTP methods that are retried.
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff: float = 0.5,
+        maximum: float = 30.0,
+        statuses: Set[int] = {429, 500, 502, 503, 504},
+        methods: Set[str] = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"},
+    ) -> None:
+        """Initialize the policy."""
+        assert total >= 0, "total must not be negative"
+        self.total = total
+        self.backoff = backoff
+        self.maximum = maximum
+        self.statuses = set(statuses)
+        self.methods = set(methods)
+
+    def attempts(self, method: str) -> int:
+        """Maximum number of attempts for a request method."""
+        return self.total + 1 if method.upper() in self.methods else 1
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before the next attempt.
+
+        Args:
+            attempt (int): Number of the attempt that just failed, from 1.
+            retry_after (Optional[str]): Value of the `Retry-After` header.
+
+        Returns:
+            float: Delay in seconds.
+        """
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    date = parsedate_to_datetime(retry_after)
+                    seconds = max(0.0, date.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    seconds = -1.0
+            if seconds >= 0:
+                return min(seconds, self.maximum)
+        ceiling = min(self.maximum, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)  # nosec: B311
+
+
+class CircuitBreaker:
+    """Stop sending requests to a server that keeps failing.
+
+    After `threshold` consecutive failures the breaker opens and requests fail
+    fast for `cooldown` seconds. Afterwards, the breaker is half-open: a single
+    trial request is let through while the others keep failing fast. The
+    trial's success closes the breaker and its failure reopens it. A trial
+    that never reports back is replaced by another after `cooldown` seconds.
+
+    Args:
+        threshold (int): Consecutive failures before opening.
+        cooldown (float): Seconds to stay open.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0) -> None:
+        """Initialize the breaker."""
+        assert threshold >= 1, "threshold must be at least 1"
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened: Optional[float] = None
+        self.trial: Optional[float] = None
+        self.connection = False
+        self.lock = threading.Lock()
+
+    @property
+    def open(self) -> bool:
+        """Whether requests are currently rejected."""
+        with self.lock:
+            return self._rejects(time.monotonic())
+
+    @property
+    def remaining(self) -> float:
+        """Seconds until requests are let through again, 0 if closed."""
+        with self.lock:
+            if self.opened is None:
+                return 0.0
+            return max(0.0, self.opened + self.cooldown - time.monotonic())
+
+    def check(self) -> None:
+        """Fail fast while the breaker is open, or half-open during a trial.
+
+        Raises:
+            ConnectionError: If the server could not be reached.
+            ServiceBusyError: If the server kept returning errors.
+        """
+        with self.lock:
+            now = time.monotonic()
+            rejected = self._rejects(now)
+            if not rejected and self.opened is not None:
+                # Half-open, this request is the trial
+                self.trial = now
+        if rejected:
+            message = f"circuit open after {self.failures} consecutive failures"
+            if self.connection:
+                raise ConnectionError(message)
+            raise ServiceBusyError(message)
+
+    def success(self) -> None:
+        """Record a successful request, closing the breaker."""
+        with self.lock:
+            self.failures = 0
+            self.opened = None
+            self.trial = None
+
+    def failure(self, connection: bool = False) -> None:
+        """Record a failed request, reopening the breaker after a failed trial.
+
+        Args:
+            connection (bool): Whether the server could not be reached at all.
+        """
+        with self.lock:
+            self.failures += 1
+            self.connection = connection
+            if self.failures >= self.threshold or self.trial is not None:
+                if self.opened is None:
+                    log.warning(f"Opening circuit after {self.failures} failures")
+                self.opened = time.monotonic()
+                self.trial = None
+
+    def _rejects(self, now: float) -> bool:
+        """Whether a request would be rejected, with the lock held.
+
+        Args:
+            now (float): Current monotonic time.
+
+        Returns:
+            bool: True while open, or while a half-open trial is in flight.
+        """
+        if self.opened is None:
+            return False
+        if now - self.opened < self.cooldown:
+            return True
+        return self.trial is not None and now - self.trial < self.cooldown
+
+
+# Methods changing the state of the server, held back while it is unavailable
+GUARDED: Set[str] = {"POST", "DELETE"}
+
+
+class Health:
+    """Cached availability of the server backend.
+
+    The availability endpoint is probed at most once every `ttl` seconds, on
+    demand or every `interval` seconds from a background thread. Requests that
+    change the state of the server (`GUARDED`) fail fast while the backend
+    reports unavailable, or are held for up to `patience` seconds for it to
+    recover, instead of each waiting out a timeout. A probe that cannot reach
+    the server counts as unavailable.
+
+    Args:
+        ttl (float): Seconds a probe result is trusted.
+        interval (Optional[float]): Seconds between background probes, no
+            background probing if None.
+        patience (float): Seconds to wait for an unavailable backend before
+            failing a request.
+        probe (Optional[Callable[[], bool]]): Returns whether the backend is
+            available. If None, the client probes its availability endpoint.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 10.0,
+        interval: Optional[float] = None,
+        patience: float = 0.0,
+        probe: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """Initialize the health check, without probing."""
+        self.ttl = ttl
+        self.interval = interval
+        self.patience = patience
+        self.probe = probe
+        self.status: Optional[bool] = None
+        self.reason = ""
+        self.checked = -float("inf")
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def bind(self, probe: Callable[[], bool]) -> None:
+        """Set the probe if none was given, and start background probing.
+
+        Args:
+            probe (Callable[[], bool]): Returns whether the backend is available.
+        """
+        if self.probe is None:
+            self.probe = probe
+        if self.interval is not None and self.thread is None:
+            self.start()
+
+    @property
+    def stale(self) -> bool:
+        """Whether the last probe result has expired."""
+        return time.monotonic() - self.checked >= self.ttl
+
+    def refresh(self) -> bool:
+        """Probe the backend now.
+
+        Returns:
+            bool: Whether the backend is available.
+        """
+        with self.lock:
+            return self._probe()
+
+    def available(self) -> bool:
+        """Whether the backend is available, probing if the result expired.
+
+        Concurrent callers finding the result expired wait for a single probe.
+        """
+        if not self.stale:
+            return bool(self.status)
+        with self.lock:
+            if not self.stale:
+                # Probed by another thread while waiting for the lock
+                return bool(self.status)
+            return self._probe()
+
+    def check(self) -> None:
+        """Fail, or wait for up to `patience` seconds, while unavailable.
+
+        Raises:
+            ServiceBusyError: If the backend is still unavailable.
+        """
+        if self.available():
+            return
+        deadline = time.monotonic() + self.patience
+        while time.monotonic() < deadline:
+            time.sleep(min(self.ttl, max(deadline - time.monotonic(), 0)))
+            if self.available():
+                return
+        raise ServiceBusyError(self.reason)
+
+    def _probe(self) -> bool:
+        """Probe the backend and record the result. Must hold the lock."""
+        assert self.probe is not None, "health check has no probe"
+        try:
+            status, reason = self.probe(), "backend reports unavailable"
+        except Exception as error:
+            status, reason = False, f"{type(error).__name__}: {error}"
+        if status != self.status:
+            log.info(f"Backend available: {status}")
+        self.status, self.reason = status, "" if status else reason
+        self.checked = time.monotonic()
+        return status
+
+    def start(self) -> None:
+        """Probe every `interval` seconds from a background thread."""
+        assert self.interval is not None, "interval is required"
+
+        def run() -> None:
+            while not self.stopped.is_set():
+                self.refresh()
+                self.stopped.wait(self.interval)
+
+        self.stopped.clear()
+        self.thread = threading.Thread(target=run, name="skaha-health", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop background probing."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+class Adapter(HTTPAdapter):
+    """Requests adapter applying the timeout, retry policy and circuit breaker.
+
+    Args:
+        timeout (float): Default timeout in seconds.
+        policy (RetryPolicy): Retry policy.
+        breaker (CircuitBreaker): Circuit breaker, shared per client.
+        context (Optional[Callable]): Returns the SSL context, carrying the client
+            certificate, shared by all HTTPS connections of the pool.
+        metrics (Optional[Metrics]): Registry recording every attempt.
+        health (Optional[Health]): Backend health check, guarding requests that
+            change the state of the server.
+        **kwargs: Passed on to `HTTPAdapter`, e.g. `pool_maxsize`.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        policy: RetryPolicy,
+        breaker: CircuitBreaker,
+        context: Optional[Callable[[], Union[ssl.SSLContext, bool]]] = None,
+        metrics: Optional[Metrics] = None,
+        health: Optional[Health] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the adapter."""
+        self.timeout = timeout
+        self.policy = policy
+        self.breaker = breaker
+        self.context = context
+        self.metrics = metrics
+        self.health = health
+        super().__init__(**kwargs)
+
+    def build_connection_pool_key_attributes(  # type: ignore
+        self, request: PreparedRequest, verify: Any, cert: Any = None
+    ) -> Tuple[Any, Any]:
+        """Use the shared SSL context for HTTPS connection pools.
+
+        The certificate is already loaded into the shared context, so it is not
+        passed on to be loaded again for every new connection.
+        """
+        host, pool = super().build_connection_pool_key_attributes(request, verify, cert)
+        context = self.context() if self.context else None
+        if host["scheme"] == "https" and isinstance(context, ssl.SSLContext):
+            pool["ssl_context"] = context
+            pool.pop("cert_file", None)
+            pool.pop("key_file", None)
+        return host, pool
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:  # type: ignore # noqa: E501
+        """Send a request, retrying transient failures.
+
+        The number of attempts made is recorded as the `attempts` attribute of
+        the returned response, or of the error raised.
+        """
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        if self.health is not None and request.method in GUARDED:
+            self.health.check()
+        attempts = self.policy.attempts(str(request.method))
+        for attempt in range(1, attempts + 1):
+            self.breaker.check()
+            try:
+                response = self._send(request, **kwargs)
+            except (RequestsConnectionError, Timeout) as error:
+                self.breaker.failure(connection=True)
+                if attempt == attempts:
+                    error.attempts = attempt  # type: ignore
+                    raise
+                self._retry(request)
+                time.sleep(self.policy.delay(attempt))
+                continue
+            response.attempts = attempt  # type: ignore
+            if response.status_code not in self.policy.statuses:
+                self.breaker.success()
+                return response
+            self.breaker.failure()
+            if attempt == attempts:
+                return response
+            delay = self.policy.delay(attempt, response.headers.get("Retry-After"))
+            log.debug(f"{request.method} {request.url}: {response.status_code}")
+            response.close()
+            self._retry(request)
+            time.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        """Send a single attempt, recording it in the metrics."""
+        if self.metrics is None:
+            return super().send(request, **kwargs)
+        body = request.body or b""
+        with self.metrics.track(
+            str(request.method), str(request.url), len(body)
+        ) as sample:
+            response = super().send(request, **kwargs)
+            sample.response(response.status_code)
+        # The body is read after the attempt, by the session or the caller
+        iterate = response.iter_content
+
+        def iter_content(*args: Any, **kwargs: Any) -> Iterator[Any]:
+            for data in iterate(*args, **kwargs):
+                sample.receive(len(data))
+                yield data
+
+        response.iter_content = iter_content  # type: ignore
+        return response
+
+    def _retry(self, request: PreparedRequest) -> None:
+        """Count a retry in the metrics."""
+        if self.metrics is not None:
+            self.metrics.retry(str(request.method), str(request.url))
+
+
+class AsyncTransport(httpx.AsyncBaseTransport):
+    """HTTPX transport applying the retry policy and circuit breaker.
+
+    Args:
+        policy (RetryPolicy): Retry policy.
+        breaker (CircuitBreaker): Circuit breaker, shared per client.
+        metrics (Optional[Metrics]): Registry recording every attempt.
+        health (Optional[Health]): Backend health check, guarding requests that
+            change the state of the server.
+        **kwargs: Passed on to `httpx.AsyncHTTPTransport`.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        breaker: CircuitBreaker,
+        metrics: Optional[Metrics] = None,
+        health: Optional[Health] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the transport."""
+        self.policy = policy
+        self.breaker = breaker
+        self.metrics = metrics
+        self.health = health
+        self.transport = httpx.AsyncHTTPTransport(**kwargs)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, retrying transient failures.
+
+        The number of attempts made is recorded as the `attempts` attribute of
+        the returned response, or of the error raised.
+        """
+        if self.health is not None and request.method in GUARDED:
+            # Probing and waiting block, keep them off the event loop
+            if self.health.stale or not self.health.status:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self.health.check
+                )
+        attempts = self.policy.attempts(request.method)
+        for attempt in range(1, attempts + 1):
+            self.breaker.check()
+            try:
+                response = await self._send(request)
+            except httpx.TransportError as error:
+                self.breaker.failure(connection=True)
+                if attempt == attempts:
+                    error.attempts = attempt  # type: ignore
+                    raise
+                self._retry(request)
+                await asyncio.sleep(self.policy.delay(attempt))
+                continue
+            response.attempts = attempt  # type: ignore
+            if response.status_code not in self.policy.statuses:
+                self.breaker.success()
+                return response
+            self.breaker.failure()
+            if attempt == attempts:
+                return response
+            delay = self.policy.delay(attempt, response.headers.get("Retry-After"))
+            log.debug(f"{request.method} {request.url}: {response.status_code}")
+            await response.aclose()
+            self._retry(request)
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        """Send a single attempt, recording it in the metrics."""
+        if self.metrics is None:
+            return await self.transport.handle_async_request(request)
+        sent = int(request.headers.get("Content-Length", 0))
+        with self.metrics.track(request.method, str(request.url), sent) as sample:
+            response = await self.transport.handle_async_request(request)
+            sample.response(response.status_code)
+        # The body is read after the attempt, by the client or the caller
+        response.stream = CountedStream(response.stream, sample)  # type: ignore
+        return response
+
+    def _retry(self, request: httpx.Request) -> None:
+        """Count a retry in the metrics."""
+        if self.metrics is not None:
+            self.metrics.retry(request.method, str(request.url))
+
+    async def aclose(self) -> None:
+        """Close the underlying transport."""
+        await self.transport.aclose()
+
+
+class CountedStream(httpx.AsyncByteStream):
+    """Response body stream counting the bytes read into the metrics.
+
+    Args:
+        stream (httpx.AsyncByteStream): Body of the response.
+        sample (Sample): Attempt the response belongs to.
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, sample: Sample) -> None:
+        """Initialize the stream."""
+        self.stream = stream
+        self.sample = sample
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Yield the body chunks, counting them."""
+        async for chunk in self.stream:
+            self.sample.receive(len(chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        """Close the underlying stream."""
+        await self.stream.aclose()
@@ -0,0 +1,123 @@
+"""Session status watching."""
+
+from time import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+
+class Event(NamedTuple):
+    """A session status transition.
+
+    Attributes:
+        id (str): Session ID.
+        previous (Optional[str]): Previous status, None if not seen before.
+        current (Optional[str]): Current status, None if the session is gone.
+        session (Dict[str, Any]): Latest session record from the server.
+        timestamp (float): Time the transition was observed (epoch seconds).
+    """
+
+    id: str
+    previous: Optional[str]
+    current: Optional[str]
+    session: Dict[str, Any]
+    timestamp: float
+
+
+class Backoff:
+    """Adaptive polling interval.
+
+    The interval grows by `factor` after every poll without changes, up to
+    `maximum`, and resets to `minimum` as soon as something changes.
+
+    Args:
+        minimum (float): Shortest interval in seconds.
+        maximum (float): Longest interval in seconds.
+        factor (float): Growth factor between idle polls.
+    """
+
+    def __init__(self, minimum: float, maximum: float, factor: float = 2.0) -> None:
+        """Initialize the backoff."""
+        assert 0 <= minimum <= maximum, "minimum must be between 0 and maximum"
+        assert factor >= 1, "factor must be at least 1"
+        self.minimum = minimum
+        self.maximum = maximum
+        self.factor = factor
+        self.current = minimum
+
+    def next(self, changed: bool) -> float:
+        """Interval to wait before the next poll.
+
+        Args:
+            changed (bool): Whether the last poll observed any change.
+
+        Returns:
+            float: Interval in seconds.
+        """
+        if changed:
+            self.current = self.minimum
+        else:
+            self.current = min(max(self.current, 1e-3) * self.factor, self.maximum)
+        return self.current
+
+
+class Watcher:
+    """Diff successive session snapshots into status transitions.
+
+    A session that has never been listed, e.g. one created just before the
+    first fetch, stays pending for `grace` snapshots before it is reported
+    gone. A session that was listed and then disappears is reported at once.
+
+    Args:
+        ids (Iterable[str]): Session IDs to watch.
+        until (Iterable[str]): Statuses at which a session stops being watched.
+        grace (int, optional): Snapshots a never-listed session may be missing
+            from. Defaults to 3.
+
+    Examples:
+        >>> watcher = Watcher(["hjko98yghj"], until=["Succeeded", "Error"])
+            watcher.update(session.fetch())
+            [Event(id='hjko98yghj', previous=None, current='Running', ...)]
+    """
+
+    def __init__(
+        self, ids: Iterable[str], until: Iterable[str], grace: int = 3
+    ) -> None:
+        """Initialize the watcher."""
+        self.until = set(until)
+        self.grace = grace
+        self.pending = list(dict.fromkeys(ids))
+        self.status: Dict[str, Optional[str]] = {}
+        self.missed: Dict[str, int] = {}
+
+    def update(self, snapshot: List[Dict[str, Any]]) -> List[Event]:
+        """Compare a fetched session list against the previous one.
+
+        Sessions that reach an `until` status, or go missing from the
+        snapshot, are reported once and then no longer watched.
+
+        Args:
+            snapshot (List[Dict[str, Any]]): Sessions from `Session.fetch()`.
+
+        Returns:
+            List[Event]: Status transitions since the previous snapshot.
+        """
+        now = time()
+        sessions = {item["id"]: item for item in snapshot}
+        events: List[Event] = []
+        pending: List[str] = []
+        for identity in self.pending:
+            session = sessions.get(identity, {})
+            if not session and identity not in self.status:
+                # Not listed yet, possibly still being created
+                self.missed[identity] = self.missed.get(identity, 0) + 1
+                if self.missed[identity] < self.grace:
+                    pending.append(identity)
+                    continue
+            current = session.get("status")
+            previous = self.status.get(identity)
+            if identity not in self.status or current != previous:
+                events.append(Event(identity, previous, current, session, now))
+                self.status[identity] = current
+            if current is not None and current not in self.until:
+                pending.append(identity)
+        self.pending = pending
+        return events
@@ -0,0 +1,27 @@
+"""Shared fixtures for the Skaha test suite."""
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from skaha.utils.mock import MockServer
+
+# In-memory Skaha API, its state is reset for every test module
+mock = MockServer()
+
+
+@pytest.fixture(scope="module")
+def stub() -> Iterator[str]:
+    """Serve the mock Skaha API on localhost, yielding its base URL."""
+    mock.reset()
+    with mock:
+        yield mock.url
+
+
+@pytest.fixture(scope="module")
+def certificate(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Placeholder certificate, only read for HTTPS servers."""
+    path = tmp_path_factory.mktemp("ssl") / "cadcproxy.pem"
+    path.touch()
+    return path
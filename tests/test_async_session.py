@@ -0,0 +1,76 @@
+"""Test the asynchronous Skaha clients against a local stub server."""
+
+import pytest
+
+from skaha.context import AsyncContext
+from skaha.images import AsyncImages
+from skaha.overview import AsyncOverview
+from skaha.session import AsyncSession
+
+
+@pytest.mark.asyncio
+async def test_async_session_lifecycle(stub, certificate):
+    """Test create, fetch, info, logs and destroy from a running loop."""
+    async with AsyncSession(server=stub, certificate=certificate) as session:
+        identity = await session.create(
+            name="test", image="images.canfar.net/skaha/terminal:1.1.2", replicas=3
+        )
+        assert len(identity) == 3
+        fetched = {item["id"] for item in await session.fetch()}
+        assert set(identity) <= fetched
+        info = await session.info(identity)
+        assert sorted(item["name"] for item in info) == ["test-1", "test-2", "test-3"]
+        logs = await session.logs(identity[0])
+        assert logs[identity[0]].startswith(identity[0])
+        destroyed = await session.destroy(identity + ["missing"])
+        assert destroyed == {**{i: True for i in identity}, "missing": False}
+    assert session.asynced is None
+
+
+@pytest.mark.asyncio
+async def test_async_session_shares_pool(stub, certificate):
+    """Test that all requests reuse one pooled client."""
+    session = AsyncSession(server=stub, certificate=certificate, concurrency=4)
+    client = session._async_client()
+    await session.info(["a", "b", "c", "d", "e"])
+    assert session.asynced is client
+    await session.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_images_context_overview(stub, certificate):
+    """Test the async variants of Images, Context and Overview."""
+    async with AsyncImages(server=stub, certificate=certificate) as images:
+        assert "images.canfar.net/skaha/terminal:1.1.2" in await images.fetch()
+    async with AsyncContext(server=stub, certificate=certificate) as context:
+        assert "defaultCores" in await context.resources()
+    async with AsyncOverview(server=stub, certificate=certificate) as overview:
+        assert await overview.availaibility()
+
+
+@pytest.mark.asyncio
+async def test_async_create_streams_overrides(stub, certificate):
+    """Test that overrides are consumed as requests are sent, by a worker pool."""
+    consumed = []
+
+    def rows():
+        for index in range(20):
+            consumed.append(index)
+            yield {"env": {"BEAM": index}}
+
+    async with AsyncSession(
+        server=stub, certificate=certificate, concurrency=4
+    ) as session:
+        ids = await session.create(
+            name="beam",
+            image="images.canfar.net/skaha/terminal:1.1.2",
+            replicas=20,
+            overrides=rows(),
+        )
+        latencies = []
+        results = await session._gather(
+            "GET", ({"url": f"{session.server}/{i}"} for i in ids), latencies
+        )
+    assert len(ids) == 20 and consumed == list(range(20))
+    assert [result.json()["id"] for result in results] == ids
+    assert len(latencies) == 20 and all(latency > 0 for latency in latencies)
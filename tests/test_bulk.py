@@ -0,0 +1,101 @@
+"""Test structured bulk results and re-driving of failed sessions."""
+
+import pytest
+from requests import Response
+from requests.exceptions import HTTPError
+
+from skaha.exceptions import ParameterError, ServiceBusyError, UnknownError
+from skaha.session import AsyncSession, Session
+from skaha.utils.bulk import BulkResult, Outcome, classify, pause
+from skaha.utils.ledger import Ledger
+from skaha.utils.transport import CircuitBreaker, RetryPolicy
+
+from .conftest import mock
+
+IMAGE = "images.canfar.net/skaha/terminal:1.1.2"
+
+
+def failure(status: int) -> HTTPError:
+    """HTTP error carrying a response with the given status."""
+    response = Response()
+    response.status_code = status
+    return HTTPError(f"{status} error", response=response)
+
+
+def test_classify():
+    """Test translation of client errors into skaha exceptions."""
+    assert isinstance(classify(failure(404)), ParameterError)
+    assert isinstance(classify(failure(503)), ServiceBusyError)
+    assert isinstance(classify(ValueError("boom")), UnknownError)
+    busy = ServiceBusyError("open")
+    assert classify(busy) is busy
+
+
+def test_merge_adds_attempts():
+    """Test that re-driven outcomes replace earlier ones."""
+    first = BulkResult({"a": Outcome(True), "b": Outcome(None, ServiceBusyError())})
+    assert first.pending() == ["b"]
+    merged = first.merge(BulkResult({"b": Outcome(True, attempts=2)}))
+    assert merged.ok and merged["b"].attempts == 3
+    assert merged.succeeded == {"a": True, "b": True}
+
+
+def test_pause_waits_for_the_breaker():
+    """Test that re-drives back off, and wait for an open breaker to close."""
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    assert pause(3, RetryPolicy(backoff=1), breaker) <= 4
+    breaker.failure()
+    assert 59 < pause(1, RetryPolicy(backoff=0), breaker) <= 60
+
+
+def test_bulk_destroy_redrives_failures(stub, certificate):
+    """Test per-session outcomes, with retries exhausted on one session."""
+    session = Session(
+        server=stub, certificate=certificate, retries=1, backoff=0, concurrency=1
+    )
+    ids = mock.populate(4)
+    # Exhaust both attempts of the first request, so it needs a re-drive
+    mock.faults = [503, 503]
+    result = session.bulk("destroy", ids + ["missing"], redrive=1)
+    assert result.succeeded == {identity: True for identity in ids}
+    assert list(result.failed) == ["missing"]
+    assert isinstance(result.failed["missing"], ParameterError)
+    assert result[ids[0]].attempts == 3
+    assert sum(outcome.attempts for outcome in result.values()) == 7
+    assert all(outcome.latency > 0 for outcome in result.values())
+    with pytest.raises(ParameterError):
+        result.raise_for_errors()
+
+
+def test_bulk_destroy_marks_the_ledger(stub, certificate):
+    """Test that sessions destroyed in bulk are recorded as such."""
+    mock.reset()
+    session = Session(server=stub, certificate=certificate, ledger=Ledger())
+    ids = session.create(name="job", image=IMAGE, replicas=3)
+    session.bulk("destroy", ids[:2])
+    assert session.ledger.count("job") == {"Requested": 1, "Destroyed": 2}
+
+
+def test_bulk_survives_open_breaker(stub, certificate):
+    """Test that breaker errors are reported instead of crashing."""
+    breaker = CircuitBreaker(threshold=1, cooldown=60)
+    session = Session(server=stub, certificate=certificate, breaker=breaker)
+    breaker.failure()
+    result = session.bulk("info", ["a", "b"])
+    assert set(result.failed) == {"a", "b"}
+    assert all(isinstance(e, ServiceBusyError) for e in result.failed.values())
+    assert session.info(["a", "b"]) == []
+    assert session.destroy(["a"]) == {"a": False}
+
+
+@pytest.mark.asyncio
+async def test_async_bulk(stub, certificate):
+    """Test structured results from the asynchronous client."""
+    ids = mock.populate(2)
+    async with AsyncSession(server=stub, certificate=certificate) as session:
+        result = await session.bulk("info", ids + ["missing"])
+    assert {key: value["id"] for key, value in result.succeeded.items()} == {
+        identity: identity for identity in ids
+    }
+    assert isinstance(result.failed["missing"], ParameterError)
+    assert result[ids[0]].attempts == 1
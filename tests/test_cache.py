@@ -0,0 +1,58 @@
+"""Test the client-side response cache."""
+
+import time
+
+import pytest
+
+from skaha.context import Context
+from skaha.images import AsyncImages, Images
+from skaha.utils.cache import Cache
+
+from .conftest import mock
+
+
+def test_cache_lru_eviction():
+    """Test that the least recently used entry is evicted."""
+    cache = Cache(size=2)
+    for key in ("a", "b"):
+        cache.store("image", key, key, {})
+    cache.lookup("image", "a")
+    cache.store("image", "c", "c", {})
+    assert list(cache.entries) == ["a", "c"]
+
+
+def test_cache_hits_and_revalidation(stub, certificate):
+    """Test fresh hits and ETag revalidation of stale entries."""
+    cache = Cache(ttl={"image": 60})
+    images = Images(server=stub, certificate=certificate, cache=cache)
+    first = images.fetch()
+    assert images.fetch() == first
+    assert mock.requests["image"] == 1
+    # Expire the entry, the server confirms it is unchanged
+    key = next(iter(cache.entries))
+    cache.entries[key] = cache.entries[key]._replace(expires=time.time() - 1)
+    assert images.fetch() == first
+    assert mock.requests["image"] == 2
+    assert cache.stats()["image"] == {"hits": 1, "misses": 2, "revalidated": 1}
+
+
+def test_cache_on_disk(stub, certificate, tmp_path):
+    """Test that a new cache, as in a new process, reuses entries from disk."""
+    context = Context(
+        server=stub, certificate=certificate, cache=Cache(directory=tmp_path)
+    )
+    assert "defaultCores" in context.resources()
+    fresh = Cache(directory=tmp_path)
+    context = Context(server=stub, certificate=certificate, cache=fresh)
+    assert "defaultCores" in context.resources()
+    assert fresh.stats()["context"] == {"hits": 1, "misses": 0, "revalidated": 0}
+
+
+@pytest.mark.asyncio
+async def test_async_cache(stub, certificate):
+    """Test that the async clients share the cache."""
+    cache = Cache()
+    Images(server=stub, certificate=certificate, cache=cache).fetch()
+    async with AsyncImages(server=stub, certificate=certificate, cache=cache) as images:
+        assert await images.fetch()
+    assert cache.stats()["image"]["hits"] == 1
@@ -0,0 +1,115 @@
+"""Test the command line interface against a local stub server."""
+
+import asyncio
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from skaha.cli import cli, stream
+
+from .conftest import mock
+
+
+@pytest.fixture
+def run(stub, certificate):
+    """Invoke the CLI against the stub server and decode its NDJSON output."""
+    mock.sessions, mock.logs = {}, {}
+
+    def invoke(*arguments, input=None, code=0):
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["--server", stub, "--certificate", certificate, *arguments],
+            input=input,
+            catch_exceptions=False,
+        )
+        assert result.exit_code == code, result.output
+        return [json.loads(line) for line in result.stdout.splitlines()]
+
+    return invoke
+
+
+def test_create_ps_destroy(run):
+    """Test a batch lifecycle driven through stdin."""
+    specs = "\n".join(
+        json.dumps({"name": f"job{i}", "image": "images.canfar.net/skaha/x:1"})
+        for i in range(5)
+    )
+    created = run("create", "-i", "-", input=specs)
+    assert sorted(record["name"] for record in created) == [f"job{i}" for i in range(5)]
+    ids = [record["id"] for record in created]
+    assert {record["id"] for record in run("ps")} == set(ids)
+    info = run("info", input="\n".join(ids))
+    assert {record["id"] for record in info} == set(ids)
+    destroyed = run("-c", "2", "destroy", *ids, "missing", code=1)
+    assert {record["id"]: record["destroyed"] for record in destroyed} == {
+        **{identity: True for identity in ids},
+        "missing": False,
+    }
+
+
+def test_create_reports_errors(run):
+    """Test that failed launches are reported, and fail the command."""
+    records = run(
+        "create", "--name", "bad", "--image", "images.canfar.net/x:missing", code=1
+    )
+    assert records == [{"name": "bad", "error": "1 of 1 not created", "missing": 1}]
+
+
+def test_create_reports_missing_replicas(run):
+    """Test that a partially launched batch is reported, and fails the command."""
+    mock.failures["part-2"] = 1
+    records = run(
+        "create",
+        "--name",
+        "part",
+        "--image",
+        "images.canfar.net/skaha/x:1",
+        "--replicas",
+        "3",
+        code=1,
+    )
+    assert len([record for record in records if "id" in record]) == 2
+    assert records[-1] == {"name": "part", "error": "1 of 3 not created", "missing": 1}
+
+
+def test_logs_and_stats(run):
+    """Test log streaming and cluster statistics."""
+    mock.sessions["a"] = {"id": "a", "status": "Succeeded"}
+    mock.logs["a"] = b"first\nsecond\n"
+    assert run("logs", "a") == [
+        {"id": "a", "line": "first"},
+        {"id": "a", "line": "second"},
+    ]
+    assert run("stats")[0]["instances"] == {"total": 1}
+
+
+def test_stream_is_bounded():
+    """Test that items are pulled by a fixed pool of workers."""
+    pulled, running, peak = [], [0], [0]
+
+    def items():
+        for item in range(10):
+            pulled.append(item)
+            yield item
+
+    async def square(item):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.001)
+        running[0] -= 1
+        if item == 3:
+            raise ValueError(item)
+        return item * item
+
+    async def main():
+        results = stream(square, items(), 2)
+        first = await results.__anext__()
+        assert len(pulled) < 10
+        return [first] + [result async for result in results]
+
+    results = dict(asyncio.run(main()))
+    assert peak[0] == 2 and len(results) == 10
+    assert isinstance(results.pop(3), ValueError)
+    assert results == {item: item * item for item in results}
@@ -1,5 +1,11 @@
 """Test Skaha Client API."""
 
+import asyncio
+import os
+import shutil
+import subprocess  # nosec: B404
+import threading
+
 import pytest
 import requests
 from pydantic import ValidationError
@@ -58,3 +64,70 @@ def test_bad_certificate_path():
     """Test bad certificate."""
     with pytest.raises(ValidationError):
         SkahaClient(certificate="/gibberish/path")  # nosec: B108
+
+
+def test_clients_do_not_share_sessions():
+    """Test that every client owns its HTTP session and headers."""
+    first = SkahaClient()
+    second = SkahaClient(server="https://example.com/skaha")
+    assert first.session is not second.session
+    assert first.session.headers["X-Skaha-Server"] != (
+        second.session.headers["X-Skaha-Server"]
+    )
+
+
+def test_connection_pool_sized_to_concurrency():
+    """Test that the connection pool follows the client concurrency."""
+    client = SkahaClient(concurrency=100)
+    assert client.session.get_adapter("https://")._pool_maxsize == 100
+    client = SkahaClient(concurrency=100, pool_maxsize=20)
+    assert client.session.get_adapter("https://")._pool_maxsize == 20
+
+
+def certify(path):
+    """Write a self-signed certificate and its key to a PEM file."""
+    key, cert = path.with_suffix(".key"), path.with_suffix(".crt")
+    subprocess.run(  # nosec: B603 B607
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1"]
+        + ["-subj", "/CN=skaha", "-keyout", str(key), "-out", str(cert)],
+        check=True,
+        capture_output=True,
+    )
+    path.write_bytes(cert.read_bytes() + key.read_bytes())
+
+
+@pytest.mark.skipif(shutil.which("openssl") is None, reason="requires openssl")
+def test_renewed_certificate_is_reloaded(tmp_path):
+    """Test that the SSL context and async client follow a renewed certificate."""
+    pem = tmp_path / "cadcproxy.pem"
+    certify(pem)
+    client = SkahaClient(server="https://example.com/skaha", certificate=pem)
+    context, asynced = client._ssl_context(), client._async_client()
+    assert client._ssl_context() is context and client._async_client() is asynced
+    certify(pem)
+    stamp = os.stat(pem).st_mtime_ns + 10**9
+    os.utime(pem, ns=(stamp, stamp))
+    # The file is checked at most once per second
+    assert client._ssl_context() is context
+    client._checked -= 1.0
+    assert client._ssl_context() is not context
+    assert client._async_client() is not asynced
+    asyncio.run(client.aclose())
+    assert asynced.is_closed and client.asynced is None
+
+
+def test_executor_created_once():
+    """Test that concurrent first uses share a single executor."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = SkahaClient()
+    barrier = threading.Barrier(16)
+
+    def executor(_):
+        barrier.wait()
+        return client.executor
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        executors = set(map(id, pool.map(executor, range(16))))
+    assert len(executors) == 1
+    client.close()
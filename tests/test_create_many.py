@@ -0,0 +1,119 @@
+"""Test bulk session creation against a local stub server."""
+
+import pytest
+
+from skaha.exceptions import ParameterError
+from skaha.models import CreateSpec
+from skaha.session import Session, payloads
+
+from .conftest import mock
+
+IMAGE = "images.canfar.net/skaha/terminal:1.1.2"
+
+
+def test_payloads_do_not_share_state():
+    """Test that each replica gets its own name and replica variables."""
+    spec = CreateSpec(
+        name="job",
+        image=IMAGE,
+        kind="headless",
+        env={"A": 1, "REPLICA_ID": 9},
+        replicas=2,
+    )
+    expanded = list(payloads(spec))
+    assert [name for name, _ in expanded] == ["job-1", "job-2"]
+    first = expanded[0][1]
+    assert ("name", "job-1") in first
+    assert [value for key, value in first if key == "env"] == [
+        "A=1",
+        "REPLICA_ID=1",
+        "REPLICA_COUNT=2",
+    ]
+    assert ("env", "REPLICA_ID=2") in expanded[1][1]
+
+
+def test_create_many_heterogeneous(stub, certificate):
+    """Test waves, retries of transient errors and reporting of failures."""
+    session = Session(server=stub, certificate=certificate)
+    mock.failures["fft-2"] = 1
+    specs = [
+        CreateSpec(
+            name="fft", image=IMAGE, kind="headless", cmd="fft", env={}, replicas=3
+        ),
+        CreateSpec(name="bad", image="x:missing", kind="headless", env={}, replicas=1),
+        CreateSpec(name="plot", image=IMAGE, kind="headless", env={}, replicas=2),
+    ]
+    results = session.create_many(specs, wave=2, delay=0)
+    assert [result.name for result in results] == [
+        "fft-1",
+        "fft-2",
+        "fft-3",
+        "bad-1",
+        "plot-1",
+        "plot-2",
+    ]
+    failed = [result for result in results if not result.ok]
+    assert [(result.name, result.attempts) for result in failed] == [("bad-1", 1)]
+    assert results[1].attempts == 2 and results[1].id in mock.sessions
+    assert mock.sessions[results[0].id]["env"][-1] == "REPLICA_COUNT=3"
+
+
+def test_payloads_with_overrides():
+    """Test per-replica cmd, args and env over the shared specification."""
+    spec = CreateSpec(
+        name="job", image=IMAGE, kind="headless", cmd="run", env={"A": 1}, replicas=3
+    )
+    rows = [{}, {"args": "--beam 2", "env": {"A": 2, "B": 3}}, {"cmd": "plot"}]
+    expanded = dict(payloads(spec, iter(rows)))
+    assert expanded["job-1"] == dict(payloads(spec))["job-1"]
+    second = expanded["job-2"]
+    assert ("cmd", "run") in second and ("args", "--beam 2") in second
+    assert [value for key, value in second if key == "env"] == [
+        "A=2",
+        "B=3",
+        "REPLICA_ID=2",
+        "REPLICA_COUNT=3",
+    ]
+    third = expanded["job-3"]
+    assert [value for key, value in third if key == "cmd"] == ["plot"]
+    assert ("env", "A=1") in third
+    with pytest.raises(ParameterError, match="2 overrides for 3 replicas"):
+        next(payloads(spec, rows[:2]))
+    with pytest.raises(ParameterError, match="ran out at replica 3"):
+        list(payloads(spec, iter(rows[:2])))
+    with pytest.raises(ParameterError, match="cannot override"):
+        next(payloads(spec, [{"image": "other"}] * 3))
+
+
+def test_create_streams_overrides(stub, certificate):
+    """Test that a generator of overrides is consumed as requests are sent."""
+    mock.reset()
+    session = Session(server=stub, certificate=certificate, concurrency=4)
+    consumed = []
+
+    def rows():
+        for index in range(20):
+            consumed.append(index)
+            yield {"env": {"BEAM": index}}
+
+    ids = session.create(name="beam", image=IMAGE, replicas=20, overrides=rows())
+    assert len(ids) == 20 and consumed == list(range(20))
+    assert mock.sessions[ids[7]]["env"][0] == "BEAM=7"
+
+
+def test_lost_responses_are_not_created_twice(stub, certificate):
+    """Test that sessions created by requests that failed are adopted."""
+    mock.reset()
+    old = mock.identity()
+    mock.sessions[old] = {
+        **mock.record(old, "once-1", "headless"),
+        "startTime": "2024-01-01T00:00:00Z",
+    }
+    mock.lost["once-1"] = 1
+    session = Session(server=stub, certificate=certificate)
+    spec = CreateSpec(name="once", image=IMAGE, kind="headless", env={}, replicas=2)
+    results = session.create_many([spec], delay=0)
+    assert all(result.ok for result in results)
+    named = [key for key, value in mock.sessions.items() if value["name"] == "once-1"]
+    assert len(named) == 2 and results[0].id in named and results[0].id != old
+    assert results[0].attempts == 1
@@ -0,0 +1,70 @@
+"""Test the client daemon and its Unix socket protocol."""
+
+import os
+import threading
+
+import pytest
+
+from skaha.daemon import Daemon, Remote
+from skaha.exceptions import ClientError, ConnectionError, ParameterError
+
+from .conftest import mock
+
+
+@pytest.fixture
+def daemon(stub, certificate, tmp_path):
+    """Serve a daemon for the stub server in a background thread."""
+    mock.sessions = {}
+    server = Daemon(tmp_path / "skaha.sock", server=stub, certificate=certificate)
+    server.start()
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def test_remote_calls(daemon):
+    """Test forwarding session, image and context calls over one connection."""
+    with Remote(daemon.path) as remote:
+        ids = remote.session.create(name="job", image="images.canfar.net/x:1")
+        assert [record["id"] for record in remote.session.fetch()] == ids
+        assert remote.session.info(ids)[0]["name"].startswith("job")
+        assert remote.images.fetch()
+        assert "defaultCores" in remote.context.resources()
+        assert remote.session.destroy(ids) == {ids[0]: True}
+    assert (os.stat(daemon.path).st_mode & 0o777) == 0o600
+
+
+def test_remote_errors(daemon):
+    """Test that errors are raised again on the client side."""
+    remote = Remote(daemon.path)
+    with pytest.raises(AttributeError):
+        remote.session.create_many
+    with pytest.raises(ParameterError):
+        remote.call("session", "close")
+    with pytest.raises(ClientError):
+        Daemon(daemon.path).start()
+    remote.close()
+    with pytest.raises(ConnectionError):
+        Remote(daemon.path.with_name("missing.sock")).session.fetch()
+
+
+def test_certificate_renewal(daemon, certificate):
+    """Test that clients are recreated after the certificate changes."""
+    session = daemon.client("session")
+    assert daemon.client("session") is session
+    stat = os.stat(certificate)
+    os.utime(certificate, (stat.st_atime, stat.st_mtime + 10))
+    assert daemon.client("session") is not session
+
+
+def test_renewal_spares_calls_in_flight(daemon, certificate):
+    """Test that clients replaced during a call are closed once it returns."""
+    with daemon.borrow("session") as session:
+        stat = os.stat(certificate)
+        os.utime(certificate, (stat.st_atime, stat.st_mtime + 20))
+        assert daemon.client("session") is not session
+        assert daemon.retired == {id(session): session}
+        assert session.fetch() == []
+    assert not daemon.retired and not daemon.busy
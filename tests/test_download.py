@@ -0,0 +1,76 @@
+"""Test streaming session logs to disk against a local mock server."""
+
+import gzip
+import json
+
+import pytest
+
+from skaha.exceptions import ParameterError
+from skaha.session import Session
+from skaha.utils.download import MANIFEST
+
+from .conftest import mock
+
+
+@pytest.fixture
+def session(stub, certificate):
+    """Session against the mock, with three 200 kB logs."""
+    mock.reset()
+    mock.log_size = 200_000
+    mock.populate(3)
+    yield Session(server=stub, certificate=certificate, concurrency=2)
+    mock.log_size = 0
+
+
+def test_download_plain_and_resume(session, tmp_path):
+    """Test saving logs, the manifest, and resuming a truncated file."""
+    ids = list(mock.sessions)
+    entries = session.download_logs(ids + ["missing"], tmp_path)
+    for identity in ids:
+        assert (tmp_path / f"{identity}.log").read_bytes() == mock.log(identity)
+        assert entries[identity]["complete"]
+        assert entries[identity]["bytes"] == len(mock.log(identity))
+    assert not entries["missing"]["complete"]
+    assert "404" in entries["missing"]["error"]
+    manifest = json.loads((tmp_path / MANIFEST).read_text())["sessions"]
+    assert set(manifest) == {*ids, "missing"}
+
+    path = tmp_path / f"{ids[0]}.log"
+    path.write_bytes(path.read_bytes()[:1000])
+    for ranges in (True, False):
+        mock.ranges = ranges
+        entry = session.download_logs(ids[0], tmp_path)[ids[0]]
+        assert path.read_bytes() == mock.log(ids[0])
+        assert entry["bytes"] == len(mock.log(ids[0]))
+        path.write_bytes(path.read_bytes()[:1000])
+
+
+def test_download_gzip_appends(session, tmp_path):
+    """Test compressed logs, and appending only what was written since."""
+    identity = next(iter(mock.sessions))
+    entry = session.download_logs(identity, tmp_path, compression="gzip")[identity]
+    path = tmp_path / f"{identity}.log.gz"
+    assert entry["stored"] == path.stat().st_size < entry["bytes"]
+    mock.logs[identity] += b"appended\n"
+    entry = session.download_logs(identity, tmp_path, compression="gzip")[identity]
+    assert gzip.decompress(path.read_bytes()) == mock.log(identity)
+    assert entry["bytes"] == len(mock.log(identity))
+    # Nothing new, the server answers 416
+    session.download_logs(identity, tmp_path, compression="gzip")
+    assert gzip.decompress(path.read_bytes()) == mock.log(identity)
+
+
+def test_download_zstd(session, tmp_path):
+    """Test zstd compressed logs, if zstandard is installed."""
+    zstandard = pytest.importorskip("zstandard")
+    identity = next(iter(mock.sessions))
+    session.download_logs(identity, tmp_path, compression="zstd")
+    data = (tmp_path / f"{identity}.log.zst").read_bytes()
+    reader = zstandard.ZstdDecompressor().stream_reader(data, read_across_frames=True)
+    assert reader.read() == mock.log(identity)
+
+
+def test_download_unknown_compression(session, tmp_path):
+    """Test that unknown compressions are refused up front."""
+    with pytest.raises(ParameterError):
+        session.download_logs("a", tmp_path, compression="lzma")
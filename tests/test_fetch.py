@@ -0,0 +1,104 @@
+"""Test narrowed and incremental session listings."""
+
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from skaha.models import FetchSpec
+from skaha.session import AsyncSession, Session
+from skaha.utils.delta import diff
+
+from .conftest import mock
+
+SESSIONS = {
+    "a": {
+        "id": "a",
+        "userid": "alice",
+        "name": "job-1",
+        "status": "Running",
+        "startTime": "2024-01-01T00:00:00Z",
+    },
+    "b": {
+        "id": "b",
+        "userid": "alice",
+        "name": "notebook",
+        "status": "Running",
+        "startTime": "2024-03-01T00:00:00Z",
+    },
+    "c": {
+        "id": "c",
+        "userid": "bob",
+        "name": "job-2",
+        "status": "Pending",
+        "startTime": "2024-03-01T00:00:00Z",
+    },
+}
+
+
+def test_fetchspec_matches():
+    """Test client-side filtering of session records."""
+    spec = FetchSpec(user="alice", prefix="job-")
+    assert spec.matches(SESSIONS["a"])
+    assert not spec.matches(SESSIONS["b"])
+    assert not spec.matches(SESSIONS["c"])
+    spec = FetchSpec(since=datetime(2024, 2, 1))
+    assert spec.since.tzinfo is not None
+    assert [key for key, value in SESSIONS.items() if spec.matches(value)] == [
+        "b",
+        "c",
+    ]
+    with pytest.raises(ValidationError):
+        FetchSpec(since="yesterday")
+
+
+def test_fetch_filters_locally(stub, certificate):
+    """Test that filters apply even though the stub server ignores them."""
+    mock.sessions = {key: dict(value) for key, value in SESSIONS.items()}
+    session = Session(server=stub, certificate=certificate)
+    assert [s["id"] for s in session.fetch(user="alice")] == ["a", "b"]
+    assert [s["id"] for s in session.fetch(prefix="job-")] == ["a", "c"]
+    assert [s["id"] for s in session.fetch(since="2024-02-01T00:00:00Z")] == [
+        "b",
+        "c",
+    ]
+
+
+def test_diff():
+    """Test diffing of successive listings, with and without ids."""
+    before = [{"id": "a", "status": "Pending"}, {"id": "b", "status": "Running"}]
+    after = [{"id": "a", "status": "Running"}, {"id": "c", "status": "Pending"}]
+    delta = diff(before, after)
+    assert delta.added == [{"id": "c", "status": "Pending"}]
+    assert delta.removed == [{"id": "b", "status": "Running"}]
+    assert delta.changed == [{"id": "a", "status": "Running"}]
+    assert diff(after, after).empty
+    anonymous = [{"userid": "u", "type": "headless", "startTime": "t"}]
+    assert diff(anonymous, anonymous).empty
+
+
+def test_fetch_since(stub, certificate):
+    """Test incremental fetching against a changing cluster."""
+    mock.sessions = {key: dict(value) for key, value in SESSIONS.items()}
+    session = Session(server=stub, certificate=certificate)
+    delta = session.fetch_since([])
+    assert len(delta.added) == 3
+    mock.sessions["c"]["status"] = "Running"
+    del mock.sessions["a"]
+    delta = session.fetch_since(delta)
+    assert [s["id"] for s in delta.removed] == ["a"]
+    assert [s["id"] for s in delta.changed] == ["c"]
+    assert not delta.added
+    assert session.fetch_since(delta).empty
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_since(stub, certificate):
+    """Test incremental fetching with the asynchronous client."""
+    mock.sessions = {key: dict(value) for key, value in SESSIONS.items()}
+    async with AsyncSession(server=stub, certificate=certificate) as session:
+        delta = await session.fetch_since([], user="bob")
+        assert [s["id"] for s in delta.added] == ["c"]
+        mock.sessions["c"]["status"] = "Running"
+        delta = await session.fetch_since(delta, user="bob")
+        assert [s["id"] for s in delta.changed] == ["c"]
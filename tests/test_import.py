@@ -0,0 +1,47 @@
+"""Test that importing the package stays cheap."""
+
+import subprocess  # nosec: B404
+import sys
+
+# Budget for `import skaha`, in microseconds, as measured by -X importtime
+BUDGET = 50_000
+
+
+def importtime(statement: str) -> str:
+    """Run a statement in a fresh interpreter and return the importtime report."""
+    result = subprocess.run(  # nosec: B603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stderr
+
+
+def test_import_is_lazy():
+    """Test that no heavy dependency is imported with the package."""
+    statement = (
+        "import sys, skaha; "
+        "assert not {'pydantic', 'requests', 'httpx'} & set(sys.modules)"
+    )
+    importtime(statement)
+
+
+def test_import_budget():
+    """Test that the package import fits in the startup budget."""
+    report = importtime("import skaha")
+    cumulative = [
+        int(line.split("|")[1])
+        for line in report.splitlines()
+        if line.split("|")[-1].strip() == "skaha"
+    ]
+    assert cumulative and cumulative[0] < BUDGET
+
+
+def test_lazy_attributes():
+    """Test the lazily resolved version and submodules."""
+    import skaha
+
+    assert skaha.__version__ != "unknown"
+    assert skaha.models.KINDS
+    assert "session" in dir(skaha)
@@ -0,0 +1,78 @@
+"""Test the image index, tag resolution and image validation before launches."""
+
+import pytest
+
+from skaha.exceptions import ParameterError
+from skaha.images import Images
+from skaha.models import CreateSpec
+from skaha.session import Session
+from skaha.utils.index import ImageIndex, version
+
+from .conftest import mock
+
+TERMINAL = "images.canfar.net/skaha/terminal"
+RECORDS = [
+    {"id": f"{TERMINAL}:1.1.2", "types": ["headless"]},
+    {"id": f"{TERMINAL}:1.1.10", "types": ["headless"]},
+    {"id": f"{TERMINAL}:1.2.0-rc1", "types": ["headless"]},
+    {"id": f"{TERMINAL}:keep", "types": ["notebook"]},
+    {"id": "images.canfar.net/chimefrb/sample:latest", "types": ["headless"]},
+]
+
+
+def test_versions_and_resolution():
+    """Test version ordering, latest tags, prefix search and resolution."""
+    assert version("1.1.10") > version("1.1.2") > version("1.1")
+    assert version("2.0.0") > version("2.0.0-rc1") > version("1.9")
+    assert version("keep") is None
+    index = ImageIndex(RECORDS)
+    assert f"{TERMINAL}:1.1.2" in index and f"{TERMINAL}:1.1.3" not in index
+    assert index.tags(TERMINAL) == ["1.2.0-rc1", "1.1.10", "1.1.2", "keep"]
+    assert index.latest(TERMINAL).tag == "1.1.10"
+    assert ImageIndex(RECORDS[2:3]).latest(TERMINAL).tag == "1.2.0-rc1"
+    assert index.latest(TERMINAL, kind="notebook") is None
+    assert index.resolve(TERMINAL) == f"{TERMINAL}:1.1.10"
+    assert index.resolve("images.canfar.net/chimefrb/sample") == (
+        "images.canfar.net/chimefrb/sample:latest"
+    )
+    assert [image.tag for image in index.search(f"{TERMINAL}:1.1")] == [
+        "1.1.10",
+        "1.1.2",
+    ]
+    assert len(index.search("images.canfar.net/", project="chimefrb")) == 1
+    assert len(index.search(kind="notebook")) == 1
+    with pytest.raises(ParameterError, match="available tags: 1.2.0-rc1"):
+        index.resolve(f"{TERMINAL}:9.9")
+
+
+def test_incremental_refresh():
+    """Test that only added, removed and changed images are re-indexed."""
+    index = ImageIndex(RECORDS)
+    records = RECORDS[1:] + [{"id": f"{TERMINAL}:1.3.0", "types": ["headless"]}]
+    records[-2] = {**records[-2], "digest": "sha256:0"}
+    delta = index.update(records)
+    assert [record["id"] for record in delta.added] == [f"{TERMINAL}:1.3.0"]
+    assert [record["id"] for record in delta.removed] == [f"{TERMINAL}:1.1.2"]
+    assert len(delta.changed) == 1
+    assert index.get("images.canfar.net/chimefrb/sample:latest").digest == "sha256:0"
+    assert index.latest(TERMINAL).tag == "1.3.0"
+    assert index.update(records).empty
+    assert index.summary() == {"images": 5, "repositories": 2, "projects": 2}
+
+
+def test_catalog_validates_before_launch(stub, certificate):
+    """Test indexing the mock catalog and refusing unknown images up front."""
+    mock.reset()
+    catalog = Images(server=stub, certificate=certificate).index()
+    assert catalog.get(f"{TERMINAL}:1.1.2").types == ("headless", "notebook")
+    session = Session(server=stub, certificate=certificate, catalog=catalog)
+    with pytest.raises(ParameterError, match="1.1.9"):
+        session.create(name="bad", image=f"{TERMINAL}:1.1.9", replicas=100)
+    specs = [
+        CreateSpec(name="ok", image=f"{TERMINAL}:1.1.2", kind="headless", env={}),
+        CreateSpec(name="bad", image=f"{TERMINAL}:0.1", kind="headless", env={}),
+    ]
+    with pytest.raises(ParameterError, match="0.1"):
+        session.create_many(specs)
+    assert not mock.sessions
+    assert len(session.create(name="ok", image=f"{TERMINAL}:1.1.2")) == 1
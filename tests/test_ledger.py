@@ -0,0 +1,131 @@
+"""Test the persistent ledger of launched sessions and resumable sweeps."""
+
+import pytest
+from requests import Response
+from requests.exceptions import HTTPError, Timeout
+
+from skaha.models import CreateSpec
+from skaha.scheduler import Scheduler
+from skaha.session import Session
+from skaha.utils.ledger import Ledger
+
+from .conftest import mock
+
+IMAGE = "images.canfar.net/skaha/terminal:1.1.2"
+
+
+@pytest.fixture
+def session(stub, certificate, tmp_path):
+    """Session against the mock, recording into a ledger file."""
+    mock.reset()
+    with Ledger(tmp_path / "ledger.db") as ledger:
+        yield Session(server=stub, certificate=certificate, ledger=ledger)
+
+
+def test_ledger_records_lifecycle(tmp_path):
+    """Test requests, launches, transitions, logs and persistence."""
+    path = tmp_path / "ledger.db"
+    with Ledger(path) as ledger:
+        ledger.request("fft", ["fft-1", "fft-2"])
+        ledger.launched("fft", "fft-1", "a")
+        response = Response()
+        response.status_code = 503
+        ledger.launched("fft", "fft-2", None, HTTPError("busy", response=response))
+        assert ledger.observe([{"id": "a", "status": "Running"}]) == 1
+        assert ledger.observe([{"id": "a", "status": "Running"}]) == 0
+        ledger.locate("a", tmp_path / "a.log")
+        ledger.destroyed("a")
+        ledger.observe([{"id": "a", "status": "Running"}])
+    with Ledger(path) as ledger:
+        assert ledger.replicas("fft") == {"fft-1": "a"}
+        assert ledger.count("fft") == {"Destroyed": 1, "Failed": 1}
+        failed = ledger.sessions(status="Failed")
+        assert [row["name"] for row in failed] == ["fft-2"]
+        assert failed[0]["error"] == "HTTPError: busy"
+        assert ledger.sessions("fft")[0]["logs"] == str(tmp_path / "a.log")
+        kinds = [event["kind"] for event in ledger.history("a")]
+        assert kinds == ["create", "launched", "status", "logs", "status"]
+        ledger.forget("fft")
+        assert ledger.sessions() == []
+        with pytest.raises(ValueError, match="unknown ledger column"):
+            ledger._update(failed[0], "id = NULL, status", "x", 0.0)
+
+
+def test_create_resumes_sweep(session):
+    """Test that running a sweep again only launches the missing replicas."""
+    mock.failures["sweep-2"] = 1
+    first = session.create(name="sweep", image=IMAGE, replicas=3)
+    assert len(first) == 2
+    assert session.ledger.count("sweep") == {"Requested": 2, "Failed": 1}
+    second = session.create(name="sweep", image=IMAGE, replicas=3)
+    assert len(second) == 3 and set(first) < set(second)
+    assert len(mock.sessions) == 3
+    session.fetch()
+    assert session.ledger.count("sweep") == {"Running": 3}
+    session.destroy(second[0])
+    assert session.ledger.count("sweep") == {"Running": 2, "Destroyed": 1}
+
+
+def test_unanswered_requests_are_adopted(session):
+    """Test that sessions created by unanswered requests are not launched twice."""
+    session.ledger.request("job", ["job-1", "job-2"])
+    identity = mock.identity()
+    mock.sessions[identity] = mock.record(identity, "job-1", "headless")
+    ids = session.create(name="job", image=IMAGE, replicas=2)
+    assert ids[0] == identity and len(mock.sessions) == 2
+    assert session.ledger.history(identity)[-1]["kind"] == "status"
+
+
+def test_earlier_sessions_are_not_adopted(session):
+    """Test that a session started before the request is not adopted."""
+    session.ledger.request("old", ["old-1"])
+    identity = mock.identity()
+    mock.sessions[identity] = mock.record(identity, "old-1", "headless")
+    mock.sessions[identity]["startTime"] = "2020-01-01T00:00:00Z"
+    ids = session.create(name="old", image=IMAGE)
+    assert identity not in ids and len(mock.sessions) == 2
+
+
+def test_timed_out_requests_are_adopted(session, monkeypatch):
+    """Test that a create request without a response is not recorded as failed."""
+    post = session.session.post
+
+    def lost(url, params, **kwargs):
+        response = post(url, params=params, **kwargs)
+        if ("name", "lost-2") in params:
+            raise Timeout("read timed out")
+        return response
+
+    monkeypatch.setattr(session.session, "post", lost)
+    assert len(session.create(name="lost", image=IMAGE, replicas=2)) == 1
+    [row] = session.ledger.sessions(status="Requested", sweep="lost")[1:]
+    assert row["id"] is None and row["error"] == "Timeout: read timed out"
+    monkeypatch.undo()
+    assert len(session.create(name="lost", image=IMAGE, replicas=2)) == 2
+    assert len(mock.sessions) == 2
+
+
+def test_scheduler_adopts_unanswered_requests(session):
+    """Test that the scheduler does not queue replicas created unanswered."""
+    session.ledger.request("sched", ["sched-1", "sched-2"])
+    identity = mock.identity()
+    mock.sessions[identity] = mock.record(identity, "sched-1", "headless")
+    scheduler = Scheduler(session)
+    scheduler.submit(
+        [CreateSpec(name="sched", image=IMAGE, kind="headless", env={}, replicas=2)]
+    )
+    assert [name for _, name, _ in scheduler.queue] == ["sched-2"]
+    assert scheduler.active == [identity]
+
+
+def test_create_many_resumes(session):
+    """Test that resumed replicas are reported without any attempts."""
+    spec = CreateSpec(name="many", image=IMAGE, kind="headless", env={}, replicas=2)
+    session.create_many([spec])
+    launches = session.create_many([spec.model_copy(update={"replicas": 3})])
+    assert [(launch.name, launch.attempts) for launch in launches] == [
+        ("many-1", 0),
+        ("many-2", 0),
+        ("many-3", 1),
+    ]
+    assert len(mock.sessions) == 3
@@ -0,0 +1,64 @@
+"""Test validating session resources against the sizes offered by the server."""
+
+import pytest
+
+from skaha.exceptions import ParameterError
+from skaha.models import CreateSpec
+from skaha.session import AsyncSession, Session
+from skaha.utils.limits import Limits, nearest
+from skaha.utils.mock import CONTEXT
+
+from .conftest import mock
+
+IMAGE = "images.canfar.net/skaha/terminal:1.1.2"
+
+
+def test_limits_check_and_snap():
+    """Test parsing the context, reporting and snapping invalid sizes."""
+    limits = Limits.parse(CONTEXT)
+    assert limits.ram == (1, 2, 4, 8, 16, 32, 64, 128, 192)
+    assert (nearest(3, limits.cores), nearest(12, limits.cores)) == (4, 16)
+    assert nearest(100, limits.ram) == 128 and nearest(500, limits.ram) == 192
+    spec = CreateSpec(name="a", image=IMAGE, kind="headless", env={}, cores=3, ram=8)
+    assert limits.check(spec)[1] == ["a: cores=3 not in [1, 2, 4, 8, 16]"]
+    snapped, problems = limits.check(spec.model_copy(update={"gpus": 9}), snap=True)
+    assert (snapped.cores, snapped.ram, snapped.gpus, problems) == (4, 8, 4, [])
+    assert Limits().check(spec) == (spec, [])
+
+
+def test_strict_validation_before_launch(stub, certificate):
+    """Test that every problem is reported before any session is launched."""
+    mock.reset()
+    session = Session(server=stub, certificate=certificate, validation="strict")
+    with pytest.raises(ParameterError, match="ram=3 not in"):
+        session.create(name="bad", image=IMAGE, ram=3, replicas=256)
+    specs = [
+        CreateSpec(name="a", image=IMAGE, kind="headless", env={}, cores=3),
+        CreateSpec(name="b", image=IMAGE, kind="headless", env={}, ram=100),
+    ]
+    with pytest.raises(ParameterError, match="^2 problem") as error:
+        session.create_many(specs)
+    assert "a: cores=3" in str(error.value) and "b: ram=100" in str(error.value)
+    # The sizes were fetched once, and nothing was posted
+    assert not mock.sessions and mock.requests["total"] == 1
+    assert len(session.create(name="ok", image=IMAGE, cores=2, ram=4)) == 1
+
+
+def test_snap_validation(stub, certificate):
+    """Test that snapped sizes are sent to the server."""
+    mock.reset()
+    session = Session(server=stub, certificate=certificate, validation="snap")
+    identity = session.create(name="snap", image=IMAGE, cores=3, ram=100)[0]
+    record = mock.sessions[identity]
+    assert (record["requestedCPUCores"], record["requestedRAM"]) == ("4", "128G")
+
+
+@pytest.mark.asyncio
+async def test_async_validation(stub, certificate):
+    """Test strict validation with the asynchronous client."""
+    mock.reset()
+    session = AsyncSession(server=stub, certificate=certificate, validation="strict")
+    with pytest.raises(ParameterError):
+        await session.create(name="bad", image=IMAGE, cores=5, replicas=10)
+    assert not mock.sessions
+    assert (await session.limits()).cores == (1, 2, 4, 8, 16)
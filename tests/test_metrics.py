@@ -0,0 +1,109 @@
+"""Test request instrumentation."""
+
+import pytest
+from requests.exceptions import ConnectionError
+
+from skaha.session import AsyncSession, Session
+from skaha.utils.metrics import Histogram, Metrics, endpoint
+
+from .conftest import mock
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://ws-uv.canfar.net/skaha/v0/session", "session"),
+        ("https://ws-uv.canfar.net/skaha/v0/session/hjko98yghj", "session/{id}"),
+        ("https://ws-uv.canfar.net/skaha/v0/image?type=headless", "image"),
+        ("https://ws-uv.canfar.net/skaha/availability", "availability"),
+    ],
+)
+def test_endpoint(url, expected):
+    """Test that URLs are grouped into endpoints."""
+    assert endpoint(url) == expected
+
+
+def test_histogram():
+    """Test bucketing and quantile estimates."""
+    histogram = Histogram([0.1, 1.0])
+    for value in [0.05, 0.05, 0.5, 5.0]:
+        histogram.observe(value)
+    assert histogram.cumulative() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.99) == float("inf")
+
+
+def test_session_metrics(stub, certificate):
+    """Test per-endpoint latency, statuses and retries of a session."""
+    metrics = Metrics()
+    session = Session(server=stub, certificate=certificate, backoff=0, metrics=metrics)
+    mock.sessions = {"a": {"id": "a"}, "b": {"id": "b"}}
+    mock.faults = [503]
+    session.info(["a", "b", "missing"])
+    summary = metrics.summary()["GET session/{id}"]
+    assert summary["count"] == 4
+    assert summary["retries"] == 1
+    assert summary["statuses"] == {200: 2, 404: 1, 503: 1}
+    assert not any(metrics.inflight.values())
+    text = metrics.prometheus()
+    assert 'skaha_request_seconds_count{method="GET",endpoint="session/{id}"} 4' in text
+    assert (
+        'skaha_requests_total{method="GET",endpoint="session/{id}",status="404"} 1'
+        in text
+    )
+    assert 'skaha_request_retries_total{method="GET",endpoint="session/{id}"} 1' in text
+    metrics.reset()
+    assert metrics.summary() == {}
+
+
+def test_connection_errors_are_counted(certificate):
+    """Test that failed attempts are counted by exception type."""
+    metrics = Metrics()
+    session = Session(
+        server="http://127.0.0.1:9/skaha",
+        certificate=certificate,
+        retries=0,
+        metrics=metrics,
+    )
+    with pytest.raises(ConnectionError):
+        session.stats()
+    assert list(metrics.errors.values()) == [1]
+    assert metrics.summary()["GET session"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_async_metrics(stub, certificate):
+    """Test that the async transport records into the same registry."""
+    metrics = Metrics()
+    async with AsyncSession(
+        server=stub, certificate=certificate, metrics=metrics
+    ) as session:
+        await session.stats()
+    assert metrics.summary()["GET session"]["statuses"] == {200: 1}
+
+
+def test_bytes_are_counted_as_read(stub, certificate):
+    """Test that streamed bodies and query strings are counted."""
+    metrics = Metrics()
+    session = Session(server=stub, certificate=certificate, metrics=metrics)
+    mock.sessions["s"] = {"id": "s", "status": "Succeeded"}
+    mock.logs["s"] = b"line\n" * 1000
+    assert len(list(session.stream_logs("s", follow=False))) == 1000
+    assert metrics.received[("GET", "session/{id}")] == 5000
+    assert metrics.sent[("GET", "session/{id}")] == len("view=logs")
+    session.create(name="bytes", image="images.canfar.net/skaha/x:1")
+    assert metrics.sent[("POST", "session")] > len("name=bytes")
+
+
+@pytest.mark.asyncio
+async def test_async_bytes_are_counted_as_read(stub, certificate):
+    """Test that the async transport counts the bodies read."""
+    metrics = Metrics()
+    mock.sessions["t"] = {"id": "t", "status": "Succeeded"}
+    mock.logs["t"] = b"line\n" * 1000
+    async with AsyncSession(
+        server=stub, certificate=certificate, metrics=metrics
+    ) as session:
+        lines = [line async for line in session.stream_logs("t", follow=False)]
+    assert len(lines) == 1000
+    assert metrics.received[("GET", "session/{id}")] == 5000
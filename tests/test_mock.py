@@ -0,0 +1,34 @@
+"""Test the bundled mock Skaha server."""
+
+import requests
+
+from skaha.utils.mock import MockServer
+
+
+def test_mock_payloads():
+    """Test generated sessions, catalog and logs."""
+    with MockServer(images=3, log_size=1000) as mock:
+        ids = mock.populate(100)
+        assert len(set(ids)) == 100
+        sessions = requests.get(f"{mock.url}/v0/session", timeout=5).json()
+        assert {session["id"] for session in sessions} == set(ids)
+        assert len(requests.get(f"{mock.url}/v0/image", timeout=5).json()) == 3
+        logs = requests.get(
+            f"{mock.url}/v0/session/{ids[0]}", params={"view": "logs"}, timeout=5
+        )
+        assert len(logs.content) >= 1000
+
+
+def test_mock_is_deterministic():
+    """Test that injected errors and IDs repeat for the same seed."""
+    outcomes = []
+    for _ in range(2):
+        with MockServer(error_rate=0.3, seed=42) as mock:
+            ids = mock.populate(3)
+            codes = [
+                requests.get(f"{mock.url}/v0/context", timeout=5).status_code
+                for _ in range(20)
+            ]
+            outcomes.append((ids, codes))
+    assert outcomes[0] == outcomes[1]
+    assert 503 in outcomes[0][1] and 200 in outcomes[0][1]
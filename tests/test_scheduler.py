@@ -0,0 +1,141 @@
+"""Test the capacity-aware launch scheduler against a local mock server."""
+
+import pytest
+
+from skaha.exceptions import ParameterError
+from skaha.models import CreateSpec
+from skaha.scheduler import Quota, Scheduler, Usage, fit
+from skaha.session import Session
+
+from .conftest import mock
+
+IMAGE = "images.canfar.net/skaha/terminal:1.1.2"
+
+
+@pytest.fixture
+def session(stub, certificate):
+    """Session against the mock, with sessions succeeding after 50ms."""
+    mock.reset()
+    mock.lifetime, mock.cores = 0.05, 8
+    yield Session(server=stub, certificate=certificate)
+    mock.lifetime, mock.cores = None, 960
+
+
+def spec(replicas: int, cores: int = 3, ram: int = 6) -> CreateSpec:
+    """Headless job specification."""
+    return CreateSpec(
+        name="fft",
+        image=IMAGE,
+        cores=cores,
+        ram=ram,
+        kind="headless",
+        cmd="fft",
+        env={},
+        replicas=replicas,
+    )
+
+
+def test_fit():
+    """Test rounding up to offered sizes."""
+    assert fit(3, [1, 2, 4, 8]) == 4
+    assert fit(4, [8, 4]) == 4
+    assert fit(5, []) == 5
+    with pytest.raises(ParameterError):
+        fit(9, [1, 2, 4, 8])
+
+
+def test_usage_within_quota():
+    """Test that every limit of the quota is enforced, unset ones ignored."""
+    usage = Usage().add(spec(1, cores=4, ram=8))
+    assert usage == Usage(1, 4, 8)
+    assert usage.within(Quota())
+    assert usage.within(Quota(sessions=1, cores=4, ram=8))
+    assert not usage.add(spec(1, cores=1, ram=1)).within(Quota(sessions=1))
+    assert not usage.within(Quota(ram=4))
+
+
+def test_submit_packs_jobs(session):
+    """Test that jobs are rounded up to valid sizes, and oversized ones refused."""
+    scheduler = Scheduler(session)
+    scheduler.submit([spec(2)])
+    assert [(job.cores, job.ram) for job, _, _ in scheduler.queue] == [(4, 8)] * 2
+    assert [name for _, name, _ in scheduler.queue] == ["fft-1", "fft-2"]
+    with pytest.raises(ParameterError):
+        scheduler.submit([spec(1, cores=32)])
+    with pytest.raises(ParameterError):
+        Scheduler(session, quota=Quota(cores=2)).submit([spec(1)])
+
+
+def test_run_within_capacity(session):
+    """Test that no more jobs run than the cluster cores allow."""
+    scheduler = Scheduler(session, interval=0.01)
+    peak = 0
+    step = scheduler.step
+
+    def tracked():
+        nonlocal peak
+        launches = step()
+        mock.expire()
+        running = [
+            item for item in mock.sessions.values() if item["status"] == "Running"
+        ]
+        peak = max(peak, len(running))
+        return launches
+
+    scheduler.step = tracked  # type: ignore
+    launches = scheduler.run([spec(5)], timeout=10)
+    assert peak == 2
+    assert all(launch.ok for launch in launches)
+    assert sorted(launch.name for launch in launches) == [
+        f"fft-{index}" for index in range(1, 6)
+    ]
+    assert set(scheduler.statuses.values()) == {"Succeeded"}
+    assert scheduler.done
+
+
+def test_quota_and_backfill(session):
+    """Test per-user quotas, counting foreign sessions, and backfilling."""
+    mock.cores = 960
+    mock.populate(1)
+    scheduler = Scheduler(
+        session, quota=Quota(sessions=3, cores=9), backfill=True, interval=0.01
+    )
+    scheduler.submit([spec(2, cores=4), spec(2, cores=1)])
+    free, usage = scheduler.refresh()
+    assert usage == Usage(1, 2, 16)
+    admitted = scheduler.admit(free, usage)
+    # 2 + 4 cores, then fft-2 with 4 more would exceed 9, a 1 core job fits
+    assert [(job.cores, name) for job, name, _ in admitted] == [
+        (4, "fft-1"),
+        (1, "fft-1"),
+    ]
+    assert [name for _, name, _ in scheduler.queue] == ["fft-2", "fft-2"]
+    scheduler.backfill = False
+    scheduler.queue.appendleft(admitted[0])
+    assert len(scheduler.admit(free, Usage(1, 6, 16))) == 0
+
+
+def test_unlisted_launches_are_held(session):
+    """Test that a launch missing from the listing keeps its resources held."""
+    mock.lifetime = None
+    scheduler = Scheduler(session, quota=Quota(sessions=1), grace=60)
+    scheduler.submit([spec(2)])
+    [launch] = scheduler.step()
+    # The server does not list the new session yet
+    listed = mock.sessions.pop(launch.id)
+    assert scheduler.step() == []
+    assert scheduler.statuses[launch.id] == "Pending"
+    _, usage = scheduler.refresh()
+    assert usage == Usage(1, 4, 8)
+    # Once listed and then removed, the session is finished at once
+    mock.sessions[launch.id] = listed
+    scheduler.refresh()
+    del mock.sessions[launch.id]
+    scheduler.refresh()
+    assert scheduler.statuses[launch.id] == "Error"
+    # Never listed within the grace period
+    [other] = scheduler.step()
+    mock.sessions.pop(other.id)
+    scheduler.grace = 0
+    scheduler.refresh()
+    assert scheduler.statuses[other.id] == "Error"
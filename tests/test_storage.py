@@ -0,0 +1,68 @@
+"""Test parallel staging against a local stand-in for VOSpace."""
+
+import pytest
+
+from skaha.exceptions import ParameterError
+from skaha.storage import Backend, LocalBackend, Storage, md5, tree
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    """Local directory with nested input files."""
+    root = tmp_path / "inputs"
+    (root / "beams").mkdir(parents=True)
+    for index in range(6):
+        (root / "beams" / f"{index}.dat").write_bytes(bytes([index]) * 5000)
+    (root / "config.yaml").write_text("nsub: 16\n")
+    return root
+
+
+def test_upload_skips_unchanged_files(inputs, tmp_path):
+    """Test parallel chunked uploads, checksum skips and the report."""
+    progress = []
+    backend = LocalBackend(tmp_path / "vospace", chunk=1024)
+    storage = Storage(backend, concurrency=3, chunk=1024, progress=progress.append)
+    files = tree(inputs, "vos:user/run/inputs")
+    assert files[inputs / "beams" / "2.dat"] == "vos:user/run/inputs/beams/2.dat"
+    report = storage.upload(files)
+    assert report.ok and len(progress) == 7
+    assert report.summary()["transferred"] == 7
+    assert report.bytes == 6 * 5000 + 9
+    remote = tmp_path / "vospace" / "user" / "run" / "inputs" / "beams" / "5.dat"
+    assert remote.read_bytes() == bytes([5]) * 5000
+
+    (inputs / "beams" / "5.dat").write_bytes(b"changed")
+    report = storage.upload(files)
+    summary = report.summary()
+    assert (summary["transferred"], summary["skipped"]) == (1, 6)
+    assert report.bytes == 7 and remote.read_bytes() == b"changed"
+
+
+def test_backend_is_abstract():
+    """Test that backends must implement every operation."""
+    with pytest.raises(TypeError):
+        Backend()
+
+
+def test_download_and_failures(inputs, tmp_path):
+    """Test downloads, skips of identical local copies and failed files."""
+    backend = LocalBackend(tmp_path / "vospace")
+    storage = Storage(backend, chunk=1000)
+    storage.upload(tree(inputs, "vos:user/in"))
+    output = tmp_path / "output"
+    files = {
+        "vos:user/in/beams/1.dat": output / "1.dat",
+        "vos:user/in/missing.dat": output / "missing.dat",
+    }
+    report = storage.download(files)
+    assert not report.ok
+    assert [transfer.source for transfer in report.failed] == [
+        "vos:user/in/missing.dat"
+    ]
+    with pytest.raises(FileNotFoundError):
+        report.raise_for_errors()
+    assert md5(output / "1.dat") == md5(inputs / "beams" / "1.dat")
+    report = storage.download({"vos:user/in/beams/1.dat": output / "1.dat"})
+    assert report.summary()["skipped"] == 1
+    with pytest.raises(ParameterError):
+        backend.path("vos:../../etc/passwd")
@@ -0,0 +1,117 @@
+"""Test parameter sweeps from grids, rows and files."""
+
+import csv
+import json
+
+import pytest
+
+from skaha.exceptions import ParameterError
+from skaha.models import CreateSpec
+from skaha.session import Session, payloads
+from skaha.sweep import Grid, Sweep, count, rows
+
+from .conftest import mock
+
+IMAGE = "images.canfar.net/skaha/terminal:1.1.2"
+TEMPLATE = CreateSpec(
+    name="fft",
+    image=IMAGE,
+    kind="headless",
+    cmd="fft",
+    args="--beam {beam} --dm {dm}",
+    env={"OUT": "out/{index}.h5", "MODE": "fast"},
+)
+
+
+def env(params):
+    """Environment variables of a payload."""
+    return dict(value.split("=", 1) for key, value in params if key == "env")
+
+
+def test_grid_and_rows(tmp_path):
+    """Test grids, CSV files and counting rows."""
+    grid = Grid(beam=range(3), dm=[100, 200])
+    assert len(grid) == 6 and list(grid)[1] == {"beam": 0, "dm": 200}
+    path = tmp_path / "rows.csv"
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, ["beam", "dm"])
+        writer.writeheader()
+        writer.writerows(grid)
+    assert next(rows(path)) == {"beam": "0", "dm": "100"}
+    assert count(path) == 6 and count(iter(grid)) is None
+    with pytest.raises(ParameterError):
+        count(tmp_path / "rows.txt")
+
+
+def test_one_row_per_session():
+    """Test per-replica arguments and environment formatted from each row."""
+    sweep = Sweep(TEMPLATE, Grid(beam=range(3), dm=[100, 200]), per=1)
+    assert (len(sweep), sweep.count, sweep.single) == (6, 6, True)
+    [(spec, overrides)] = list(sweep.parts())
+    assert (spec.name, spec.replicas) == ("fft", 6)
+    name, params = list(payloads(spec, overrides))[3]
+    assert name == "fft-4" and ("args", "--beam 1 --dm 200") in params
+    variables = env(params)
+    assert variables["OUT"] == "out/3.h5" and variables["MODE"] == "fast"
+    assert (variables["SWEEP_START"], variables["SWEEP_STOP"]) == ("3", "4")
+    assert json.loads(variables["SWEEP_ROWS"]) == [{"beam": 1, "dm": 200}]
+
+
+def test_chunked_rows_over_parts():
+    """Test 100k rows chunked over sessions split into parts of 256 replicas."""
+    template = TEMPLATE.model_copy(
+        update={"args": "--rows {start}:{stop}", "env": {"PART": "{job}"}}
+    )
+    grid = Grid(beam=range(1000), dm=range(100))
+    sweep = Sweep(template, grid, sessions=300, embed=False)
+    assert (sweep.per, sweep.count, sweep.single) == (334, 300, False)
+    parts = list(sweep.parts())
+    assert [(spec.name, spec.replicas) for spec, _ in parts] == [
+        ("fft-1", 256),
+        ("fft-2", 44),
+    ]
+    last = parts[1][1][-1]
+    assert last["args"] == "--rows 99866:100000" and last["env"]["PART"] == "300"
+    assert last["env"]["SWEEP_START"] == 99866 and "SWEEP_ROWS" not in last["env"]
+    unembedded = Sweep(template, iter(Grid(beam=range(10))), per=4, embed=False)
+    assert unembedded.count is None and not unembedded.single
+    jobs = list(unembedded.jobs())
+    assert len(jobs) == 3 and "SWEEP_ROWS" not in jobs[0]["env"]
+
+
+def test_embedded_rows_are_limited():
+    """Test that chunks too large for the request URL are refused."""
+    template = TEMPLATE.model_copy(update={"args": None, "env": {}})
+    grid = Grid(beam=range(1000), dm=range(100))
+    rows = next(Sweep(template, grid, per=100).jobs())["env"]["SWEEP_ROWS"]
+    assert len(json.loads(rows)) == 100
+    with pytest.raises(ParameterError, match="SWEEP_ROWS"):
+        next(Sweep(template, grid, per=1000).jobs())
+    jobs = Sweep(template, grid, per=1000, embed=False).jobs()
+    assert next(jobs)["env"] == {"SWEEP_START": 0, "SWEEP_STOP": 1000}
+
+
+def test_sweep_errors():
+    """Test unknown lengths without `per`, invalid `per` and undefined fields."""
+    with pytest.raises(ParameterError, match="require `per`"):
+        Sweep(TEMPLATE, iter([{"beam": 1}]))
+    with pytest.raises(ParameterError, match="per must be at least 1"):
+        Sweep(TEMPLATE, [{"beam": 1}], per=0)
+    sweep = Sweep(TEMPLATE, [{"beam": 1}], per=1)
+    with pytest.raises(ParameterError, match="undefined sweep field 'dm'"):
+        list(sweep.jobs())
+
+
+def test_session_sweep(stub, certificate):
+    """Test launching a sweep against the mock, one session per chunk of rows."""
+    mock.reset()
+    session = Session(server=stub, certificate=certificate)
+    template = TEMPLATE.model_copy(update={"args": "--rows {start}:{stop}", "env": {}})
+    with pytest.raises(ParameterError):
+        session.sweep(Sweep(TEMPLATE, Grid(beam=range(30)), sessions=10))
+    assert not mock.sessions
+    sweep = Sweep(template, Grid(beam=range(30), dm=[100, 200]), sessions=20)
+    ids = session.sweep(sweep)
+    assert len(ids) == len(mock.sessions) == 20
+    variables = dict(value.split("=", 1) for value in mock.sessions[ids[-1]]["env"])
+    assert (variables["SWEEP_START"], variables["SWEEP_STOP"]) == ("57", "60")
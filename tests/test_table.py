@@ -0,0 +1,87 @@
+"""Test typed session tables."""
+
+import math
+
+import pytest
+
+from skaha.session import Session
+from skaha.utils.table import SessionTable, cores, memory, timestamp
+
+from .conftest import mock
+
+RECORDS = [
+    {
+        "id": "a",
+        "userid": "alice",
+        "type": "notebook",
+        "status": "Running",
+        "startTime": "2222-12-14T02:24:06Z",
+        "requestedRAM": "16G",
+        "requestedCPUCores": "2",
+        "requestedGPUCores": "<none>",
+        "coresInUse": "250m",
+        "ramInUse": "101Mi",
+    },
+    {"id": "b", "userid": "alice", "type": "headless", "status": "Pending"},
+    {
+        "id": "c",
+        "userid": "bob",
+        "type": "headless",
+        "status": "Running",
+        "requestedRAM": "1Gi",
+        "requestedCPUCores": "4",
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "parse,value,expected",
+    [
+        (cores, "2", 2.0),
+        (cores, "0m", 0.0),
+        (cores, "1500m", 1.5),
+        (memory, "16G", 16e9),
+        (memory, "101Mi", 101 * 2**20),
+        (memory, "147Gi", 147 * 2**30),
+        (timestamp, "1970-01-01T00:01:00Z", 60.0),
+    ],
+)
+def test_units(parse, value, expected):
+    """Test parsing of resource units and timestamps."""
+    assert parse(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("parse", [cores, memory, timestamp])
+@pytest.mark.parametrize("value", [None, "", "<none>", "lots"])
+def test_unknown_units(parse, value):
+    """Test that missing or unparsable values become NaN."""
+    assert math.isnan(parse(value))
+
+
+def test_filter_group_and_sum():
+    """Test filtering, grouping and aggregation."""
+    table = SessionTable.from_records(RECORDS)
+    assert len(table) == 3
+    assert table.count("user") == {"alice": 2, "bob": 1}
+    assert list(table.filter(user="alice", status="Running")["id"]) == ["a"]
+    assert list(table.filter(type={"notebook", "headless"})["id"]) == ["a", "b", "c"]
+    assert list(table.filter(lambda row: row.cores > 3)["id"]) == ["c"]
+    seen = []
+    table.filter(lambda row: seen.append(row.id) or True, user="bob")
+    assert seen == ["c"]
+    assert {key: len(group) for key, group in table.groupby("status").items()} == {
+        "Running": 2,
+        "Pending": 1,
+    }
+    assert table.sum("cores") == 6.0
+    assert table.sum("cores", by="user") == {"alice": 2.0, "bob": 4.0}
+    row = next(iter(table))
+    assert row.ram == 16e9 and row.cores_in_use == 0.25
+    assert table.to_records()[1]["name"] == ""
+
+
+def test_session_table(stub, certificate):
+    """Test fetching sessions as a table."""
+    mock.sessions = {record["id"]: record for record in RECORDS}
+    table = Session(server=stub, certificate=certificate).table(view="all")
+    assert table.count("status") == {"Running": 2, "Pending": 1}
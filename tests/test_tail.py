@@ -0,0 +1,115 @@
+"""Test incremental log tailing against a local stub server."""
+
+import httpx
+import pytest
+from requests.exceptions import ConnectionError
+
+from skaha.session import AsyncSession, Session
+from skaha.utils.tail import Cursor, Retry
+
+from .conftest import mock
+
+
+def test_cursor_skips_seen_bytes():
+    """Test that a cursor skips the consumed prefix of a full response."""
+    cursor = Cursor()
+    cursor.begin(partial=False)
+    assert cursor.feed(b"one\ntw") == ["one"]
+    assert cursor.feed(b"o\n") == ["two"]
+    assert cursor.headers == {"Range": "bytes=8-"}
+    cursor.begin(partial=False)
+    assert cursor.feed(b"one\ntwo\nthr") == []
+    assert cursor.flush() == ["thr"]
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_stream_logs_incremental(stub, certificate, ranges):
+    """Test that subsequent polls only yield new lines."""
+    mock.ranges = ranges
+    session = Session(server=stub, certificate=certificate)
+    mock.sessions["abc"] = {"id": "abc", "status": "Running"}
+    mock.logs["abc"] = b"one\ntwo\n"
+    assert list(session.stream_logs("abc", follow=False)) == [
+        ("abc", "one"),
+        ("abc", "two"),
+    ]
+    mock.logs["abc"] += b"three\n"
+    assert list(session.stream_logs("abc", follow=False)) == [("abc", "three")]
+    assert list(session.stream_logs("abc", follow=False)) == []
+
+
+def test_stream_logs_follow_multiplexes(stub, certificate):
+    """Test following several sessions until they finish."""
+    session = Session(server=stub, certificate=certificate)
+    mock.sessions["x"] = {"id": "x", "status": "Succeeded"}
+    mock.sessions["y"] = {"id": "y", "status": "Error"}
+    mock.logs["x"], mock.logs["y"] = b"x1\nx2", b"y1\n"
+    lines = list(session.stream_logs(["x", "y"], interval=0))
+    assert lines == [("x", "x1"), ("y", "y1"), ("x", "x2")]
+
+
+@pytest.mark.asyncio
+async def test_async_stream_logs(stub, certificate):
+    """Test the async log iterator."""
+    mock.sessions["z"] = {"id": "z", "status": "Succeeded"}
+    mock.logs["z"] = b"a\nb\n"
+    async with AsyncSession(server=stub, certificate=certificate) as session:
+        lines = [line async for line in session.stream_logs(["z", "gone"], interval=0)]
+        assert lines == [("z", "a"), ("z", "b")]
+        mock.logs["z"] += b"c\n"
+        lines = [line async for line in session.stream_logs("z", follow=False)]
+        assert lines == [("z", "c")]
+
+
+def test_retry_backs_off():
+    """Test that failed reads skip a growing number of polls."""
+    retry = Retry(limit=3)
+    retry.failed("a")
+    assert retry.due("a") and retry.pending("a")
+    retry.failed("a")
+    assert not retry.due("a")
+    assert retry.due("a")
+    retry.failed("a")
+    assert not retry.pending("a")
+    retry.succeeded("a")
+    assert retry.due("a") and not retry.pending("a")
+
+
+def test_stream_logs_retries_failed_session(stub, certificate, monkeypatch):
+    """Test that a connection error on one session does not stop the others."""
+    session = Session(server=stub, certificate=certificate)
+    mock.sessions["x"] = {"id": "x", "status": "Succeeded"}
+    mock.sessions["y"] = {"id": "y", "status": "Succeeded"}
+    mock.logs["x"], mock.logs["y"] = b"x1\nx2\n", b"y1\n"
+    get, calls = session.session.get, []
+
+    def flaky(url, **kwargs):
+        calls.append(url)
+        if url.endswith("/x") and len(calls) == 1:
+            raise ConnectionError("connection reset")
+        return get(url, **kwargs)
+
+    monkeypatch.setattr(session.session, "get", flaky)
+    lines = list(session.stream_logs(["x", "y"], follow=False, interval=0))
+    assert lines == [("y", "y1"), ("x", "x1"), ("x", "x2")]
+
+
+@pytest.mark.asyncio
+async def test_async_stream_logs_retries_failed_session(stub, certificate):
+    """Test that a transport error on one session is retried."""
+    mock.sessions["z"] = {"id": "z", "status": "Succeeded"}
+    mock.logs["z"] = b"a\n"
+    async with AsyncSession(server=stub, certificate=certificate) as session:
+        client = session._async_client()
+        stream, calls = client.stream, []
+
+        def flaky(method, url, **kwargs):
+            calls.append(url)
+            if len(calls) == 1:
+                raise httpx.ConnectError("connection reset")
+            return stream(method, url, **kwargs)
+
+        client.stream = flaky
+        lines = [line async for line in session.stream_logs("z", interval=0)]
+        assert lines == [("z", "a")]
+        assert len(calls) == 2
@@ -1,3 +1,7 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from skaha.utils.threaded import scale
@@ -40,3 +44,58 @@ async def test_scale_with_error():
             assert isinstance(results[i], ValueError)
         else:
             assert results[i] == i**2
+
+
+@pytest.mark.asyncio
+async def test_scale_bounded_concurrency():
+    # Track the peak number of calls in flight
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def work(x: int) -> int:
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return x
+
+    arguments = [{"x": i} for i in range(50)]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = await scale(work, arguments, concurrency=4, executor=executor)
+    assert results == list(range(50))
+    assert state["peak"] <= 4
+
+
+@pytest.mark.asyncio
+async def test_scale_rate_limit():
+    # 11 calls at 100/s take at least 100ms
+    start = time.monotonic()
+    await scale(lambda x: x, [{"x": i} for i in range(11)], rate=100)
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_scale_consumes_generators_lazily():
+    # At most `concurrency` arguments are drawn ahead of the completed calls
+    lock = threading.Lock()
+    state = {"drawn": 0, "done": 0, "ahead": 0}
+
+    def arguments():
+        for i in range(40):
+            with lock:
+                state["drawn"] += 1
+                state["ahead"] = max(state["ahead"], state["drawn"] - state["done"])
+            yield {"x": i}
+
+    def work(x: int) -> int:
+        time.sleep(0.001)
+        with lock:
+            state["done"] += 1
+        return x
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = await scale(work, arguments(), concurrency=3, executor=executor)
+    assert results == list(range(40))
+    assert state["ahead"] <= 3
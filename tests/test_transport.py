@@ -0,0 +1,201 @@
+"""Test retries, timeouts and the circuit breaker of the HTTP transport."""
+
+import socket
+import threading
+import time
+
+import pytest
+from requests.exceptions import HTTPError
+
+from skaha.exceptions import ConnectionError, ServiceBusyError
+from skaha.overview import Overview, parse
+from skaha.session import AsyncSession, Session
+from skaha.utils.mock import AVAILABILITY
+from skaha.utils.transport import CircuitBreaker, Health, RetryPolicy
+
+from .conftest import mock
+
+
+def test_retry_policy_delays():
+    """Test jittered backoff, Retry-After and idempotency."""
+    policy = RetryPolicy(total=2, backoff=1.0, maximum=3.0)
+    assert 0 <= policy.delay(1) <= 1.0
+    assert 0 <= policy.delay(5) <= 3.0
+    assert policy.delay(1, "2") == 2.0
+    assert policy.delay(1, "Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert policy.attempts("GET") == 3
+    assert policy.attempts("POST") == 1
+
+
+def test_retries_transient_errors(stub, certificate):
+    """Test that idempotent calls are retried on 429 and 5xx."""
+    session = Session(server=stub, certificate=certificate, backoff=0)
+    mock.faults = [503, 429]
+    assert "instances" in session.stats()
+    mock.faults = [500] * 4
+    with pytest.raises(HTTPError):
+        session.stats()
+    mock.faults = []
+
+
+def test_breaker_opens_on_errors(stub, certificate):
+    """Test that an unhealthy server trips the breaker."""
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    session = Session(
+        server=stub, certificate=certificate, retries=2, backoff=0, breaker=breaker
+    )
+    mock.faults = [502] * 3
+    with pytest.raises(HTTPError):
+        session.stats()
+    assert breaker.open
+    with pytest.raises(ServiceBusyError):
+        session.stats()
+    breaker.cooldown = 0
+    assert "instances" in session.stats()
+    assert not breaker.open and breaker.failures == 0
+
+
+def test_breaker_half_open_trial():
+    """Test that a single trial is let through after the cooldown."""
+    breaker = CircuitBreaker(threshold=2, cooldown=60)
+    breaker.failure()
+    breaker.failure()
+    with pytest.raises(ServiceBusyError):
+        breaker.check()
+    breaker.opened -= 60
+    breaker.check()
+    with pytest.raises(ServiceBusyError):
+        breaker.check()
+    # A failed trial reopens the breaker at once
+    breaker.failure()
+    assert breaker.open and breaker.remaining > 59
+    breaker.opened -= 60
+    breaker.check()
+    assert breaker.open
+    breaker.success()
+    assert not breaker.open
+    breaker.check()
+    breaker.check()
+
+
+def test_breaker_opens_on_connection_errors(certificate):
+    """Test that an unreachable server fails fast with ConnectionError."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    session = Session(
+        server=f"http://127.0.0.1:{port}/skaha",
+        certificate=certificate,
+        retries=5,
+        backoff=0,
+        breaker=CircuitBreaker(threshold=2),
+    )
+    with pytest.raises(ConnectionError):
+        session.fetch()
+
+
+@pytest.mark.asyncio
+async def test_async_retries(stub, certificate):
+    """Test that the async transport retries and shares the breaker."""
+    async with AsyncSession(server=stub, certificate=certificate, backoff=0) as session:
+        mock.faults = [503]
+        assert "instances" in await session.stats()
+        session.breaker.failures = session.breaker.threshold
+        session.breaker.failure()
+        with pytest.raises(ServiceBusyError):
+            await session.stats()
+
+
+def test_health_guards_state_changes(stub, certificate):
+    """Test that creates and deletes fail fast while the backend is unavailable."""
+    mock.reset()
+    health = Health(ttl=60)
+    session = Session(server=stub, certificate=certificate, health=health)
+    mock.available = False
+    assert session.create(name="job", image="images.canfar.net/a/b:1") == []
+    assert session.destroy(["a", "b"]) == {"a": False, "b": False}
+    assert mock.requests["availability"] == 1
+    assert not mock.sessions and "instances" in session.stats()
+    mock.available = True
+    health.refresh()
+    assert len(session.create(name="job", image="images.canfar.net/a/b:1")) == 1
+    assert mock.requests["availability"] == 2
+
+
+def test_health_waits_and_probes_in_background(stub, certificate):
+    """Test waiting out a short outage, and background probing."""
+    mock.reset()
+    mock.available = False
+    calls = []
+
+    def probe():
+        calls.append(mock.available)
+        mock.available = True
+        return calls[-1]
+
+    health = Health(ttl=0.01, patience=1.0, probe=probe)
+    health.check()
+    assert calls == [False, True]
+    health = Health(ttl=60, interval=0.01)
+    overview = Overview(server=stub, certificate=certificate, health=health)
+    try:
+        assert overview.availaibility()
+        assert health.thread is not None
+        mock.available = False
+        for _ in range(100):
+            if health.status is False:
+                break
+            health.stopped.wait(0.01)
+        assert not overview.availaibility()
+        with pytest.raises(ServiceBusyError, match="unavailable"):
+            health.check()
+    finally:
+        health.stop()
+        mock.available = True
+
+
+def test_health_probes_once_for_concurrent_callers():
+    """Test that threads finding the result expired share a single probe."""
+    calls = []
+
+    def probe():
+        calls.append(1)
+        time.sleep(0.05)
+        return True
+
+    health = Health(ttl=60, probe=probe)
+    barrier = threading.Barrier(16)
+
+    def call():
+        barrier.wait()
+        assert health.available()
+
+    threads = [threading.Thread(target=call) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+
+
+def test_health_unreachable_and_parse():
+    """Test that unreachable backends are unavailable, and the VOSI parser."""
+    health = Health(probe=lambda: 1 / 0)
+    assert not health.available()
+    assert "ZeroDivisionError" in health.reason
+    assert parse(AVAILABILITY.format(available="true"))
+    assert not parse(AVAILABILITY.format(available="false"))
+
+
+@pytest.mark.asyncio
+async def test_async_health(stub, certificate):
+    """Test that the async transport checks the health without blocking."""
+    mock.reset()
+    mock.available = False
+    health = Health(ttl=60)
+    async with AsyncSession(
+        server=stub, certificate=certificate, health=health
+    ) as session:
+        assert await session.destroy("a") == {"a": False}
+        assert mock.requests["total"] == mock.requests["availability"] == 1
+    mock.available = True
@@ -0,0 +1,90 @@
+"""Test session status watching."""
+
+import pytest
+
+from skaha.session import AsyncSession, Session
+from skaha.utils.watch import Backoff, Watcher
+
+from .conftest import mock
+
+
+def test_backoff_grows_and_resets():
+    """Test the adaptive polling interval."""
+    backoff = Backoff(1.0, 5.0)
+    assert [backoff.next(False) for _ in range(4)] == [2.0, 4.0, 5.0, 5.0]
+    assert backoff.next(True) == 1.0
+
+
+def test_watcher_reports_only_transitions():
+    """Test diffing of successive snapshots."""
+    watcher = Watcher(["a", "b", "c"], until=["Succeeded"], grace=1)
+    events = watcher.update(
+        [{"id": "a", "status": "Pending"}, {"id": "b", "status": "Running"}]
+    )
+    assert [(e.id, e.previous, e.current) for e in events] == [
+        ("a", None, "Pending"),
+        ("b", None, "Running"),
+        ("c", None, None),
+    ]
+    assert watcher.pending == ["a", "b"]
+    events = watcher.update(
+        [{"id": "a", "status": "Pending"}, {"id": "b", "status": "Succeeded"}]
+    )
+    assert [(e.id, e.previous, e.current) for e in events] == [
+        ("b", "Running", "Succeeded")
+    ]
+    assert watcher.pending == ["a"]
+
+
+def test_watcher_waits_for_new_sessions():
+    """Test that sessions not listed yet are not reported gone at once."""
+    watcher = Watcher(["a", "b"], until=["Succeeded"], grace=3)
+    events = watcher.update([{"id": "a", "status": "Running"}])
+    assert [(e.id, e.current) for e in events] == [("a", "Running")]
+    assert watcher.pending == ["a", "b"]
+    events = watcher.update([{"id": "b", "status": "Pending"}])
+    assert [(e.id, e.previous, e.current) for e in events] == [
+        ("a", "Running", None),
+        ("b", None, "Pending"),
+    ]
+    assert watcher.pending == ["b"]
+    watcher = Watcher(["c"], until=["Succeeded"], grace=3)
+    assert watcher.update([]) == [] and watcher.update([]) == []
+    assert [(e.id, e.current) for e in watcher.update([])] == [("c", None)]
+    assert watcher.pending == []
+
+
+def test_session_watch(stub, certificate):
+    """Test watching sessions until they finish, with one fetch per tick."""
+    session = Session(server=stub, certificate=certificate)
+    mock.sessions["w1"] = {"id": "w1", "status": "Running"}
+    mock.sessions["w2"] = {"id": "w2", "status": "Pending"}
+
+    def progress(event):
+        # Advance the fake cluster whenever an event is observed
+        following = {"Pending": "Running", "Running": "Succeeded"}
+        if event.id == "w2" and event.current in following:
+            mock.sessions["w2"]["status"] = following[event.current]
+        if event.id == "w2" and event.current == "Running":
+            mock.sessions["w1"]["status"] = "Error"
+
+    events = list(
+        session.watch(["w1", "w2"], interval=0.01, maximum=0.02, callback=progress)
+    )
+    assert [(e.id, e.current) for e in events if e.id == "w2"] == [
+        ("w2", "Pending"),
+        ("w2", "Running"),
+        ("w2", "Succeeded"),
+    ]
+    assert [(e.id, e.current) for e in events if e.id == "w1"][-1] == ("w1", "Error")
+
+
+@pytest.mark.asyncio
+async def test_async_session_watch(stub, certificate):
+    """Test the async watcher."""
+    mock.sessions["w3"] = {"id": "w3", "status": "Succeeded"}
+    async with AsyncSession(server=stub, certificate=certificate) as session:
+        events = [event async for event in session.watch("w3", interval=0)]
+    assert [(e.id, e.previous, e.current) for e in events] == [
+        ("w3", None, "Succeeded")
+    ]